@@ -1,3 +1,4 @@
+import time
 from functools import partial
 from typing import Optional
 
@@ -6,12 +7,13 @@ from PyQt6.QtGui import QPainter, QColor, QPen
 from PyQt6.QtWidgets import QPushButton, QLabel, QWidget, QSlider, QVBoxLayout, QFrame, QHBoxLayout, QSpinBox
 from loguru import logger
 
-from Tree import BalancedTree, Node
-from config import DEFAULT_ORDER, QIntValidator_MAX
+from Tree import BalancedTree, Node, Tracer, WriteAheadLog
+from config import DEFAULT_ORDER, QIntValidator_MAX, TRACING, TRACE_CAPACITY, WAL, WAL_PATH, BLOOM_FILTER_RATE
 from util import readCSV
 from .AsyncTasks import AsyncWorker
 from .Dialogs import DialogType, ConfirmationDialog
 from .GraphicalNode import GraphicalNode
+from .SearchPathObserver import SearchPathObserver
 from .util import createHorizontalLayout, createVerticalLayout, displayUserMessage, clearLayout
 
 
@@ -29,7 +31,22 @@ class MainWindow(QWidget):
         self.__currentWorker: Optional[AsyncWorker] = None
 
         self.__order = DEFAULT_ORDER
-        self._tree = BalancedTree(self.__order)
+        self.__tracer: Optional[Tracer] = None
+        if TRACING:
+            self.__tracer = Tracer(TRACE_CAPACITY, f"logs/{time.strftime('%Y-%m-%d_%H-%M-%S')}.trace")
+
+        # Recover the tree of the last session from the write-ahead log
+        self.__wal: Optional[WriteAheadLog] = None
+        if WAL:
+            self.__wal = WriteAheadLog(WAL_PATH)
+            self._tree = BalancedTree.recover(self.__order, self.__wal, tracer=self.__tracer, copyOnWrite=True,
+                                              bloomFilter=BLOOM_FILTER_RATE)
+            self.__order = self._tree.k
+        else:
+            self._tree = BalancedTree(self.__order, self.__tracer, copyOnWrite=True, bloomFilter=BLOOM_FILTER_RATE)
+
+        # The version of the tree, which is currently drawn
+        self.__shownTree: Optional[BalancedTree] = None
 
         self.__enableAbleButtons: list[QPushButton] = []
         self.__operationWidgets: list[QWidget] = []
@@ -39,7 +56,7 @@ class MainWindow(QWidget):
         self.__searchPath: list[GraphicalNode] = []
         self.__nodeFound = False
         self.__searchTimer: Optional[QTimer] = None
-        self.__visualizeSearch = False
+        self.__searchPathObserver = SearchPathObserver(self.addNoteToPath)
 
         # Configure the window
         self.setWindowTitle("Balancierter Baum")
@@ -64,8 +81,12 @@ class MainWindow(QWidget):
             None: Nothing
         """
 
+        # The tree is changed by the workers in another thread. The snapshot is a consistent version, which is not
+        # changed while it is drawn and searched
+        self.__shownTree = self._tree.snapshot()
+
         # Basic list contains the root only
-        nodes: list[list[Node]] = [[self._tree.root]]
+        nodes: list[list[Node]] = [[self.__shownTree.root]]
         layer = 1
 
         # Clear every item out of the layout
@@ -76,7 +97,7 @@ class MainWindow(QWidget):
 
         # This dict contains the parentInformation reference (QFrame) of every node
         references: dict[Node, tuple[QFrame, GraphicalNode]] = {
-            self._tree.root: (None, None)
+            self.__shownTree.root: (None, None)
         }
 
         # Construct the layout
@@ -188,7 +209,7 @@ class MainWindow(QWidget):
         orderInput = QSpinBox()
         orderInput.setRange(1, QIntValidator_MAX)
         orderInput.editingFinished.connect(lambda: self.__updateOrder(orderInput.value()))
-        orderInput.setValue(DEFAULT_ORDER)
+        orderInput.setValue(self.__order)
 
         orderLayout = createVerticalLayout([orderLabel, orderInput])
 
@@ -410,20 +431,14 @@ class MainWindow(QWidget):
         if value != self.__order:
             self.__order = int(value)
 
-            # Get the current values of the tree
-            values = self._tree.getAllValues()
-
-            # Create a new tree with the new order
-            self._tree = BalancedTree(self.__order)
+            # Build a new tree with the new order from the current values of the tree
+            self._tree = BalancedTree.fromItems(self.__order, self._tree.items(), tracer=self.__tracer,
+                                                wal=self.__wal, copyOnWrite=True, bloomFilter=BLOOM_FILTER_RATE)
 
             # logging
             logger.success(f"GUI: THE ORDER OF THE TREE IS CHANGED TO {value}")
 
-            # Insert each old value into the new tree
-            self.__runWorker([("i", value) for value in values])
-
-            # Trigger an update to remove artefacts (old connections)
-            self.update()
+            self.__updateTreeLayout()
 
     def __updateAnimationSpeed(self, value) -> None:
         """
@@ -479,9 +494,15 @@ class MainWindow(QWidget):
             self.__searchTimer.stop()
 
         self.__searchPath = []
-        self.__visualizeSearch = True
 
-        node, key, costs = self._tree.search(int(value))
+        # Search the shown version of the tree, so the visited nodes are the drawn ones. It is observed only during
+        # this search, so inserting and deleting don't pay for the visualization
+        self.__shownTree.addObserver(self.__searchPathObserver)
+        try:
+            node, key, costs = self.__shownTree.search(int(value))
+        finally:
+            self.__shownTree.removeObserver(self.__searchPathObserver)
+
         self.__searchNode = self.__graphicalNodes.get(node)
         self.__nodeFound = key is not None
 
@@ -489,7 +510,6 @@ class MainWindow(QWidget):
             self.__searchPath = []
             self.__searchNode = None
             self.__nodeFound = False
-            self.__visualizeSearch = False
 
             self.update()
 
@@ -601,13 +621,8 @@ class MainWindow(QWidget):
                 ValueError(f"Can't fit {count} values in the range [{lowerBorder}, {upperBorder}]")
             )
         else:
-            # Get the existing keys
-            existing_keys = [
-                found for _, found, _ in [
-                    self._tree.search(i) for i in range(lowerBorder, upperBorder + 1)
-                ]
-                if found
-            ]
+            # Get the existing keys with a single range scan instead of searching every key of the range
+            existing_keys = list(self._tree.range(lowerBorder, upperBorder))
 
             # Remove existing keys from availableRange
             availableRange -= len(existing_keys)
@@ -638,7 +653,8 @@ class MainWindow(QWidget):
 
         logger.success(f"GUI: RESET THE TREE")
 
-        self._tree = BalancedTree(self.__order)
+        self._tree = BalancedTree(self.__order, self.__tracer, wal=self.__wal, copyOnWrite=True,
+                                  bloomFilter=BLOOM_FILTER_RATE)
         self.__updateTreeLayout()
 
     # ---------- [Public methods] ---------- #
@@ -666,7 +682,7 @@ class MainWindow(QWidget):
     def addNoteToPath(self, treeNode) -> None:
         """
         This method appends the graphical node of the given treeNode to a list of GraphicalNodes representing the path
-        the search took.
+        the search took. It is called by the SearchPathObserver of the window.
 
         Args:
             treeNode (Node): The node to animate to add to the path.
@@ -675,5 +691,4 @@ class MainWindow(QWidget):
             None: Nothing
         """
 
-        if self.__visualizeSearch:
-            self.__searchPath.append(self.__graphicalNodes.get(treeNode))
+        self.__searchPath.append(self.__graphicalNodes.get(treeNode))
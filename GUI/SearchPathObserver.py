@@ -0,0 +1,27 @@
+from Tree import TreeObserver
+
+
+class SearchPathObserver(TreeObserver):
+    """
+    This class observes the searches of a tree and forwards every visited node to a callback. It is used to visualize
+    the path a search took.
+
+    Args:
+        callback (Callable[[Node], None]): Called with every visited node of the tree
+    """
+
+    def __init__(self, callback):
+        self.__callback = callback
+
+    def onVisit(self, node) -> None:
+        """
+        Forwards the visited node to the callback.
+
+        Args:
+            node (Node): The visited node
+
+        Returns:
+            None: Nothing
+        """
+
+        self.__callback(node)
@@ -0,0 +1,101 @@
+"""
+This file contains the aggregates, that a balanced tree can keep for the subtree of every node, see AggregateNode. An
+aggregate summarizes a sequence of (key, value) pairs. It consists of an associative function, that combines two
+summaries, an identity element, that is the summary of no pairs, and a function, that summarizes a single pair. Since
+the function is associative, the summary of a range of keys can be combined from the stored summaries of the subtrees,
+that lie completely inside of the range. The function doesn't need to be commutative, the summaries are always combined
+in ascending order of the keys.
+
+The predefined aggregates combine the values of the keys, so every value must be a number.
+"""
+from __future__ import annotations
+
+import math
+import operator
+from typing import Callable
+
+
+class Aggregate:
+    """
+    This class is an associative aggregate over the (key, value) pairs of a balanced tree.
+
+    The functions are called while the tree is changed, so they must not fail for the values stored in the tree. A tree
+    built in parallel pickles its nodes together with their aggregate, so the functions must be picklable then, i.e.
+    defined at the top level of a module.
+
+    Args:
+        combine (Callable): Combines the summaries of two neighbouring sequences, the smaller keys come first. Must be
+                            associative
+        identity: Summary of an empty sequence, combining it with another summary returns the other summary
+        lift (Callable | None): Returns the summary of a single key and its value. If None, the value is its own summary
+    """
+
+    def __init__(self, combine, identity, lift=None):
+        self.combine: Callable = combine
+        self.identity = identity
+        self.lift: Callable | None = lift
+
+    def single(self, key, value):
+        """
+        Returns the summary of a single key and its value.
+
+        Args:
+            key (int): The key
+            value: The value of the key
+
+        Returns:
+            The summary of the pair
+        """
+
+        return value if self.lift is None else self.lift(key, value)
+
+    def check(self, key, value) -> None:
+        """
+        Checks that the value of a key can be summarized, i.e. that its summary can be combined with the identity. The
+        tree checks this before it changes a node, since a failing summary would leave the nodes half changed.
+
+        Args:
+            key (int): The key
+            value: The value of the key
+
+        Returns:
+            None: Nothing
+
+        Raises:
+            ValueError: If the aggregate fails for the value
+        """
+
+        try:
+            self.combine(self.identity, self.single(key, value))
+        except Exception as error:
+            raise ValueError(f"The aggregate can't summarize the value {value!r} of {key}.") from error
+
+    def summarize(self, keys, values, children):
+        """
+        Returns the summary of the keys of a node and the summaries of its children in ascending order.
+
+        Args:
+            keys (list[int]): The keys of the node
+            values (list): The values of the keys
+            children (list[AggregateNode]): The children of the node, empty for a leaf
+
+        Returns:
+            The summary of the subtree of the node
+        """
+
+        combine, lift = self.combine, self.lift
+        summary = children[0].summary if children else self.identity
+        for i in range(len(keys)):
+            summary = combine(summary, values[i] if lift is None else lift(keys[i], values[i]))
+            if children:
+                summary = combine(summary, children[i + 1].summary)
+
+        return summary
+
+
+# Sum of the values
+SUM = Aggregate(operator.add, 0)
+# Smallest value, infinity for an empty range
+MIN = Aggregate(min, math.inf)
+# Biggest value, -infinity for an empty range
+MAX = Aggregate(max, -math.inf)
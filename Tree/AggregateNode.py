@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from .Aggregate import Aggregate
+from .CompactNode import CompactNode
+from .CountedNode import CountedNode
+
+
+class AggregateNode(CountedNode):
+    """
+    This class is a node of a balanced tree, that keeps the summary of an aggregate over the keys and values of its
+    subtree, see Aggregate. Like the count of a CountedNode, which it keeps as well, the summary of a new node is
+    computed from its keys and children, while the tree keeps the summaries of existing nodes up to date. Every recount
+    summarizes the node again.
+
+    Args:
+        k (int): Order of the balanced tree, minimal number of keys in one node
+        keys (list[int]): Keys of the node
+        children (list[Node]): Children of the node, for n keys are n+1 children
+        parent (Node | None): Parent of the node, if Parent is None, the node is the root
+        values (list | None): Values of the keys, every value is None if this is None
+        aggregate (Aggregate): The aggregate, which is shared by all nodes of the tree
+    """
+
+    __slots__ = ("aggregate", "summary")
+
+    def __init__(self, k, keys=None, children=None, parent=None, values=None, aggregate=None):
+        self.aggregate: Aggregate = aggregate
+        super().__init__(k, keys=keys, children=children, parent=parent, values=values)
+
+    def recount(self) -> None:
+        """
+        Sets the count and the summary from the keys of the node and the counts and summaries of its children, which
+        must be correct.
+
+        Returns:
+            None: Nothing
+        """
+
+        super().recount()
+        self.summary = self.aggregate.summarize(self.keys, self.values, self.children)
+
+    def copy(self, parent=None) -> AggregateNode:
+        """
+        Creates a shallow copy of the node including its count and summary, see Node.copy.
+
+        Args:
+            parent (Node | None): Parent of the copy
+
+        Returns:
+            AggregateNode: The copy
+        """
+
+        node = super().copy(parent)
+        node.aggregate = self.aggregate
+        node.summary = self.summary
+        return node
+
+    def newSibling(self, keys, children, values) -> AggregateNode:
+        """
+        Creates a node with the same parent and aggregate, see Node.newSibling.
+
+        Args:
+            keys (list[int]): Keys of the new node
+            children (list[Node]): Children of the new node
+            values (list): Values of the keys
+
+        Returns:
+            AggregateNode: The new node
+        """
+
+        return type(self)(self.k, keys=keys, children=children, parent=self.parent, values=values,
+                          aggregate=self.aggregate)
+
+
+class AggregateCompactNode(AggregateNode, CompactNode):
+    """
+    This class is an aggregate node, that stores its keys in a typed array like CompactNode.
+    """
+
+    __slots__ = ()
@@ -0,0 +1,487 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Iterator, Tuple
+
+from .LeafNode import LeafNode
+from .Node import Node
+
+# Marks that no default was passed to BPlusTree.pop
+_MISSING = object()
+
+
+class BPlusTree:
+    """
+    This class represents a B+ tree, a variant of the balanced tree for range heavy workloads. All records (keys and
+    their values) live in the leaves, which form a doubly linked list in key order. The internal nodes only hold
+    separator keys to guide the search: The child on the left of a separator contains the smaller keys, the child on
+    the right the keys greater than or equal to the separator.
+
+    Since internal nodes don't store records, they can hold more separators than a leaf holds records, which makes the
+    tree lower. A range scan descends once to the first leaf and then follows the links, so it costs O(log n + m).
+
+    Args:
+        k (int): Order of the leaves, minimal number of records in one leaf, max is 2*k
+        internalK (int | None): Order of the internal nodes, minimal number of separators in one internal node, max is
+                                2*internalK. Equal to k if None.
+    """
+
+    def __init__(self, k, internalK=None):
+        self.k = k
+        self.internalK = k if internalK is None else internalK
+        self.root: Node = LeafNode(k)
+
+        self.__searchCount = 0
+
+    def search(self, key) -> Tuple[LeafNode, int | None, int]:
+        """
+        Searches the tree for a given key from the root.
+
+        Args:
+            key (int): Key that is searched for
+
+        Returns:
+            Tuple[LeafNode, int | None, int]: The leaf the key is or should be in, the key or None if it was not found
+                                               and the number of visited nodes
+        """
+
+        path, found = self.__search_path(key)
+        self.__searchCount = len(path)
+
+        return path[-1][0], key if found else None, self.__searchCount
+
+    def __search_path(self, key_to_search) -> Tuple[list[Tuple[Node, int]], bool]:
+        """
+        Searches the tree from the root for a given key. Like BalancedTree.__search_path, every entry of the path
+        consists of a node and the index of the child the search continued in. For the leaf, this is the index of the
+        found key or the insert position.
+
+        Args:
+            key_to_search (int): Key to search for
+
+        Returns:
+            Tuple[list[Tuple[Node, int]], bool]: The path from the root to the leaf and whether the key was found
+        """
+
+        path = []
+        node = self.root
+        while not isinstance(node, LeafNode):
+            # keys equal to a separator are in the subtree on its right
+            index = bisect_right(node.keys, key_to_search)
+            path.append((node, index))
+            node = node.children[index]
+
+        found, index = node.searchKey(key_to_search)
+        path.append((node, index))
+        return path, found
+
+    def __first_leaf(self, key_to_search=None) -> Tuple[LeafNode, int]:
+        """
+        Returns the leaf and the index of the first record whose key is not smaller than the given key.
+
+        Args:
+            key_to_search (int | None): The key, the first leaf of the tree is returned if this is None
+
+        Returns:
+            Tuple[LeafNode, int]: The leaf and the index of the record in it, which may be behind its last record
+        """
+
+        if key_to_search is None:
+            node = self.root
+            while not isinstance(node, LeafNode):
+                node = node.children[0]
+            return node, 0
+
+        path, _ = self.__search_path(key_to_search)
+        return path[-1]
+
+    def __last_leaf(self, key_to_search=None) -> Tuple[LeafNode, int]:
+        """
+        Returns the leaf and the index behind the last record whose key is not greater than the given key.
+
+        Args:
+            key_to_search (int | None): The key, the last leaf of the tree is returned if this is None
+
+        Returns:
+            Tuple[LeafNode, int]: The leaf and the index after the record in it, which may be 0
+        """
+
+        if key_to_search is None:
+            node = self.root
+            while not isinstance(node, LeafNode):
+                node = node.children[-1]
+            return node, len(node.keys)
+
+        path, found = self.__search_path(key_to_search)
+        leaf, index = path[-1]
+        return leaf, index + 1 if found else index
+
+    def insert(self, insert_key, value=None) -> None:
+        """
+        Inserts a new record into the tree.
+
+        Args:
+            insert_key (int): Key to be inserted
+            value: Value attached to the key
+
+        Returns:
+            None: Nothing
+
+        Raises:
+            ValueError: If the key is already in the tree
+        """
+
+        path, found = self.__search_path(insert_key)
+        if found:
+            raise ValueError(f"{insert_key} is already in the tree.")
+
+        self.__insert_along_path(path, insert_key, value)
+
+    def get(self, key, default=None):
+        """
+        Returns the value of a key.
+
+        Args:
+            key (int): The key to look up
+            default: Returned if the key is not in the tree
+
+        Returns:
+            The value of the key or default
+        """
+
+        path, found = self.__search_path(key)
+        if not found:
+            return default
+
+        leaf, index = path[-1]
+        return leaf.values[index]
+
+    def put(self, key, value) -> None:
+        """
+        Sets the value of a key. If the key is not in the tree yet, it is inserted (upsert).
+
+        Args:
+            key (int): The key
+            value: The new value of the key
+
+        Returns:
+            None: Nothing
+        """
+
+        path, found = self.__search_path(key)
+        if found:
+            leaf, index = path[-1]
+            leaf.values[index] = value
+        else:
+            self.__insert_along_path(path, key, value)
+
+    def __insert_along_path(self, path, key, value) -> None:
+        """
+        Inserts a record into the leaf at the end of the path. An overflowing leaf is split and the first key of the new
+        leaf is inserted into the parent as separator. Overflowing internal nodes are split like in a BalancedTree,
+        moving their middle key up.
+
+        Args:
+            path (list[Tuple[Node, int]]): Path from the root to the leaf, the index of the leaf entry must be the
+                                            insert position of the key. The path is consumed.
+            key (int): Key to be inserted
+            value: Value attached to the key
+
+        Returns:
+            None: Nothing
+        """
+
+        leaf, index = path.pop()
+        leaf.insert_key(index, key, value)
+        if not leaf.isOverflow():
+            return
+
+        right_node = leaf.split_leaf()
+        separator = right_node.keys[0]
+        left_node = leaf
+
+        while True:
+            if not path:
+                # the root was split, make a new root with the separator
+                self.root = Node(self.internalK, keys=[separator], children=[left_node, right_node])
+                left_node.setParent(self.root)
+                right_node.setParent(self.root)
+                return
+
+            # the index of the parent entry is the position of the split node, which is also the position of the
+            # separator in the parent
+            parent, index = path.pop()
+            parent.insert_key(index, separator)
+            parent.insert_child(index + 1, right_node)
+            if not parent.isOverflow():
+                return
+
+            left_node, separator, right_node = parent.split()
+
+    def delete(self, key) -> None:
+        """
+        Deletes a key from the tree.
+
+        Args:
+            key (int): Key to delete
+
+        Returns:
+            None: Nothing
+
+        Raises:
+            ValueError: If the key is not in the tree
+        """
+
+        self.pop(key)
+
+    def pop(self, key, default=_MISSING):
+        """
+        Deletes a key from the tree and returns its value. Since all records are in the leaves, a record is always
+        removed from a leaf. The separators in the internal nodes are not touched, they still separate the subtrees
+        correctly. If the leaf has less than k records afterwards, a record is borrowed from a sibling or the leaf is
+        merged with a sibling, which can make the parent deficient in turn.
+
+        Args:
+            key (int): The key to delete
+            default: Returned if the key is not in the tree. If no default is given, a missing key raises a ValueError
+
+        Returns:
+            The value of the deleted key or default
+
+        Raises:
+            ValueError: If the key is not in the tree and no default is given
+        """
+
+        path, found = self.__search_path(key)
+        if not found:
+            if default is _MISSING:
+                raise ValueError(f"{key} is not in the tree.")
+            return default
+
+        leaf, index = path.pop()
+        _, value = leaf.popItem(index)
+
+        if path and leaf.isUnderflow():
+            self.__rebalance_leaf(leaf, *path[-1])
+            self.__rebalance_along_path(path)
+
+        return value
+
+    def __rebalance_leaf(self, leaf, parent, index) -> None:
+        """
+        Rebalances a leaf with less than k records by borrowing a record from a sibling leaf with the same parent or by
+        merging it with such a sibling.
+
+        Args:
+            leaf (LeafNode): The deficient leaf
+            parent (Node): Parent of the leaf
+            index (int): Position of the leaf in the children of the parent
+
+        Returns:
+            None: Nothing
+        """
+
+        children = parent.children
+        right_sibling = children[index + 1] if index + 1 < len(children) else None
+        left_sibling = children[index - 1] if index > 0 else None
+
+        if right_sibling is not None and right_sibling.more_than_minimal_elements():
+            # move the first record of the right sibling to the end, its new first key is the new separator
+            leaf.insert_key(-1, *right_sibling.popItem(0))
+            parent.keys[index] = right_sibling.keys[0]
+        elif left_sibling is not None and left_sibling.more_than_minimal_elements():
+            # move the last record of the left sibling to the start, which is the new separator
+            leaf.insert_key(0, *left_sibling.popItem(-1))
+            parent.keys[index - 1] = leaf.keys[0]
+        elif right_sibling is not None:
+            leaf.absorb(right_sibling)
+            parent.popKey(index)
+            parent.popChild(index + 1)
+        else:
+            left_sibling.absorb(leaf)
+            parent.popKey(index - 1)
+            parent.popChild(index)
+
+    def __rebalance_along_path(self, path) -> None:
+        """
+        Rebalances the internal nodes of the path from the bottom, after the last node lost a separator. This works
+        like the rebalancing of a BalancedTree: Rotate a separator from a sibling over the parent or merge with a
+        sibling and the separator between them. If the root has no separator left, its only child becomes the root.
+
+        Args:
+            path (list[Tuple[Node, int]]): Path from the root to the internal node that lost a separator. The path is
+                                            consumed.
+
+        Returns:
+            None: Nothing
+        """
+
+        while path:
+            node, _ = path.pop()
+
+            if not path:
+                if not node.keys:
+                    # the root is empty, the tree becomes shallower
+                    self.root = node.children[0]
+                    self.root.setParent(None)
+                return
+
+            if not node.isUnderflow():
+                return
+
+            parent, index = path[-1]
+            children = parent.children
+            right_sibling = children[index + 1] if index + 1 < len(children) else None
+            left_sibling = children[index - 1] if index > 0 else None
+
+            if right_sibling is not None and right_sibling.more_than_minimal_elements():
+                # rotate left
+                node.insert_key(-1, parent.keys[index])
+                child = right_sibling.popChild(0)
+                child.setParent(node)
+                node.insert_child(-1, child)
+                parent.keys[index] = right_sibling.popKey(0)
+                return
+            elif left_sibling is not None and left_sibling.more_than_minimal_elements():
+                # rotate right
+                node.insert_key(0, parent.keys[index - 1])
+                child = left_sibling.popChild(-1)
+                child.setParent(node)
+                node.insert_child(0, child)
+                parent.keys[index - 1] = left_sibling.popKey(-1)
+                return
+
+            # merge with a sibling, the separator between them moves down
+            if right_sibling is None:
+                node, right_sibling, index = left_sibling, node, index - 1
+
+            node.insert_key(-1, parent.popKey(index))
+            node.keys.extend(right_sibling.keys)
+            node.values.extend(right_sibling.values)
+            for child in right_sibling.children:
+                child.setParent(node)
+            node.children.extend(right_sibling.children)
+            parent.popChild(index + 1)
+
+    def isEmpty(self) -> bool:
+        """
+        Returns whether the tree is empty.
+
+        Returns:
+            bool: True, if the tree is empty, false otherwise
+        """
+
+        return isinstance(self.root, LeafNode) and not self.root.keys
+
+    def getAllValues(self) -> list[int]:
+        """
+        Returns all keys of the tree in ascending order.
+
+        Returns:
+            list[int]: The keys of the tree
+        """
+
+        return list(self)
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Iterates over the keys of the tree in ascending order.
+
+        Returns:
+            Iterator[int]: The keys in ascending order
+        """
+
+        return self.range()
+
+    def __reversed__(self) -> Iterator[int]:
+        """
+        Iterates over the keys of the tree in descending order.
+
+        Returns:
+            Iterator[int]: The keys in descending order
+        """
+
+        return self.range(reverse=True)
+
+    def range(self, lo=None, hi=None, reverse=False) -> Iterator[int]:
+        """
+        Iterates over the keys between lo and hi (both inclusive). The search descends once to the leaf of the first
+        key and then follows the links between the leaves, so the cost is O(log n + m) for m returned keys.
+        The tree must not be modified during the iteration.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+            reverse (bool): Whether to iterate in descending order
+
+        Returns:
+            Iterator[int]: The keys of the range
+        """
+
+        return (key for key, _ in self.items(lo, hi, reverse))
+
+    def items(self, lo=None, hi=None, reverse=False) -> Iterator[Tuple[int, object]]:
+        """
+        Iterates over the records between lo and hi (both inclusive), see range.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+            reverse (bool): Whether to iterate in descending order
+
+        Returns:
+            Iterator[Tuple[int, object]]: The (key, value) pairs of the range
+        """
+
+        if reverse:
+            return self.__descending(lo, hi)
+        else:
+            return self.__ascending(lo, hi)
+
+    def __ascending(self, lo, hi) -> Iterator[Tuple[int, object]]:
+        """
+        Generator for items in ascending order.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+
+        Returns:
+            Iterator[Tuple[int, object]]: The (key, value) pairs of the range
+        """
+
+        leaf, index = self.__first_leaf(lo)
+        while leaf is not None:
+            keys, values = leaf.keys, leaf.values
+            while index < len(keys):
+                if hi is not None and keys[index] > hi:
+                    return
+                yield keys[index], values[index]
+                index += 1
+
+            leaf, index = leaf.next, 0
+
+    def __descending(self, lo, hi) -> Iterator[Tuple[int, object]]:
+        """
+        Generator for items in descending order.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+
+        Returns:
+            Iterator[Tuple[int, object]]: The (key, value) pairs of the range
+        """
+
+        leaf, index = self.__last_leaf(hi)
+        while leaf is not None:
+            keys, values = leaf.keys, leaf.values
+            while index > 0:
+                index -= 1
+                if lo is not None and keys[index] < lo:
+                    return
+                yield keys[index], values[index]
+
+            leaf = leaf.previous
+            if leaf is not None:
+                index = len(leaf.keys)
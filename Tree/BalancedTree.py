@@ -1,230 +1,2375 @@
 from __future__ import annotations
 
-from typing import Tuple
+import threading
+from bisect import bisect_left, bisect_right
+from functools import partial
+from typing import Iterator, Tuple
+
+from .Aggregate import Aggregate
+from .AggregateNode import AggregateNode, AggregateCompactNode
+from .BatchReport import BatchReport
+from .BloomFilter import BloomFilter
+from .BuildReport import BuildReport
+from .BulkLoad import buildTree, buildTreeFromItems, sortedItems, sortedKeys
+from .CompactNode import CompactNode
+from .CountedNode import CountedNode, CountedCompactNode
+from .FilterReport import FilterReport
+from .Latch import RWLatch
+from .LatchedNode import LatchedNode
+from .Node import Node
+from .ParallelBuild import buildTreeParallel
+from .Snapshot import SnapshotFile, writeSnapshot
+from .SnapshotNode import SnapshotNode
+from .Tracer import Tracer, SEARCH, INSERT, DELETE, REPLACE, SPLIT, NEW_ROOT, ROTATE_LEFT, ROTATE_RIGHT, MERGE, \
+    SHRINK, DELETE_RANGE, SPLIT_TREE, JOIN_TREES
+from .TreeObserver import TreeObserver
+from .WriteAheadLog import WriteAheadLog, PUT, DELETE as LOG_DELETE, DELETE_RANGE as LOG_DELETE_RANGE
+
+# Marks that no default was passed to BalancedTree.pop
+_MISSING = object()
+
+
+class BalancedTree:
+    """
+    This class represents a balanced tree and handles operations (such as inserting, deleting or searching) on it
+
+    Args:
+        k (int): Order of the balanced tree, minimal number of keys in one node, max is 2*k
+        tracer (Tracer | None): Records the events of the operations, tracing is disabled if this is None
+        compact (bool): Stores the keys of the nodes in typed arrays instead of lists, see CompactNode. This roughly
+                        halves the memory per key, but only accepts 64 bit integer keys
+        wal (WriteAheadLog | None): Log of the changes of the tree, the tree isn't logged if this is None. The log is
+                                    reset to the new, empty tree by a checkpoint. Use recover to continue a logged tree
+        copyOnWrite (bool): Never changes a node, that is reachable from a previous root. Every change copies the nodes
+                            along its path and publishes a new root, which shares all other nodes with the previous
+                            version. Readers holding a previous root or a snapshot see a consistent version without
+                            locks. Copying costs O(k * height) per change. Parent references are not kept up to date
+                            in this mode, since a node can be part of several versions
+        threadSafe (bool): Allows search, get, insert, put, delete and pop from several threads at the same time. Every
+                           node has a reader/writer latch and the operations descend with latch coupling (crabbing):
+                           The latch of a node is released, once the latch of its child is held. Changes keep the
+                           latches of the nodes they may change and release them as soon as a child is safe, i.e.
+                           doesn't split on insert or underflow on delete. All other operations, like iterating or the
+                           batch operations, wait for the running operations and exclude every other operation
+        counted (bool): Keeps the number of keys in the subtree of every node, see CountedNode. This allows rank,
+                        select and count_range in O(log n) node visits. Every change updates the counts along its
+                        path, so the ancestors of a changed node can't be released early like in the thread-safe mode
+        aggregate (Aggregate | None): Keeps the summary of the aggregate over the subtree of every node, see
+                                      AggregateNode. This allows the method aggregate to combine O(log n) summaries
+                                      instead of every key of a range. Every change summarizes the nodes along its path
+                                      again. The nodes are counted as well, like in the counted mode
+        topDown (bool): Inserts and deletes keys in a single pass from the root to a leaf. Full nodes are split before
+                        they are entered on insert and nodes with k keys are filled before they are entered on delete,
+                        so a change never travels back up. A node of 2k keys can't be split into two nodes of at least
+                        k keys, so in this mode nodes hold up to 2k + 1 keys (the B-tree of minimum degree k + 1).
+                        Trees in this mode can't be written to snapshots, whose records hold at most 2k keys
+        bloomFilter (float | None): Desired false-positive rate of a Bloom filter in front of the tree, see BloomFilter.
+                                    Lookups of keys, that the filter rules out, don't visit a single node. Inserted
+                                    keys are added to the filter, deleted keys stay in it until it is rebuilt from the
+                                    keys of the tree, once it is full or half of its capacity are deleted keys. The
+                                    state of the filter is reported by filterReport. No filter is kept if this is None
+
+    Raises:
+        ValueError: If threadSafe is combined with compact, copyOnWrite, counted, an aggregate, topDown or a Bloom
+                    filter, or the false-positive rate is not in (0, 1)
+    """
+
+    def __init__(self, k, tracer=None, compact=False, wal=None, copyOnWrite=False, threadSafe=False, counted=False,
+                 aggregate=None, topDown=False, bloomFilter=None):
+        if threadSafe and (compact or copyOnWrite or counted or aggregate is not None or topDown or
+                           bloomFilter is not None):
+            raise ValueError("The thread-safe mode can't be combined with compact nodes, copy-on-write, counting, "
+                             "aggregates, the top-down mode or a Bloom filter.")
+        if bloomFilter is not None and not 0 < bloomFilter < 1:
+            raise ValueError("The false-positive rate of the Bloom filter must be between 0 and 1.")
+
+        if aggregate is not None:
+            # the nodes are created with the aggregate of the tree, also by the bulk builds
+            self.__nodeType = partial(AggregateCompactNode if compact else AggregateNode, aggregate=aggregate)
+        elif counted:
+            self.__nodeType = CountedCompactNode if compact else CountedNode
+        else:
+            self.__nodeType = LatchedNode if threadSafe else CompactNode if compact else Node
+        self.__compact = compact
+        self.__counted = counted or aggregate is not None
+        self.__aggregate: Aggregate | None = aggregate
+        self.__topDown = topDown
+        self.root = self.__nodeType(k)
+        self.k = k
+
+        self.__searchCount = 0
+        # costs of the parallel build of fromValues and fromItems, None if the tree wasn't built in parallel
+        self.buildReport: BuildReport | None = None
+        self.__tracer: Tracer | None = tracer
+        self.__observers: list[TreeObserver] = []
+
+        # the Bloom filter and the lookups of absent keys it answered alone or let pass
+        self.__filterRate: float | None = bloomFilter
+        self.__filter: BloomFilter | None = None if bloomFilter is None else BloomFilter(0, bloomFilter)
+        self.__filterNegatives = 0
+        self.__filterFalsePositives = 0
+        self.__filterRebuilds = 0
+
+        # nodes copied by the current change in copy-on-write mode, they may be changed in place
+        self.__copyOnWrite = copyOnWrite
+        self.__fresh: set[Node] = set()
+
+        # the tree latch is shared by the operations using latch coupling and held exclusively by all other operations,
+        # the root latch protects the reference to the root. The latches held by an operation are kept per thread
+        self.__threadSafe = threadSafe
+        self.__treeLatch = RWLatch()
+        self.__rootLatch = RWLatch()
+        self.__latches = threading.local()
+
+        self.__wal: WriteAheadLog | None = wal
+        if wal is not None:
+            wal.checkpoint(k, ())
+
+    @classmethod
+    def fromValues(cls, k, values, fillFactor=1.0, tracer=None, compact=False, wal=None, copyOnWrite=False,
+                   threadSafe=False, workers=None, counted=False, aggregate=None, topDown=False,
+                   bloomFilter=None) -> BalancedTree:
+        """
+        Creates a balanced tree containing the given keys. The tree is built bottom-up in linear time instead of
+        inserting every key on its own, see BulkLoad.buildTree.
+
+        Args:
+            k (int): Order of the balanced tree
+            values (Iterable[int]): The keys of the tree, they are sorted if they aren't already
+            fillFactor (float): Desired fill factor of the nodes between 0 and 1
+            tracer (Tracer | None): Records the events of the operations, tracing is disabled if this is None
+            compact (bool): Stores the keys of the nodes in typed arrays, see CompactNode
+            wal (WriteAheadLog | None): Log of the changes of the tree, a checkpoint of the built tree is written to it
+            copyOnWrite (bool): Creates a new version of the tree for every change, see BalancedTree
+            threadSafe (bool): Allows the operations on single keys from several threads, see BalancedTree
+            workers (int | None): Number of processes building the tree in parallel, see ParallelBuild. The costs of
+                                  the build are stored in buildReport. The tree is built in this process if None
+            counted (bool): Keeps the number of keys in the subtree of every node, see BalancedTree
+            aggregate (Aggregate | None): Keeps the summary of the aggregate over the subtree of every node, see
+                                          BalancedTree. It must be picklable for a parallel build
+            topDown (bool): Inserts and deletes keys in a single pass from the root to a leaf, see BalancedTree
+            bloomFilter (float | None): Desired false-positive rate of a Bloom filter in front of the tree, see
+                                        BalancedTree. The filter is built from the keys of the built tree
+
+        Returns:
+            BalancedTree: The new tree
+
+        Raises:
+            ValueError: If the fill factor is not in (0, 1], a key occurs more than once or workers is less than 1
+        """
+
+        tree = cls(k, tracer, compact, copyOnWrite=copyOnWrite, threadSafe=threadSafe, counted=counted,
+                   aggregate=aggregate, topDown=topDown, bloomFilter=bloomFilter)
+        if workers is None:
+            tree.root = buildTree(k, values, fillFactor, tree.__nodeType)
+        else:
+            tree.root, tree.buildReport = buildTreeParallel(k, sortedKeys(values), None, fillFactor, tree.__nodeType,
+                                                            workers)
+        tree.__rebuild_filter()
+        tree.__attachLog(wal)
+        return tree
+
+    @classmethod
+    def fromItems(cls, k, items, fillFactor=1.0, tracer=None, compact=False, wal=None, copyOnWrite=False,
+                  threadSafe=False, workers=None, counted=False, aggregate=None, topDown=False,
+                  bloomFilter=None) -> BalancedTree:
+        """
+        Creates a balanced tree containing the given keys and their values, see fromValues.
+
+        Args:
+            k (int): Order of the balanced tree
+            items (Iterable[tuple[int, object]]): (key, value) pairs, they are sorted if they aren't already
+            fillFactor (float): Desired fill factor of the nodes between 0 and 1
+            tracer (Tracer | None): Records the events of the operations, tracing is disabled if this is None
+            compact (bool): Stores the keys of the nodes in typed arrays, see CompactNode
+            wal (WriteAheadLog | None): Log of the changes of the tree, a checkpoint of the built tree is written to it
+            copyOnWrite (bool): Creates a new version of the tree for every change, see BalancedTree
+            threadSafe (bool): Allows the operations on single keys from several threads, see BalancedTree
+            workers (int | None): Number of processes building the tree in parallel, see ParallelBuild. The costs of
+                                  the build are stored in buildReport. The tree is built in this process if None
+            counted (bool): Keeps the number of keys in the subtree of every node, see BalancedTree
+            aggregate (Aggregate | None): Keeps the summary of the aggregate over the subtree of every node, see
+                                          BalancedTree. It must be picklable for a parallel build
+            topDown (bool): Inserts and deletes keys in a single pass from the root to a leaf, see BalancedTree
+            bloomFilter (float | None): Desired false-positive rate of a Bloom filter in front of the tree, see
+                                        BalancedTree. The filter is built from the keys of the built tree
+
+        Returns:
+            BalancedTree: The new tree
+
+        Raises:
+            ValueError: If the fill factor is not in (0, 1], a key occurs more than once or workers is less than 1
+        """
+
+        tree = cls(k, tracer, compact, copyOnWrite=copyOnWrite, threadSafe=threadSafe, counted=counted,
+                   aggregate=aggregate, topDown=topDown, bloomFilter=bloomFilter)
+        if workers is None:
+            tree.root = buildTreeFromItems(k, items, fillFactor, tree.__nodeType)
+        else:
+            keys, values = sortedItems(items)
+            tree.root, tree.buildReport = buildTreeParallel(k, keys, values, fillFactor, tree.__nodeType, workers)
+        tree.__rebuild_filter()
+        tree.__attachLog(wal)
+        return tree
+
+    @classmethod
+    def fromSnapshot(cls, path, tracer=None) -> BalancedTree:
+        """
+        Opens a tree from a snapshot written with saveSnapshot. The snapshot is mapped into memory and no node is read
+        yet: Every node is decoded, when it is touched for the first time, see SnapshotNode. Opening the tree therefore
+        takes the same time for every size, and the following operations only pay for the nodes they visit.
+
+        The tree can be changed like every other tree, the changes are not written back to the snapshot.
+
+        Args:
+            path (str): Path of the snapshot
+            tracer (Tracer | None): Records the events of the operations, tracing is disabled if this is None
+
+        Returns:
+            BalancedTree: The opened tree
+
+        Raises:
+            ValueError: If the file is no snapshot
+        """
+
+        snapshot = SnapshotFile(path)
+
+        tree = cls(snapshot.k, tracer)
+        tree.root = SnapshotNode.lazy(snapshot, 0)
+        return tree
+
+    def saveSnapshot(self, path) -> None:
+        """
+        Writes the tree into a binary snapshot, which can be opened with fromSnapshot.
+
+        Args:
+            path (str): Path of the snapshot
+
+        Returns:
+            None: Nothing
+
+        Raises:
+            ValueError: If the tree is in top-down mode, whose nodes don't fit into the records of a snapshot
+        """
+
+        if self.__topDown:
+            raise ValueError("Trees in top-down mode can't be written to a snapshot.")
+
+        if self.__threadSafe:
+            self.__treeLatch.acquireWrite()
+        try:
+            writeSnapshot(self.root, self.k, path)
+        finally:
+            if self.__threadSafe:
+                self.__treeLatch.releaseWrite()
+
+    @classmethod
+    def recover(cls, k, wal, fillFactor=1.0, tracer=None, compact=False, copyOnWrite=False,
+                threadSafe=False, counted=False, aggregate=None, topDown=False, bloomFilter=None) -> BalancedTree:
+        """
+        Rebuilds a tree from a write-ahead log. The tree of the last checkpoint is built bottom-up, see fromItems, and
+        the records written after the checkpoint are replayed. The recovered tree continues to write into the log.
+
+        Args:
+            k (int): Order of the tree, if the log has no checkpoint. Otherwise, the order of the checkpoint is used
+            wal (WriteAheadLog): The log
+            fillFactor (float): Desired fill factor of the nodes of the checkpoint between 0 and 1
+            tracer (Tracer | None): Records the events of the operations, tracing is disabled if this is None
+            compact (bool): Stores the keys of the nodes in typed arrays, see CompactNode
+            copyOnWrite (bool): Creates a new version of the tree for every change, see BalancedTree
+            threadSafe (bool): Allows the operations on single keys from several threads, see BalancedTree
+            counted (bool): Keeps the number of keys in the subtree of every node, see BalancedTree
+            aggregate (Aggregate | None): Keeps the summary of the aggregate over the subtree of every node, see
+                                          BalancedTree
+            topDown (bool): Inserts and deletes keys in a single pass from the root to a leaf, see BalancedTree
+            bloomFilter (float | None): Desired false-positive rate of a Bloom filter in front of the tree, see
+                                        BalancedTree
+
+        Returns:
+            BalancedTree: The recovered tree
+        """
+
+        checkpoint_k, items, records = wal.recover()
+
+        tree = cls.fromItems(k if checkpoint_k is None else checkpoint_k, items, fillFactor, tracer, compact,
+                             copyOnWrite=copyOnWrite, threadSafe=threadSafe, counted=counted, aggregate=aggregate,
+                             topDown=topDown, bloomFilter=bloomFilter)
+        for operation, key, value in records:
+            if operation == PUT:
+                tree.put(key, value)
+            elif operation == LOG_DELETE_RANGE:
+                tree.delete_range(key, value)
+            else:
+                tree.pop(key, None)
+
+        # the replayed records are in the log already
+        tree.__wal = wal
+        return tree
+
+    def __attachLog(self, wal) -> None:
+        """
+        Starts to log the changes of the tree. The current state of the tree is written as checkpoint.
+
+        Args:
+            wal (WriteAheadLog | None): The log, nothing happens if this is None
+
+        Returns:
+            None: Nothing
+        """
+
+        if wal is not None:
+            self.__wal = wal
+            wal.checkpoint(self.k, self.items())
+
+    def __log(self, operation, key, value=None) -> None:
+        """
+        Appends a change to the write-ahead log, if the tree is logged. Writes a checkpoint, once the log asks for it.
+        Changes are logged after they were applied, so the checkpoint already contains them.
+
+        Args:
+            operation (str): WriteAheadLog.PUT, WriteAheadLog.DELETE or WriteAheadLog.DELETE_RANGE
+            key (int): The changed key, the smallest key for DELETE_RANGE
+            value: The new value of the key for PUT, the biggest key for DELETE_RANGE
+
+        Returns:
+            None: Nothing
+        """
+
+        self.__wal.append(operation, key, value)
+        if self.__wal.needsCheckpoint():
+            self.__wal.checkpoint(self.k, self.__ascending(None, None, True))
+
+    def addObserver(self, observer) -> None:
+        """
+        Registers an observer, which is notified about visited nodes, splits, merges and rotations.
+
+        Args:
+            observer (TreeObserver): The observer to register
+
+        Returns:
+            None: Nothing
+        """
+
+        self.__observers.append(observer)
+
+    def removeObserver(self, observer) -> None:
+        """
+        Removes a registered observer.
+
+        Args:
+            observer (TreeObserver): The observer to remove
+
+        Returns:
+            None: Nothing
+
+        Raises:
+            ValueError: If the observer is not registered
+        """
+
+        self.__observers.remove(observer)
+
+    def filterReport(self) -> FilterReport:
+        """
+        Reports the size and the false-positive rate of the Bloom filter and how many lookups it answered alone.
+
+        Returns:
+            FilterReport: The state of the filter
+
+        Raises:
+            ValueError: If the tree has no Bloom filter
+        """
+
+        if self.__filter is None:
+            raise ValueError("The tree has no Bloom filter.")
+
+        bloom_filter = self.__filter
+        report = FilterReport(bloom_filter.capacity, bloom_filter.count, bloom_filter.stale, bloom_filter.bitCount,
+                              bloom_filter.hashCount, bloom_filter.memorySize(), bloom_filter.falsePositiveRate,
+                              bloom_filter.estimatedRate())
+        report.negatives = self.__filterNegatives
+        report.falsePositives = self.__filterFalsePositives
+        report.rebuilds = self.__filterRebuilds
+        return report
+
+    def rebuildFilter(self) -> None:
+        """
+        Rebuilds the Bloom filter from the keys of the tree, which removes the deleted keys from it. This happens on its
+        own, once the filter is full or half of it are deleted keys.
+
+        Returns:
+            None: Nothing
+
+        Raises:
+            ValueError: If the tree has no Bloom filter
+        """
+
+        if self.__filter is None:
+            raise ValueError("The tree has no Bloom filter.")
+
+        self.__rebuild_filter()
+
+    def __rebuild_filter(self) -> None:
+        """
+        Builds the Bloom filter from the keys of the tree, if the tree has a filter. It is sized for twice the number of
+        keys, so rebuilding it costs O(1) amortized per change.
+
+        Returns:
+            None: Nothing
+        """
+
+        if self.__filterRate is not None:
+            keys = list(self.__ascending(None, None, False))
+            self.__filter = BloomFilter.fromKeys(keys, len(keys), self.__filterRate)
+            self.__filterRebuilds += 1
+
+    def __filter_add(self, keys) -> None:
+        """
+        Adds inserted keys to the Bloom filter and rebuilds it, once it is full.
+
+        Args:
+            keys (Iterable[int]): The inserted keys
+
+        Returns:
+            None: Nothing
+        """
+
+        for key in keys:
+            self.__filter.add(key)
+        if self.__filter.needsRebuild():
+            self.__rebuild_filter()
+
+    def __filter_delete(self, count) -> None:
+        """
+        Counts deleted keys, which stay in the Bloom filter, and rebuilds it, once half of it are deleted keys.
+
+        Args:
+            count (int): Number of deleted keys
+
+        Returns:
+            None: Nothing
+        """
+
+        self.__filter.stale += count
+        if self.__filter.needsRebuild():
+            self.__rebuild_filter()
+
+    def __filter_searched(self, found) -> None:
+        """
+        Updates the Bloom filter after a key, that passed the filter, was deleted or found to be absent. A deleted key
+        stays in the filter, an absent key was a false positive.
+
+        Args:
+            found (bool): Whether the key was in the tree and deleted
+
+        Returns:
+            None: Nothing
+        """
+
+        if found:
+            self.__filter_delete(1)
+        else:
+            self.__filterFalsePositives += 1
+
+    def __ruled_out(self, key) -> bool:
+        """
+        Checks whether the Bloom filter rules a key out, so the lookup doesn't need to search the tree.
+
+        Args:
+            key (int): The key to look up
+
+        Returns:
+            bool: True if the key is definitely not in the tree
+        """
+
+        if key in self.__filter:
+            return False
+
+        self.__filterNegatives += 1
+        if self.__tracer is not None:
+            self.__tracer.record(SEARCH, key, False, 0)
+        return True
+
+    def search(self, key) -> Tuple[Node, int, int]:
+        """
+        Searches the whole balanced tree for a given key from the root.
+
+        Args:
+            key (int): Key that is searched for in the balanced tree
+
+        Returns:
+            Tuple[Node,int]: The node the key was found in and the key. The node is None, if the Bloom filter ruled the
+                             key out without visiting a node
+
+        """
+
+        if self.__filter is not None and self.__ruled_out(key):
+            self.__searchCount = 0
+            return None, None, 0
+
+        if self.__threadSafe:
+            path, found = self.__search_latched(key)
+            self.__release_read(path)
+        else:
+            path, found = self.__search_path(key)
+            if not found and self.__filter is not None:
+                self.__filterFalsePositives += 1
+        node, _ = path[-1]
+        self.__searchCount = len(path)
+
+        return node, key if found else None, self.__searchCount
+
+    def __search_path(self, key_to_search) -> Tuple[list[Tuple[Node, int]], bool]:
+        """
+        Searches the balanced tree from the root for a given key with a loop and records the visited nodes in an
+        explicit path stack. Every entry of the path consists of the node and the index returned by Node.searchKey:
+        For the last node, this is the index of the found key or the insert position in the leaf. For every other node,
+        this is the index of the child the search continued in, so path[i][1] is the position of path[i + 1][0] in
+        the children of path[i][0].
+
+        Args:
+            key_to_search (int): Key to search for
+
+        Returns:
+            Tuple[list[Tuple[Node, int]], bool]: The path from the root to the last visited node and whether the key
+                                                  was found in that node. If it was not found, the last node is the
+                                                  leaf the key should be inserted in.
+
+        """
+
+        path = []
+        node = self.root
+        while True:
+            # locate the key once, the index is either the position of the key or the child to descend into
+            found, index = node.searchKey(key_to_search)
+            path.append((node, index))
+
+            if found:
+                # key was found, its value is at the same index in node.values
+                if self.__tracer is not None:
+                    self.__tracer.record(SEARCH, key_to_search, True, len(path))
+                if self.__observers:
+                    self.__notify_visits(path)
+                return path, True
+            elif node.isLeaf():
+                # key could not be found, should be inserted at node
+                if self.__tracer is not None:
+                    self.__tracer.record(SEARCH, key_to_search, False, len(path))
+                if self.__observers:
+                    self.__notify_visits(path)
+                return path, False
+            else:
+                # the child at the index contains the subtree the key must be in
+                node = node.getChildren()[index]
+
+    def __notify_visits(self, path) -> None:
+        """
+        Notifies the observers about the nodes of a search path. This is done once the search is finished, so the
+        search loop itself does not pay for the notifications.
+
+        Args:
+            path (list[Tuple[Node, int]]): The path of the search
+
+        Returns:
+            None: Nothing
+        """
+
+        for observer in self.__observers:
+            for node, _ in path:
+                observer.onVisit(node)
+
+    def insert(self, insert_key, value=None) -> None:
+        """
+        Inserts a new key into the binary tree
+
+        Args:
+            insert_key (int): Key to be inserted
+            value: Value attached to the key
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the key is already in the tree or the aggregate of the tree can't summarize the value
+
+        """
+
+        if self.__aggregate is not None:
+            self.__aggregate.check(insert_key, value)
+
+        if self.__threadSafe:
+            self.__put_latched(insert_key, value, False)
+            return
+        elif self.__topDown:
+            self.__put_top_down(insert_key, value, False)
+            if self.__filter is not None:
+                self.__filter_add((insert_key,))
+            if self.__wal is not None:
+                self.__log(PUT, insert_key, value)
+            return
+
+        # find the leaf to insert the new key
+        path, found = self.__search_path(insert_key)
+        if found:
+            # key was found in tree
+            raise ValueError(f"{insert_key} is already in the tree.")
+        else:
+            # insert "key" into the leaf at the end of the path and split upwards along the path
+            if self.__tracer is not None:
+                self.__tracer.record(INSERT, insert_key)
+            self.__mutate(path, self.__insert_along_path, insert_key, value)
+
+            if self.__filter is not None:
+                self.__filter_add((insert_key,))
+            if self.__wal is not None:
+                self.__log(PUT, insert_key, value)
+
+    def get(self, key, default=None):
+        """
+        Returns the value of a key. The value is read from the node the search ends in, so this is a single search.
+
+        Args:
+            key (int): The key to look up
+            default: Returned if the key is not in the tree
+
+        Returns:
+            The value of the key or default
+        """
+
+        if self.__threadSafe:
+            path, found = self.__search_latched(key)
+            node, index = path[-1]
+            value = node.getValues()[index] if found else default
+            self.__release_read(path)
+            return value
+
+        if self.__filter is not None and self.__ruled_out(key):
+            return default
+
+        path, found = self.__search_path(key)
+        if not found:
+            if self.__filter is not None:
+                self.__filterFalsePositives += 1
+            return default
+
+        node, index = path[-1]
+        return node.getValues()[index]
+
+    def __contains__(self, key) -> bool:
+        """
+        Checks whether a key is in the tree, see get.
+
+        Args:
+            key (int): The key to look up
+
+        Returns:
+            bool: Whether the key is in the tree
+        """
+
+        return self.get(key, _MISSING) is not _MISSING
+
+    def put(self, key, value) -> None:
+        """
+        Sets the value of a key. If the key is not in the tree yet, it is inserted (upsert).
+
+        Args:
+            key (int): The key
+            value: The new value of the key
+
+        Returns:
+            None: Nothing
+
+        Raises:
+            ValueError: If the aggregate of the tree can't summarize the value
+        """
+
+        if self.__aggregate is not None:
+            self.__aggregate.check(key, value)
+
+        if self.__threadSafe:
+            self.__put_latched(key, value, True)
+            return
+
+        if self.__topDown:
+            self.__put_top_down(key, value, True)
+        else:
+            path, found = self.__search_path(key)
+            if found:
+                self.__mutate(path, self.__set_value, value)
+            else:
+                if self.__tracer is not None:
+                    self.__tracer.record(INSERT, key)
+                self.__mutate(path, self.__insert_along_path, key, value)
+
+        if self.__filter is not None:
+            self.__filter_add((key,))
+        if self.__wal is not None:
+            self.__log(PUT, key, value)
+
+    def pop(self, key, default=_MISSING):
+        """
+        Deletes a key from the tree and returns its value.
+
+        Args:
+            key (int): The key to delete
+            default: Returned if the key is not in the tree. If no default is given, a missing key raises a ValueError
+
+        Returns:
+            The value of the deleted key or default
+
+        Raises:
+            ValueError: If the key is not in the tree and no default is given
+        """
+
+        if self.__threadSafe:
+            return self.__pop_latched(key, default)
+
+        ruled_out = self.__filter is not None and self.__ruled_out(key)
+        if ruled_out:
+            found, value = False, None
+        elif self.__topDown:
+            found, value = self.__pop_top_down(key)
+        else:
+            path, found = self.__search_path(key)
+            value = self.__mutate(path, self.__delete_along_path) if found else None
+
+        if self.__filter is not None and not ruled_out:
+            self.__filter_searched(found)
+        if found:
+            if self.__wal is not None:
+                self.__log(LOG_DELETE, key)
+            return value
+        elif default is _MISSING:
+            raise ValueError(f"{key} is not in the tree.")
+        else:
+            return default
+
+    def snapshot(self) -> BalancedTree:
+        """
+        Returns the current version of the tree as a tree of its own. The snapshot shares all nodes with this tree, so
+        this takes constant time. Since no node reachable from the snapshot is ever changed, readers can use it
+        without locks while this tree is changed. Changes of the snapshot don't affect this tree either.
+
+        Returns:
+            BalancedTree: The snapshot
+
+        Raises:
+            ValueError: If the tree is not in copy-on-write mode
+        """
+
+        if not self.__copyOnWrite:
+            raise ValueError("Snapshots are only available in copy-on-write mode.")
+
+        view = BalancedTree(self.k, compact=self.__compact, copyOnWrite=True, counted=self.__counted,
+                            aggregate=self.__aggregate, topDown=self.__topDown, bloomFilter=self.__filterRate)
+        view.root = self.root
+        # the filter is shared as well: Both trees only add keys to it and replace it when it is rebuilt, so it keeps
+        # containing the keys of both versions
+        view.__filter = self.__filter
+        return view
+
+    def __mutate(self, path, mutation, *args):
+        """
+        Applies a change along a search path. In copy-on-write mode, the nodes of the path are copied first and the
+        change is applied to the copies. The copied root is published as the new root once the change is finished,
+        unless the change replaced the root itself.
+
+        Args:
+            path (list[Tuple[Node, int]]): Path from the root, as returned by __search_path
+            mutation (Callable): The change, which is called with the path and args
+            *args: Further arguments of the change
+
+        Returns:
+            The return value of the change
+        """
+
+        if not self.__copyOnWrite:
+            return mutation(path, *args)
+
+        original_root = self.root
+        root = self.__copy_path(path)
+        result = mutation(path, *args)
+
+        if self.root is original_root:
+            self.root = root
+        self.__fresh.clear()
+        return result
+
+    def __copy_path(self, path) -> Node:
+        """
+        Replaces the nodes of a path, that weren't copied by the current change yet, with copies. Every copy replaces
+        the original in the children of the copied parent, so the copies form a new path from the copied root.
+
+        Args:
+            path (list[Tuple[Node, int]]): Path from the root, which is updated in place
+
+        Returns:
+            Node: The copied root
+        """
+
+        parent = None
+        for i, (node, index) in enumerate(path):
+            if node not in self.__fresh:
+                # the copy doesn't reference its parent. Otherwise, every version would form a reference cycle, which
+                # is only freed by the garbage collector instead of as soon as no reader holds it anymore
+                node = node.copy()
+                self.__fresh.add(node)
+                if parent is not None:
+                    parent.getChildren()[path[i - 1][1]] = node
+                path[i] = (node, index)
+
+            parent = node
+
+        return path[0][0]
+
+    def __own_child(self, parent, index) -> Node:
+        """
+        Returns a child, which is about to be changed. In copy-on-write mode, the child is replaced with a copy first.
+
+        Args:
+            parent (Node): The parent, which must be copied already
+            index (int): Index of the child of the parent
+
+        Returns:
+            Node: The child, which may be changed
+        """
+
+        child = parent.getChildren()[index]
+        if self.__copyOnWrite and child not in self.__fresh:
+            child = child.copy()
+            self.__fresh.add(child)
+            parent.getChildren()[index] = child
+
+        return child
+
+    def __update_counts(self, path, difference) -> None:
+        """
+        Adds the change of the number of keys in the last node of a path to the counts of all nodes of the path, see
+        CountedNode. If the tree keeps an aggregate, the nodes are counted and summarized again from the bottom up
+        instead, see AggregateNode.
+
+        Args:
+            path (list[Tuple[Node, int]]): Path from the root to the changed node
+            difference (int): Number of added keys, negative for removed keys
+
+        Returns:
+            None: Nothing
+        """
+
+        if self.__aggregate is not None:
+            for node, _ in reversed(path):
+                node.recount()
+        else:
+            for node, _ in path:
+                node.count += difference
+
+    def __set_value(self, path, value) -> None:
+        """
+        Sets the value of the key at the end of the path. The path is summarized again, if the tree keeps an aggregate.
+
+        Args:
+            path (list[Tuple[Node, int]]): Path to the key, as returned by __search_path
+            value: The new value
+
+        Returns:
+            None: Nothing
+        """
+
+        node, index = path[-1]
+        node.getValues()[index] = value
+        if self.__aggregate is not None:
+            self.__update_counts(path, 0)
+
+    def __search_latched(self, key_to_search) -> Tuple[list[Tuple[Node, int]], bool]:
+        """
+        Searches like __search_path, but with latch coupling for reading: The latch of a child is acquired before the
+        latch of its parent is released. The tree latch and the latch of the last node of the path stay held, so the
+        node can be read. They are released with __release_read.
+
+        Args:
+            key_to_search (int): Key to search for
+
+        Returns:
+            Tuple[list[Tuple[Node, int]], bool]: The path and whether the key was found, see __search_path
+        """
+
+        self.__treeLatch.acquireRead()
+        self.__rootLatch.acquireRead()
+        node = self.root
+        node.latch.acquireRead()
+        self.__rootLatch.releaseRead()
+
+        path = []
+        while True:
+            found, index = node.searchKey(key_to_search)
+            path.append((node, index))
+
+            if found or node.isLeaf():
+                break
+
+            child = node.getChildren()[index]
+            child.latch.acquireRead()
+            node.latch.releaseRead()
+            node = child
+
+        if self.__tracer is not None:
+            self.__tracer.record(SEARCH, key_to_search, found, len(path))
+        if self.__observers:
+            self.__notify_visits(path)
+        return path, found
+
+    def __release_read(self, path) -> None:
+        """
+        Releases the latches held by __search_latched.
+
+        Args:
+            path (list[Tuple[Node, int]]): The path returned by __search_latched
+
+        Returns:
+            None: Nothing
+        """
+
+        path[-1][0].latch.releaseRead()
+        self.__treeLatch.releaseRead()
+
+    def __latch_path(self, key_to_search, deleting) -> Tuple[list[Tuple[Node, int]], bool]:
+        """
+        Searches like __search_path, but with latch coupling for writing. Every node is latched for writing. Once a
+        node is safe, i.e. it doesn't split on insert or underflow on delete, the latches of its ancestors and of the
+        root reference are released, since the change can't reach them. The returned path starts at the highest node,
+        which is still latched, so the changes along the path stop at its first node at the latest.
+
+        If a key is deleted from an internal node, the paths to its in order predecessor and successor are latched as
+        well, since one of them gives the replacement key.
+
+        The latches are released with __release_write.
+
+        Args:
+            key_to_search (int): Key to search for
+            deleting (bool): Whether the key is deleted, otherwise it is inserted
+
+        Returns:
+            Tuple[list[Tuple[Node, int]], bool]: The latched path and whether the key was found
+        """
+
+        self.__treeLatch.acquireRead()
+        self.__rootLatch.acquireWrite()
+        self.__latches.rootHeld = True
+        self.__latches.held = held = []
+
+        node = self.root
+        node.latch.acquireWrite()
+        held.append(node)
+
+        path = []
+        while True:
+            if not path and self.__latches.rootHeld:
+                # the root may shrink to no keys, but it has no minimum
+                safe = node.isLeaf() or len(node.keys) > 1 if deleting else len(node.keys) < 2 * self.k
+            else:
+                safe = node.more_than_minimal_elements() if deleting else len(node.keys) < 2 * self.k
+
+            if safe:
+                for ancestor in held[:-1]:
+                    ancestor.latch.releaseWrite()
+                del held[:-1]
+                path.clear()
+
+                if self.__latches.rootHeld:
+                    self.__rootLatch.releaseWrite()
+                    self.__latches.rootHeld = False
+
+            found, index = node.searchKey(key_to_search)
+            path.append((node, index))
+            if found or node.isLeaf():
+                break
+
+            node = node.getChildren()[index]
+            node.latch.acquireWrite()
+            held.append(node)
+
+        if found and deleting and not node.isLeaf():
+            for child_index, rightmost in ((index, True), (index + 1, False)):
+                child = node.getChildren()[child_index]
+                while True:
+                    self.__latch_for_write(child)
+                    if child.isLeaf():
+                        break
+                    child = child.getChildren()[-1 if rightmost else 0]
+
+        if self.__tracer is not None:
+            self.__tracer.record(SEARCH, key_to_search, found, len(path))
+        return path, found
+
+    def __latch_for_write(self, node) -> None:
+        """
+        Latches a node for writing for the current change, unless the change holds its latch already or the tree
+        latch is held exclusively.
+
+        Args:
+            node (Node): The node
+
+        Returns:
+            None: Nothing
+        """
+
+        # operations holding the tree latch exclusively don't latch nodes
+        held = getattr(self.__latches, "held", None)
+        if held is not None and node not in held:
+            node.latch.acquireWrite()
+            held.append(node)
+
+    def __release_write(self) -> None:
+        """
+        Releases the latches held by the current change, see __latch_path.
+
+        Returns:
+            None: Nothing
+        """
+
+        for node in self.__latches.held:
+            node.latch.releaseWrite()
+        self.__latches.held = None
+
+        if self.__latches.rootHeld:
+            self.__rootLatch.releaseWrite()
+            self.__latches.rootHeld = False
+
+        self.__treeLatch.releaseRead()
+
+    def __put_latched(self, key, value, replace) -> None:
+        """
+        Inserts a key or sets its value in thread-safe mode, see insert and put.
+
+        Args:
+            key (int): The key
+            value: The value of the key
+            replace (bool): Whether the value of an existing key is replaced, otherwise a ValueError is raised
+
+        Returns:
+            None: Nothing
+
+        Raises:
+            ValueError: If the key is already in the tree and replace is False
+        """
+
+        path, found = self.__latch_path(key, False)
+        try:
+            if found and not replace:
+                raise ValueError(f"{key} is already in the tree.")
+            elif found:
+                self.__set_value(path, value)
+            else:
+                if self.__tracer is not None:
+                    self.__tracer.record(INSERT, key)
+                self.__insert_along_path(path, key, value)
+
+            # log while the latches are held, so the changes of a key are logged in the order they were applied
+            if self.__wal is not None:
+                self.__wal.append(PUT, key, value)
+        finally:
+            self.__release_write()
+
+        self.__checkpoint_latched()
+
+    def __pop_latched(self, key, default):
+        """
+        Deletes a key in thread-safe mode, see pop.
+
+        Args:
+            key (int): The key to delete
+            default: Returned if the key is not in the tree. If it is _MISSING, a missing key raises a ValueError
+
+        Returns:
+            The value of the deleted key or default
+
+        Raises:
+            ValueError: If the key is not in the tree and no default is given
+        """
+
+        path, found = self.__latch_path(key, True)
+        try:
+            if not found:
+                if default is _MISSING:
+                    raise ValueError(f"{key} is not in the tree.")
+                return default
+
+            value = self.__delete_along_path(path)
+            if self.__wal is not None:
+                self.__wal.append(LOG_DELETE, key)
+        finally:
+            self.__release_write()
+
+        self.__checkpoint_latched()
+        return value
+
+    def __checkpoint_latched(self) -> None:
+        """
+        Writes a checkpoint in thread-safe mode, once the log asks for it. The tree latch is held exclusively, so no
+        change runs while the checkpoint is written.
+
+        Returns:
+            None: Nothing
+        """
+
+        if self.__wal is None or not self.__wal.needsCheckpoint():
+            return
+
+        self.__treeLatch.acquireWrite()
+        try:
+            # another thread may have written the checkpoint in the meantime
+            if self.__wal.needsCheckpoint():
+                self.__wal.checkpoint(self.k, self.__ascending(None, None, True))
+        finally:
+            self.__treeLatch.releaseWrite()
+
+    def __exclusively(self, iterator) -> Iterator:
+        """
+        Holds the tree latch exclusively, while the iterator runs. The latch is acquired with the first element and
+        released, when the iterator is exhausted or closed.
+
+        Args:
+            iterator (Iterator): The iterator
+
+        Returns:
+            Iterator: The elements of the iterator
+        """
+
+        self.__treeLatch.acquireWrite()
+        try:
+            yield from iterator
+        finally:
+            self.__treeLatch.releaseWrite()
+
+    def __insert_along_path(self, path, key, value=None) -> None:
+        """
+        Inserts a key into the last node of the path. If the node is full, split the node into 2 and insert the middle
+        key into the parent, which is the previous entry of the path. This is repeated until a node does not overflow.
+        If the root is split, create a new root.
+
+        Args:
+            path (list[Tuple[Node, int]]): Path from the root to the leaf, as returned by __search_path. The index of
+                                            the leaf entry must be the insert position of "key". The path is consumed.
+            key (int): key that should be inserted
+            value: value of the key
+
+        Returns:
+            None
+
+        """
+
+        # reference to a child node, whose reference should be inserted after "key". Only set for non leaf nodes
+        child = None
+
+        while True:
+            node, index = path.pop()
+
+            # insert key and child into node at the position that is known from the search
+            node.insert_key(index, key, value)
+            if child is not None:
+                node.insert_child(index + 1, child)
+
+            if not node.isOverflow():
+                if self.__counted:
+                    # the node and its ancestors gain one key, a split below only moved keys into the node
+                    path.append((node, index))
+                    self.__update_counts(path, 1)
+                return
+
+            # split node into two nodes and middle key
+            new_left_node, middle_key, new_right_node, middle_value = node.split_with_value()
+
+            if self.__tracer is not None:
+                self.__tracer.record(SPLIT, middle_key, len(new_left_node.keys), len(new_right_node.keys))
+            for observer in self.__observers:
+                observer.onSplit(new_left_node, middle_key, new_right_node)
+
+            # check if node is the root
+            if not path:
+                # node is the root
+                # make new root with the middle_key and the left and right node as children
+                new_root = self.__nodeType(self.k, keys=[middle_key], children=[new_left_node, new_right_node],
+                                           parent=None, values=[middle_value])
+                # set new root as parent
+                new_left_node.setParent(new_root)
+                new_right_node.setParent(new_root)
+                # set new root as tree root
+                self.root = new_root
+
+                if self.__tracer is not None:
+                    self.__tracer.record(NEW_ROOT, middle_key)
+                return
+
+            # insert middle_key into the parent node of the "node" in the next iteration, together with a reference
+            # to the new_right_node after the middle_key. The index of the parent entry is the position of "node",
+            # which is also the position of the middle key in the parent.
+            key, value, child = middle_key, middle_value, new_right_node
+
+    def delete(self, key) -> None:
+        """
+        Delete a key from the balanced tree. This is an implementation of the following description
+        (https://www.cs.rhodes.edu/~kirlinp/courses/db/f16/handouts/btrees-deletion.pdf):
+
+        Deletion has two base cases:
+
+        Deletion from a leaf node
+            1. Search for the value to delete.
+            2. If the value is in a leaf node, simply delete it from the node.
+            3. If underflow happens, rebalance the tree as described in section "Rebalancing after deletion" below.
+
+        Deletion from an internal node
+            1. Choose a new separator (the largest element in the left subtree), remove it from the leaf node it is in,
+            and replace the element to be deleted with the new separator.
+            2. The previous step deleted an element (the new separator) from a leaf node. If that leaf node is now
+            deficient (has fewer than the required number of nodes), then rebalance the tree starting from the leaf
+            node.
+
+
+        Args:
+            key(int): key to delete from balanced tree
+
+        Returns:
+            None: Nothing
+
+        """
+
+        if self.__threadSafe:
+            self.__pop_latched(key, _MISSING)
+            return
+        elif self.__filter is not None and self.__ruled_out(key):
+            raise ValueError(f"{key} is not in the tree.")
+        elif self.__topDown:
+            found, _ = self.__pop_top_down(key)
+            if self.__filter is not None:
+                self.__filter_searched(found)
+            if not found:
+                raise ValueError(f"{key} is not in the tree.")
+            if self.__wal is not None:
+                self.__log(LOG_DELETE, key)
+            return
+
+        # find the node to delete the key
+        path, found = self.__search_path(key)
+        if self.__filter is not None:
+            self.__filter_searched(found)
+        if found:
+            self.__mutate(path, self.__delete_along_path)
+            if self.__wal is not None:
+                self.__log(LOG_DELETE, key)
+        else:
+            # key wasn't found in tree
+            raise ValueError(f"{key} is not in the tree.")
+
+    def __delete_along_path(self, path) -> object:
+        """
+        Deletes the key at the end of the path from the tree, see delete.
+
+        Args:
+            path (list[Tuple[Node, int]]): Path from the root to the node containing the key, as returned by
+                                            __search_path. The index of the last entry is the index of the key.
+                                            The path is consumed.
+
+        Returns:
+            object: The value of the deleted key
+
+        """
+
+        target_node, key_index = path[-1]
+        key = target_node.getKeys()[key_index]
+        if self.__tracer is not None:
+            self.__tracer.record(DELETE, key)
+
+        # check if target_node is leaf node
+        if target_node.isLeaf():
+            # delete from leaf and rebalance the tree, if an underflow occurred
+            _, value = target_node.popItem(key_index)
+            if self.__counted:
+                self.__update_counts(path, -1)
+
+            # only rebalance the node in an underflow, if it is not a leaf and the root at the same time
+            if target_node.isUnderflow() and len(path) > 1:
+                self.__rebalance_along_path(path)
+        else:
+            # target_node is an internal node
+            value = target_node.getValues()[key_index]
+
+            # get inorder predecessor and check if node has keys to spare.
+            # The path to the replacement node is appended to a copy of the search path
+            replacement_path = list(path)
+            replacement_node, replacement_key = self.__get_in_order_predecessor(replacement_path)
+            if not replacement_node.more_than_minimal_elements():
+                # use in order successor instead
+                replacement_path = list(path)
+                replacement_node, replacement_key = self.__get_in_order_successor(replacement_path)
+
+            if self.__copyOnWrite:
+                # the nodes below the target node are not copied yet
+                self.__copy_path(replacement_path)
+                replacement_node, _ = replacement_path[-1]
+
+            if self.__tracer is not None:
+                self.__tracer.record(REPLACE, key, replacement_key)
+
+            # replace element that should be deleted with the predecessor_key, the value moves together with it
+            replacement_value = replacement_node.getValues()[replacement_path[-1][1]]
+            target_node.replace_key_at(key_index, replacement_key, replacement_value)
+
+            # delete key from replacement node
+            replacement_node.popKey(replacement_path[-1][1])
+            if self.__counted:
+                self.__update_counts(replacement_path, -1)
+
+            # fix predecessor node if it had an underflow
+            if replacement_node.isUnderflow():
+                self.__rebalance_along_path(replacement_path)
+
+        return value
+
+    def __put_top_down(self, key, value, replace) -> None:
+        """
+        Inserts a key or sets its value in a single pass from the root to a leaf. Every full node (2k + 1 keys) is
+        split before it is entered, so the node above it always has room for the middle key. The leaf the key arrives
+        in has room as well, so nothing has to be split after the key was inserted and the search path is never
+        walked back up:
+
+                      [ 5 ]                                           [ 5   8 ]
+               [2  3  4]   [6  7  8  9  10]    insert 11 (k = 2)   [...]  [6  7]  [9  10  11]
+                             full, split before entering it
+
+        Args:
+            key (int): The key
+            value: The value of the key
+            replace (bool): Whether the value of an existing key is replaced, otherwise a ValueError is raised
+
+        Returns:
+            None: Nothing
+
+        Raises:
+            ValueError: If the key is already in the tree and replace is False
+        """
+
+        max_keys = 2 * self.k + 1
+        try:
+            node = self.__own(self.root)
+            if len(node.keys) == max_keys:
+                # the root has no parent to take the middle key, it becomes the only key of a new root
+                new_left_node, middle_key, new_right_node, middle_value = self.__split_top_down(node)
+                node = self.__fragment([middle_key], [middle_value], [new_left_node, new_right_node])
+                if self.__tracer is not None:
+                    self.__tracer.record(NEW_ROOT, middle_key)
+            self.root = node
+
+            path = []
+            while True:
+                found, index = node.searchKey(key)
+                path.append((node, index))
+                if found or node.isLeaf():
+                    break
+
+                child = node.getChildren()[index]
+                if len(child.keys) == max_keys:
+                    # split the child before entering it, the node has room for the middle key
+                    new_left_node, middle_key, new_right_node, middle_value = self.__split_top_down(
+                        self.__own_child(node, index))
+                    node.insert_key(index, middle_key, middle_value)
+                    node.insert_child(index + 1, new_right_node)
+                    new_right_node.setParent(node)
+
+                    if key == middle_key:
+                        found = True
+                        break
+                    elif key > middle_key:
+                        index += 1
+                        path[-1] = (node, index)
+
+                node = self.__own_child(node, index)
+
+            if self.__observers:
+                self.__notify_visits(path)
+
+            if found:
+                if not replace:
+                    raise ValueError(f"{key} is already in the tree.")
+                self.__set_value(path, value)
+                return
+
+            if self.__tracer is not None:
+                self.__tracer.record(INSERT, key)
+            node.insert_key(index, key, value)
+            if self.__counted:
+                self.__update_counts(path, 1)
+        finally:
+            self.__fresh.clear()
+
+    def __split_top_down(self, node) -> Tuple[Node, int, Node, object]:
+        """
+        Splits a full node of 2k + 1 keys into two nodes of k keys and the middle key, see __put_top_down.
+
+        Args:
+            node (Node): The full node, which may be changed
+
+        Returns:
+            Tuple[Node, int, Node, object]: The left node, the middle key, the right node and the middle value
+        """
+
+        new_left_node, middle_key, new_right_node, middle_value = node.split_with_value()
+        if self.__copyOnWrite:
+            self.__fresh.add(new_right_node)
+
+        if self.__tracer is not None:
+            self.__tracer.record(SPLIT, middle_key, len(new_left_node.keys), len(new_right_node.keys))
+        for observer in self.__observers:
+            observer.onSplit(new_left_node, middle_key, new_right_node)
+
+        return new_left_node, middle_key, new_right_node, middle_value
+
+    def __pop_top_down(self, key) -> Tuple[bool, object]:
+        """
+        Deletes a key in a single pass from the root to a leaf. Every node with k keys is filled before it is entered,
+        by a rotation from a sibling or by a merge with a sibling, see __fill_top_down. The node the key is removed from
+        keeps at least k keys, so nothing has to be rebalanced afterwards:
+
+            1. If the key is in a leaf, it is removed.
+            2. If the key is in an internal node and the child before it has more than k keys, the key is replaced
+               with its in order predecessor, which is removed from the child on the way down, see __pop_outermost.
+            3. Otherwise, if the child after the key has more than k keys, the in order successor is used instead.
+            4. Otherwise, both children have k keys. They are merged together with the key, which is then removed from
+               the merged node.
+
+        If the key is not in the tree, the tree was rebalanced on the way down, but still contains the same keys.
+
+        Args:
+            key (int): The key to delete
+
+        Returns:
+            Tuple[bool, object]: Whether the key was found and its value
+        """
+
+        try:
+            node = self.__own(self.root)
+            self.root = node
+
+            path = []
+            while True:
+                found, index = node.searchKey(key)
+                if node.isLeaf():
+                    path.append((node, index))
+                    if not found:
+                        return False, None
+
+                    if self.__tracer is not None:
+                        self.__tracer.record(DELETE, key)
+                    _, value = node.popItem(index)
+                    break
+
+                children = node.getChildren()
+                if found and (children[index].more_than_minimal_elements()
+                              or children[index + 1].more_than_minimal_elements()):
+                    if self.__tracer is not None:
+                        self.__tracer.record(DELETE, key)
+
+                    # replace the key with its in order predecessor or successor, which is removed on the way down
+                    value = node.getValues()[index]
+                    largest = children[index].more_than_minimal_elements()
+                    child_index = index if largest else index + 1
+                    path.append((node, child_index))
+                    replacement_key, replacement_value = self.__pop_outermost(self.__own_child(node, child_index),
+                                                                              path, largest)
+                    if self.__tracer is not None:
+                        self.__tracer.record(REPLACE, key, replacement_key)
+                    node.replace_key_at(index, replacement_key, replacement_value)
+                    break
+
+                if found:
+                    # both children have k keys, merge them with the key and delete it from the merged node
+                    index = self.__merge_top_down(node, index)
+                elif not children[index].more_than_minimal_elements():
+                    index = self.__fill_top_down(node, index)
+
+                if not node.keys:
+                    # the root lost its last key to a merge, the merged node is the new root
+                    node = node.getChildren()[0]
+                    node.setParent(None)
+                    self.root = node
+                    if self.__tracer is not None:
+                        self.__tracer.record(SHRINK, len(node.keys))
+                    continue
+
+                path.append((node, index))
+                node = self.__own_child(node, index)
+
+            if self.__observers:
+                self.__notify_visits(path)
+            if self.__counted:
+                self.__update_counts(path, -1)
+
+            return True, value
+        finally:
+            self.__fresh.clear()
+
+    def __pop_outermost(self, node, path, largest) -> Tuple[int, object]:
+        """
+        Removes the largest or smallest key from the subtree of a node with more than k keys. Like in __pop_top_down,
+        every node with k keys is filled before it is entered.
+
+        Args:
+            node (Node): Root of the subtree, which may be changed
+            path (list[Tuple[Node, int]]): The path to the node, the path to the removed key is appended
+            largest (bool): Whether the largest key is removed, otherwise the smallest
+
+        Returns:
+            Tuple[int, object]: The removed key and its value
+        """
+
+        while not node.isLeaf():
+            index = len(node.keys) if largest else 0
+            if not node.getChildren()[index].more_than_minimal_elements():
+                index = self.__fill_top_down(node, index)
+            path.append((node, index))
+            node = self.__own_child(node, index)
+
+        index = len(node.keys) - 1 if largest else 0
+        path.append((node, index))
+        return node.popItem(index)
+
+    def __fill_top_down(self, parent, index) -> int:
+        """
+        Fills a child with k keys before it is entered by a deletion. If a neighbouring sibling has more than k keys, a
+        key is rotated from it through the parent. Otherwise, the child is merged with a sibling and the separator
+        between them, which gives a node of 2k + 1 keys. The parent has more than k keys or is the root, so it can lose
+        the separator.
+
+        Args:
+            parent (Node): The parent, which may be changed
+            index (int): Index of the child in the parent
+
+        Returns:
+            int: Index of the child, that contains the keys of the filled child after the fill
+        """
+
+        siblings = parent.getChildren()
+        left_sibling = siblings[index - 1] if index > 0 else None
+        right_sibling = siblings[index + 1] if index + 1 < len(siblings) else None
+
+        if left_sibling is not None and left_sibling.more_than_minimal_elements():
+            seperator_key, new_seperator_key = parent.keys[index - 1], left_sibling.keys[-1]
+            deficient_node = self.__own_child(parent, index)
+            left_sibling = self.__own_child(parent, index - 1)
+            self.__rotate_right(parent, deficient_node, left_sibling, index - 1)
+
+            if self.__tracer is not None:
+                self.__tracer.record(ROTATE_RIGHT, seperator_key, new_seperator_key)
+            for observer in self.__observers:
+                observer.onRotate(deficient_node, left_sibling, seperator_key, new_seperator_key)
+            return index
+        elif right_sibling is not None and right_sibling.more_than_minimal_elements():
+            seperator_key, new_seperator_key = parent.keys[index], right_sibling.keys[0]
+            deficient_node = self.__own_child(parent, index)
+            right_sibling = self.__own_child(parent, index + 1)
+            self.__rotate_left(parent, deficient_node, right_sibling, index)
+
+            if self.__tracer is not None:
+                self.__tracer.record(ROTATE_LEFT, seperator_key, new_seperator_key)
+            for observer in self.__observers:
+                observer.onRotate(deficient_node, right_sibling, seperator_key, new_seperator_key)
+            return index
+
+        return self.__merge_top_down(parent, index if right_sibling is not None else index - 1)
+
+    def __merge_top_down(self, parent, separator_index) -> int:
+        """
+        Merges the two children of a parent next to a separator together with the separator, see __fill_top_down.
+
+        Args:
+            parent (Node): The parent, which may be changed
+            separator_index (int): Index of the separator
+
+        Returns:
+            int: Index of the merged node in the parent
+        """
+
+        # the right node is only read and removed from the parent, it doesn't need to be copied
+        seperator_key = parent.keys[separator_index]
+        left_node = self.__own_child(parent, separator_index)
+        right_node = parent.getChildren()[separator_index + 1]
+        merged_node = self.__merge_nodes(parent, left_node, right_node, separator_index)
+
+        if self.__tracer is not None:
+            self.__tracer.record(MERGE, seperator_key, len(merged_node.keys))
+        for observer in self.__observers:
+            observer.onMerge(merged_node, seperator_key)
+
+        return separator_index
+
+    def insert_many(self, values) -> BatchReport:
+        """
+        Inserts many keys at once. The keys are sorted and inserted in ascending order, so consecutive keys share most
+        of their search path: Instead of searching every key from the root, the search resumes from the deepest node of
+        the previous path, whose subtree can contain the key. Keys that belong into the same leaf are merged into it in
+        one step, as long as the leaf has room. Only keys that would overflow a leaf are inserted with a split, which
+        starts the next search from the root again. An empty tree is built with BulkLoad.buildTree instead.
+
+        Args:
+            values (Iterable[int]): The keys to insert
+
+        Returns:
+            BatchReport: The inserted keys and the rejected keys, which are already in the tree
+
+        Raises:
+            ValueError: If the aggregate of the tree can't summarize keys without values, before any key is inserted
+
+        """
+
+        if not self.__threadSafe:
+            return self.__insert_many(values)
+
+        self.__treeLatch.acquireWrite()
+        try:
+            return self.__insert_many(values)
+        finally:
+            self.__treeLatch.releaseWrite()
+
+    def __insert_many(self, values) -> BatchReport:
+        """
+        Inserts many keys at once, see insert_many.
+
+        Args:
+            values (Iterable[int]): The keys to insert
+
+        Returns:
+            BatchReport: The inserted keys and the rejected keys, which are already in the tree
+
+        """
+
+        report = BatchReport()
+
+        # sort the keys and reject duplicates within the batch
+        keys = []
+        for key in sorted(values):
+            if keys and keys[-1] == key:
+                report.reject(key, f"{key} is already in the tree.")
+            else:
+                keys.append(key)
+
+        # the keys are inserted without values, which the aggregate must be able to summarize
+        if self.__aggregate is not None:
+            for key in keys:
+                self.__aggregate.check(key, None)
+
+        if self.isEmpty():
+            self.root = buildTree(self.k, keys, nodeType=self.__nodeType)
+            report.applied.extend(keys)
+        elif self.__copyOnWrite:
+            # every key creates a version of its own, so the path of the previous key can't be reused
+            for key in keys:
+                path, found = self.__search_path(key)
+                if found:
+                    report.reject(key, f"{key} is already in the tree.")
+                else:
+                    self.__mutate(path, self.__insert_along_path, key)
+                    report.applied.append(key)
+        else:
+            path, bounds = [], []
+            max_keys = 2 * self.k
+            i = 0
+            while i < len(keys):
+                key = keys[i]
+                if self.__resume_search(path, bounds, key):
+                    report.reject(key, f"{key} is already in the tree.")
+                    i += 1
+                    continue
+
+                leaf, _ = path[-1]
+                upper_bound = bounds[-1]
+
+                # collect the following keys, which belong into this leaf as well and still fit into it
+                run = []
+                while (i < len(keys) and len(leaf.keys) + len(run) < max_keys
+                       and (upper_bound is None or keys[i] < upper_bound)):
+                    if run and leaf.hasKey(keys[i]):
+                        report.reject(keys[i], f"{keys[i]} is already in the tree.")
+                    else:
+                        run.append(keys[i])
+                    i += 1
+
+                if run:
+                    # the structure of the tree doesn't change, the path stays valid for the next key
+                    leaf.insert_keys_sorted(run)
+                    if self.__counted:
+                        self.__update_counts(path, len(run))
+                else:
+                    # the leaf is full, insert the key with a split and start the next search from the root
+                    run.append(key)
+                    self.__insert_along_path(path, key)
+                    path, bounds = [], []
+                    i += 1
+
+                report.applied.extend(run)
+
+        if self.__tracer is not None:
+            for key in report.applied:
+                self.__tracer.record(INSERT, key)
+        if self.__filter is not None:
+            self.__filter_add(report.applied)
+        if self.__wal is not None:
+            for key in report.applied:
+                self.__log(PUT, key)
+
+        return report
+
+    def delete_many(self, values) -> BatchReport:
+        """
+        Deletes many keys at once. Like insert_many, the keys are deleted in ascending order and the search of a key
+        resumes from the previous path. Keys are removed from a leaf directly, as long as the leaf keeps more than k
+        keys. All other keys are deleted with a rebalancing, which starts the next search from the root again.
+
+        Args:
+            values (Iterable[int]): The keys to delete
+
+        Returns:
+            BatchReport: The deleted keys and the rejected keys, which are not in the tree
+
+        """
+
+        if not self.__threadSafe:
+            return self.__delete_many(values)
+
+        self.__treeLatch.acquireWrite()
+        try:
+            return self.__delete_many(values)
+        finally:
+            self.__treeLatch.releaseWrite()
+
+    def __delete_many(self, values) -> BatchReport:
+        """
+        Deletes many keys at once, see delete_many.
+
+        Args:
+            values (Iterable[int]): The keys to delete
+
+        Returns:
+            BatchReport: The deleted keys and the rejected keys, which are not in the tree
+
+        """
+
+        report = BatchReport()
+        path, bounds = [], []
+        previous_key = None
+
+        if self.__copyOnWrite:
+            # every key creates a version of its own, so the path of the previous key can't be reused
+            for key in sorted(values):
+                path, found = self.__search_path(key)
+                if key == previous_key or not found:
+                    report.reject(key, f"{key} is not in the tree.")
+                else:
+                    previous_key = key
+                    self.__mutate(path, self.__delete_along_path)
+                    report.applied.append(key)
+        else:
+            for key in sorted(values):
+                if key == previous_key or not self.__resume_search(path, bounds, key):
+                    report.reject(key, f"{key} is not in the tree.")
+                    continue
+
+                previous_key = key
+                node, index = path[-1]
+                if node.isLeaf() and (node.more_than_minimal_elements() or len(path) == 1):
+                    # the leaf doesn't underflow, the path stays valid for the next key
+                    node.popKey(index)
+                    if self.__counted:
+                        self.__update_counts(path, -1)
+                    if self.__tracer is not None:
+                        self.__tracer.record(DELETE, key)
+                else:
+                    self.__delete_along_path(path)
+                    path, bounds = [], []
+
+                report.applied.append(key)
+
+        if self.__filter is not None:
+            self.__filter_delete(len(report.applied))
+        if self.__wal is not None:
+            for key in report.applied:
+                self.__log(LOG_DELETE, key)
+
+        return report
+
+    def delete_range(self, lo, hi) -> None:
+        """
+        Deletes every key between lo and hi (both inclusive). Instead of deleting the keys one by one, the tree is cut
+        along the search paths of lo and hi. The cuts keep the subtrees left of lo and right of hi, the subtrees
+        between the two paths are dropped without visiting them:
+
+            1. The keys smaller than lo are collected from the path of lo. On every level, the keys and children left of
+               the path form a fragment, whose last separator connects it with the part of the level below. The
+               fragments are joined bottom-up into one tree, see __join.
+            2. The keys bigger than hi are collected the same way from the path of hi.
+            3. The smallest key bigger than hi joins both trees as separator.
+
+        Joining two trees of different heights hangs the lower tree into the border of the higher tree, so the balance
+        is only repaired along the two paths. The whole deletion takes O(k * log n) steps, no matter how many keys are
+        deleted.
+
+        Args:
+            lo (int): The smallest key to delete
+            hi (int): The biggest key to delete
+
+        Returns:
+            None: Nothing
+        """
+
+        if lo > hi:
+            return
+
+        if self.__threadSafe:
+            self.__treeLatch.acquireWrite()
+        try:
+            self.__delete_range(lo, hi)
+        finally:
+            if self.__threadSafe:
+                self.__treeLatch.releaseWrite()
+
+    def __delete_range(self, lo, hi) -> None:
+        """
+        Deletes every key between lo and hi (both inclusive), see delete_range.
+
+        Args:
+            lo (int): The smallest key to delete
+            hi (int): The biggest key to delete
 
-from loguru import logger
+        Returns:
+            None: Nothing
+        """
 
-import config
-from .Node import Node
+        if self.__tracer is not None:
+            self.__tracer.record(DELETE_RANGE, lo, hi)
+        # the deleted keys stay in the Bloom filter, which needs their number to know when to rebuild
+        deleted = self.__count_between(lo, hi) if self.__filter is not None else 0
 
+        height = self.__height(self.root)
+        left, left_height, _ = self.__cut(lo, height, True)
+        right, right_height, smallest = self.__cut(hi, height, False)
+        if smallest is not None:
+            left, left_height = self.__join(left, left_height, smallest[0], smallest[1], right, right_height)
 
-class BalancedTree:
-    """
-    This class represents a balanced tree and handles operations (such as inserting, deleting or searching) on it
+        self.root = self.__nodeType(self.k) if left is None else left
+        self.root.setParent(None)
+        self.__fresh.clear()
 
-    Args:
-        k (int): Order of the balanced tree, minimal number of keys in one node, max is 2*k
-    """
+        if self.__filter is not None:
+            self.__filter_delete(deleted)
+        if self.__wal is not None:
+            self.__log(LOG_DELETE_RANGE, lo, hi)
 
-    def __init__(self, k):
-        self.root = Node(k)
-        self.k = k
+    def __count_between(self, lo, hi) -> int:
+        """
+        Counts the keys between lo and hi (both inclusive). Counted trees use count_range. Other trees search only the
+        nodes along the paths of lo and hi, the subtrees between the paths are counted node by node without comparing
+        their keys. This takes O(log n + m / k) node visits for m keys in the range.
 
-        self.__searchCount = 0
+        Args:
+            lo (int): The smallest key to count
+            hi (int): The biggest key to count
 
-    def search(self, key) -> Tuple[Node, int, int]:
+        Returns:
+            int: The number of keys
         """
-        Searches the whole balanced tree for a given key from the root recursively.
+
+        if self.__counted:
+            return self.count_range(lo, hi)
+
+        count = 0
+        # the nodes to count with whether their subtree may contain keys smaller than lo or bigger than hi
+        stack = [(self.root, True, True)]
+        while stack:
+            node, below, above = stack.pop()
+            keys, children = node.keys, node.children
+            i = bisect_left(keys, lo) if below else 0
+            j = bisect_right(keys, hi) if above else len(keys)
+            count += j - i
+
+            # children[i] and children[j] lie on the paths of lo and hi, the children between them are inside the range
+            if children:
+                for index in range(i, j + 1):
+                    stack.append((children[index], below and index == i, above and index == j))
+
+        return count
+
+    def split_at(self, key) -> Tuple[BalancedTree, BalancedTree]:
+        """
+        Splits the tree into two trees, one with the keys smaller than key and one with the keys from key on. The tree
+        is cut along the search path of key like in delete_range, so the subtrees on both sides of the path are reused
+        as they are and only the nodes along the path are rebuilt. This takes O(k * log n) steps instead of moving every
+        key into another tree.
+
+        Both trees have the order and the modes of this tree, but aren't logged and have no observers. The keys are
+        moved into them, so this tree is empty afterwards. In copy-on-write mode, the nodes of this tree aren't changed,
+        so snapshots taken before stay valid. The Bloom filters of the new trees are built from their keys, which takes
+        O(n) steps.
 
         Args:
-            key (int): Key that is searched for in the balanced tree
+            key (int): The smallest key of the right tree, it doesn't need to be in the tree
 
         Returns:
-            Tuple[Node,int]: The node the key was found in and the key
+            Tuple[BalancedTree, BalancedTree]: The tree with the keys smaller than key and the tree with the other keys
+        """
 
+        if self.__threadSafe:
+            self.__treeLatch.acquireWrite()
+        try:
+            if self.__tracer is not None:
+                self.__tracer.record(SPLIT_TREE, key)
+
+            height = self.__height(self.root)
+            left, right = self.__empty_like(), self.__empty_like()
+            left_root, _, _ = self.__cut(key, height, True)
+            right_root, right_height, smallest = self.__cut(key, height, False, inclusive=True)
+            if smallest is not None:
+                right_root, _ = self.__join(None, -1, smallest[0], smallest[1], right_root, right_height)
+
+            if left_root is not None:
+                left.root = left_root
+                left_root.setParent(None)
+            if right_root is not None:
+                right.root = right_root
+                right_root.setParent(None)
+            left.__rebuild_filter()
+            right.__rebuild_filter()
+
+            self.__fresh.clear()
+            self.__clear()
+        finally:
+            if self.__threadSafe:
+                self.__treeLatch.releaseWrite()
+
+        return left, right
+
+    @classmethod
+    def join(cls, left, right) -> BalancedTree:
         """
+        Concatenates two trees, whose keys don't overlap, into one tree. The smallest key of right is cut off right
+        (see split_at) and becomes the separator, that hangs the lower tree into the border of the higher tree, see
+        __join. Only the nodes along that border are changed, so this takes O(k * log n) steps.
 
-        self.__searchCount = 0
+        The joined tree has the order and the modes of left, but isn't logged and has no observers. The keys are moved
+        into it, so both trees are empty afterwards. In copy-on-write mode, the nodes of both trees aren't changed. The
+        Bloom filter of the joined tree is built from its keys, which takes O(n) steps.
+
+        Args:
+            left (BalancedTree): The tree with the smaller keys
+            right (BalancedTree): The tree with the bigger keys
 
-        # recursively search the tree for "key"A
-        return self.__recursive_search(self.root, key)
+        Returns:
+            BalancedTree: The joined tree
 
-    def __recursive_search(self, node, key_to_search) -> tuple[Node, int, int] | tuple[Node, None, int]:
+        Raises:
+            ValueError: If both trees are the same tree, differ in their order or modes or their keys overlap
         """
-        Searches the balanced tree from a node for a given key recursively.
 
-        Args:
-            node (Node): The Node that should be searched recursively
-            key_to_search (int): Key to search for
+        if left is right:
+            raise ValueError("A tree can't be joined with itself.")
+        if left.k != right.k or left.__modes() != right.__modes():
+            raise ValueError("Only trees with the same order and modes can be joined.")
+
+        if left.__threadSafe:
+            left.__treeLatch.acquireWrite()
+            right.__treeLatch.acquireWrite()
+        try:
+            tree = left.__empty_like()
+            left_height, right_height = cls.__height(left.root), cls.__height(right.root)
+
+            if right.root.keys and left.root.keys:
+                # the biggest key of left and the smallest key of right are found on the outer borders
+                biggest, smallest = left.root, right.root
+                while biggest.children:
+                    biggest = biggest.children[-1]
+                while smallest.children:
+                    smallest = smallest.children[0]
+                if biggest.keys[-1] >= smallest.keys[0]:
+                    raise ValueError("The keys of both trees overlap.")
+
+                if tree.__tracer is not None:
+                    tree.__tracer.record(JOIN_TREES, smallest.keys[0])
+
+                rest, rest_height, (key, value) = right.__cut(smallest.keys[0], right_height, False, inclusive=True)
+                tree.root, _ = tree.__join(left.root, left_height, key, value, rest, rest_height)
+                tree.root.setParent(None)
+                right.__fresh.clear()
+                tree.__fresh.clear()
+            elif right.root.keys:
+                tree.root = right.root
+            elif left.root.keys:
+                tree.root = left.root
+            tree.__rebuild_filter()
+
+            left.__clear()
+            right.__clear()
+        finally:
+            if left.__threadSafe:
+                right.__treeLatch.releaseWrite()
+                left.__treeLatch.releaseWrite()
+
+        return tree
+
+    def __modes(self) -> tuple:
+        """
+        Returns the modes of the tree, that determine its nodes and how they are changed.
 
         Returns:
-            Tuple[Node,int]: Either (Node, int): key was found and the node it was found in
-                            or (Node, None): key was not found, should be inserted in node
+            tuple: Compact, copy-on-write, thread-safe, counted, the aggregate and top-down
+        """
+
+        return (self.__compact, self.__copyOnWrite, self.__threadSafe, self.__counted, self.__aggregate,
+                self.__topDown)
 
+    def __empty_like(self) -> BalancedTree:
         """
-        # logging
-        logger.info(f"SEARCH FOR KEY {key_to_search} in node: {node}")
+        Creates an empty tree with the order, the modes and the tracer of this tree.
 
-        # send the current node to the GUI, to visualize searching
-        if not config.DEBUG:
-            config.mainWindow.addNoteToPath(node)
+        Returns:
+            BalancedTree: The new tree
+        """
 
-        self.__searchCount += 1
+        return BalancedTree(self.k, self.__tracer, self.__compact, copyOnWrite=self.__copyOnWrite,
+                            threadSafe=self.__threadSafe, counted=self.__counted, aggregate=self.__aggregate,
+                            topDown=self.__topDown, bloomFilter=self.__filterRate)
 
-        if node.hasKey(key_to_search):
-            # key was found
-            # the key is returned, data could also be returned
-            logger.info(f"KEY {key_to_search} WAS FOUND IN NODE: {node}")
-            return node, key_to_search, self.__searchCount
-        else:
-            # determine next child node to search recursively
-            child_node = node.getSubtree(key_to_search)
-            if child_node is None:
-                # key could not be found, should be inserted at node
-                logger.info(f"KEY COULD NOT BE FOUND, SHOULD BE INSERTED IN NODE: {node}")
-                return node, None, self.__searchCount
-            else:
-                return self.__recursive_search(child_node, key_to_search)
+    def __clear(self) -> None:
+        """
+        Replaces the root with an empty leaf and the Bloom filter with an empty filter. A logged tree writes an empty
+        checkpoint.
 
-    def insert(self, insert_key) -> None:
+        Returns:
+            None: Nothing
         """
-        Inserts a new key into the binary tree
+
+        self.root = self.__nodeType(self.k)
+        if self.__filter is not None:
+            self.__filter = BloomFilter(0, self.__filterRate)
+        if self.__wal is not None:
+            self.__wal.checkpoint(self.k, ())
+
+    @staticmethod
+    def __height(root) -> int:
+        """
+        Calculates the height of a tree by descending its left border.
 
         Args:
-            insert_key (int): Key to be inserted
+            root (Node): Root of the tree
 
         Returns:
-            None
+            int: The height, 0 if the root is a leaf
+        """
+
+        height = 0
+        node = root
+        while node.children:
+            node = node.children[0]
+            height += 1
+
+        return height
 
+    def __cut(self, key, height, smaller, inclusive=False) -> Tuple[Node | None, int, Tuple[int, object] | None]:
         """
+        Cuts the tree along the search path of a key and returns the part on one side of the path as a tree of its own.
+        The nodes of the tree are not changed, the parts of the nodes on the path are copied into new fragments.
 
-        # find the node to insert the new key
-        target_node, found_key, _ = self.search(insert_key)
-        if found_key is not None:
-            # key was found in tree
-            raise ValueError(f"{found_key} is already in the tree.")
-        else:
-            # insert "key" into tree in node "target_node" recursively
-            self.__recursive_insert(target_node, insert_key)
+        The part bigger than the key is returned without its smallest key, which is returned separately. This saves
+        deleting it again, when the part is joined with the part smaller than the other end of the range.
+
+        Args:
+            key (int): The key to cut at, it is part of neither side unless inclusive is True
+            height (int): Height of the tree, 0 if the root is a leaf
+            smaller (bool): Whether to return the keys smaller than key. Otherwise, the bigger keys are returned
+            inclusive (bool): Whether the returned part contains key itself, if it is in the tree
 
-    def __recursive_insert(self, node, key, child=None) -> None:
+        Returns:
+            Tuple[Node | None, int, Tuple[int, object] | None]: The root of the part (None if it is empty) and its
+                                                                height (-1 if it is empty). For the bigger part the
+                                                                smallest key and its value, None if there is none
+        """
+
+        # the fragments left (or right) of the path from top to bottom, each with its height and the separator, that
+        # connects it to the part below
+        fragments = []
+        node = self.root
+        while True:
+            keys, values, children = node.keys, node.values, node.children
+            if smaller:
+                # keys[:i] and children[:i] are smaller than key (or equal, if inclusive), keys[i - 1] separates them
+                # from children[i]
+                i = bisect_right(keys, key) if inclusive else bisect_left(keys, key)
+                if i > 0 and children:
+                    fragments.append((self.__fragment(keys[:i - 1], values[:i - 1], children[:i]),
+                                      height if i > 1 else height - 1, keys[i - 1], values[i - 1]))
+            else:
+                # keys[i:] and children[i + 1:] are bigger than key (or equal, if inclusive), keys[i] separates them
+                # from children[i]
+                i = bisect_left(keys, key) if inclusive else bisect_right(keys, key)
+                if i < len(keys) and children:
+                    fragments.append((self.__fragment(keys[i + 1:], values[i + 1:], children[i + 1:]),
+                                      height if i < len(keys) - 1 else height - 1, keys[i], values[i]))
+
+            if not children:
+                break
+            node = children[i]
+            height -= 1
+
+        if smaller:
+            keys, values = keys[:i], values[:i]
+            tree, tree_height = (self.__fragment(keys, values, None), 0) if keys else (None, -1)
+            for fragment, fragment_height, separator, separator_value in reversed(fragments):
+                tree, tree_height = self.__join(fragment, fragment_height, separator, separator_value, tree,
+                                                tree_height)
+
+            return tree, tree_height, None
+
+        keys, values = keys[i:], values[i:]
+        smallest = (keys[0], values[0]) if keys else None
+        tree, tree_height = (self.__fragment(keys[1:], values[1:], None), 0) if len(keys) > 1 else (None, -1)
+        for fragment, fragment_height, separator, separator_value in reversed(fragments):
+            if smallest is None:
+                # everything below is empty, the separator is the smallest key
+                smallest = (separator, separator_value)
+                tree, tree_height = fragment, fragment_height
+            else:
+                tree, tree_height = self.__join(tree, tree_height, separator, separator_value, fragment,
+                                                fragment_height)
+
+        return tree, tree_height, smallest
+
+    def __fragment(self, keys, values, children) -> Node:
         """
-        Recursively inserts a key into a node. If the node is full, split the node into 2 and insert the middle key into
-        the parent. If the parent is full and the root, create a new root.
+        Creates the root of a fragment cut from a node. A fragment with a single child and no keys is the child itself.
 
         Args:
-            node (Node): Node where the key should be inserted
-            key (int): key that should be inserted
-            child (Node): Reference to a child node, whose reference should be inserted after "key".
-                    ATTENTION ! This should only be used for inserting references into non leaf nodes
+            keys (list[int]): The keys of the fragment
+            values (list): The values of the keys
+            children (list[Node] | None): The children of the fragment, None for a leaf
 
         Returns:
-            None
+            Node: The root of the fragment
+        """
+
+        if children is not None and len(children) == 1:
+            return children[0]
+
+        node = self.__nodeType(self.k, keys=keys, children=children, values=values)
+        for child in node.children:
+            child.setParent(node)
+        if self.__copyOnWrite:
+            self.__fresh.add(node)
 
+        return node
+
+    def __join(self, left, left_height, key, value, right, right_height) -> Tuple[Node, int]:
         """
-        logger.info(f"INSERT KEY {key} WITH CHILD {child} INTO NODE {node}")
+        Joins two trees and a key between them into one tree. Every key of left must be smaller and every key of right
+        bigger than key. The roots of both trees may have less than k keys, all other nodes must be valid.
 
-        # insert key and child into node at correct position.
-        node.addKeyAndChild(key, child)
+        If both trees have the same height, they become the children of a new root with the key, or are merged into
+        one root, if their keys fit into one node. Otherwise, the lower tree becomes the last (or first) child of the
+        node on the right (or left) border of the higher tree, whose children have the height of the lower tree. The
+        key is the separator before it. If the root of the lower tree has less than k keys, it is merged with its
+        sibling or gets keys from it. Nodes on the border, that overflow, are split like on insert.
 
-        if node.isOverflow():
-            # split node into two nodes and middle key
-            new_left_node, middle_key, new_right_node = node.split()
+        Args:
+            left (Node | None): Root of the tree with the smaller keys, None if it is empty
+            left_height (int): Height of left, 0 for a leaf and -1 for an empty tree
+            key (int): The key between the trees
+            value: The value of the key
+            right (Node | None): Root of the tree with the bigger keys, None if it is empty
+            right_height (int): Height of right, 0 for a leaf and -1 for an empty tree
 
-            # logging
-            logger.info(f"OVERFLOW, SPLIT NODE INTO LEFT NODE:{new_left_node}, MIDDLE_KEY:{middle_key}"
-                        f" AND RIGHT NODE:{new_right_node}")
+        Returns:
+            Tuple[Node, int]: The root and the height of the joined tree
+        """
 
-            # check if node is the root
-            if node.getParent() is None:
-                # node is the root
-                # make new root with the middle_key and the left and right node as children
-                new_root = Node(self.k, keys=[middle_key], children=[new_left_node, new_right_node], parent=None)
-                # set new root as parent
-                new_left_node.setParent(new_root)
-                new_right_node.setParent(new_root)
-                # set new root as tree root
-                self.root = new_root
+        if left_height == right_height:
+            if left is None:
+                return self.__fragment([key], [value], None), 0
 
-                # logging
-                logger.info(f"MAKE NEW ROOT {new_root} WITH LEFT AND RIGHT NODE AS CHILDREN")
+            root = self.__fragment([key], [value], [self.__own(left), self.__own(right)])
+            left, right = root.children
+            if len(left.keys) + len(right.keys) < 2 * self.k:
+                merged_node = self.__merge_nodes(root, left, right, 0)
+                merged_node.setParent(None)
+                return merged_node, left_height
+            elif left.isUnderflow() or right.isUnderflow():
+                self.__redistribute(root, 0)
+
+            return root, left_height + 1
+
+        # descend the border of the higher tree to the node, whose children have the height of the lower tree
+        to_right = left_height > right_height
+        tree, tree_height = (left, left_height) if to_right else (right, right_height)
+        tree = self.__own(tree)
+        border = [tree]
+        for _ in range(abs(left_height - right_height) - 1):
+            node = border[-1]
+            border.append(self.__own_child(node, len(node.children) - 1 if to_right else 0))
+
+        node = border[-1]
+        lower = right if to_right else left
+        if to_right:
+            node.insert_key(-1, key, value)
+            if lower is not None:
+                node.insert_child(-1, lower)
+        else:
+            node.insert_key(0, key, value)
+            if lower is not None:
+                node.insert_child(0, lower)
+
+        if self.__aggregate is not None:
+            for border_node in reversed(border):
+                border_node.recount()
+        elif self.__counted:
+            # the nodes on the border gain the key and the lower tree, filling the lower tree only moves keys below
+            added = 1 if lower is None else 1 + lower.count
+            for border_node in border:
+                border_node.count += added
+
+        if lower is not None:
+            lower.setParent(node)
+            if lower.isUnderflow():
+                # the sibling of the lower tree is a complete node of the higher tree
+                index = len(node.keys) - 1 if to_right else 0
+                sibling_left = self.__own_child(node, index)
+                sibling_right = self.__own_child(node, index + 1)
+                if len(sibling_left.keys) + len(sibling_right.keys) < 2 * self.k:
+                    merged_node = self.__merge_nodes(node, sibling_left, sibling_right, index)
+                    if self.__tracer is not None:
+                        self.__tracer.record(MERGE, key, len(merged_node.keys))
+                    for observer in self.__observers:
+                        observer.onMerge(merged_node, key)
+                else:
+                    self.__redistribute(node, index)
+
+        # split the overflowing nodes on the border upwards
+        while border and border[-1].isOverflow():
+            node = border.pop()
+            new_left_node, middle_key, new_right_node, middle_value = node.split_with_value()
+            if self.__copyOnWrite:
+                self.__fresh.add(new_right_node)
+            if self.__tracer is not None:
+                self.__tracer.record(SPLIT, middle_key, len(new_left_node.keys), len(new_right_node.keys))
+            for observer in self.__observers:
+                observer.onSplit(new_left_node, middle_key, new_right_node)
+
+            if border:
+                parent = border[-1]
+                index = len(parent.keys) if to_right else 0
+                parent.insert_key(index, middle_key, middle_value)
+                parent.insert_child(index + 1, new_right_node)
+                new_right_node.setParent(parent)
             else:
-                # recursively insert middle_key into the parent node of the "node"
-                # also add reference to the new_right_node after the middle_key in the parent node
-                parent_node = new_left_node.getParent()
-                self.__recursive_insert(parent_node, middle_key, child=new_right_node)
+                tree = self.__fragment([middle_key], [middle_value], [new_left_node, new_right_node])
+                tree_height += 1
 
-    def delete(self, key) -> None:
+        return tree, tree_height
+
+    def __own(self, node) -> Node:
         """
-        Delete a key from the balanced tree. This is an implementation of the following description
-        (https://www.cs.rhodes.edu/~kirlinp/courses/db/f16/handouts/btrees-deletion.pdf):
+        Returns a node, which is about to be changed, but isn't reachable through a parent, that was copied already.
+        In copy-on-write mode, a copy is returned, unless the node was created by the current change.
 
-        Deletion has two base cases:
+        Args:
+            node (Node): The node
 
-        Deletion from a leaf node
-            1. Search for the value to delete.
-            2. If the value is in a leaf node, simply delete it from the node.
-            3. If underflow happens, rebalance the tree as described in section "Rebalancing after deletion" below.
+        Returns:
+            Node: The node, which may be changed
+        """
 
-        Deletion from an internal node
-            1. Choose a new separator (the largest element in the left subtree), remove it from the leaf node it is in,
-            and replace the element to be deleted with the new separator.
-            2. The previous step deleted an element (the new separator) from a leaf node. If that leaf node is now
-            deficient (has fewer than the required number of nodes), then rebalance the tree starting from the leaf
-            node.
+        if self.__copyOnWrite and node not in self.__fresh:
+            node = node.copy()
+            self.__fresh.add(node)
 
+        return node
+
+    @staticmethod
+    def __redistribute(parent, index) -> None:
+        """
+        Distributes the keys of two neighbouring children and their separator evenly between both children. Unlike a
+        rotation, this moves as many keys as needed, so a child with far less than k keys is filled at once. Both
+        children together must have at least 2k keys.
 
         Args:
-            key(int): key to delete from balanced tree
+            parent (Node): Parent of both children
+            index (int): Index of the separator, the children are at index and index + 1
 
         Returns:
             None: Nothing
-
         """
 
-        # find the node to delete the key
-        target_node, found_key, _ = self.search(key)
-        if found_key is not None:
+        left_node, right_node = parent.children[index], parent.children[index + 1]
+        keys = list(left_node.keys) + [parent.keys[index]] + list(right_node.keys)
+        values = left_node.values + [parent.values[index]] + right_node.values
+        children = list(left_node.children) + list(right_node.children)
 
-            # check if target_node is leaf node
-            if target_node.isLeaf():
-                # logging
-                logger.info(f"DELETE KEY FROM LEAF NODE: {target_node}")
+        middle = len(keys) // 2
+        left_node.keys, left_node.values = left_node.newKeys(keys[:middle]), values[:middle]
+        right_node.keys, right_node.values = right_node.newKeys(keys[middle + 1:]), values[middle + 1:]
+        parent.replace_key_at(index, keys[middle], values[middle])
 
-                # delete from leaf and rebalance the tree, if an underflow occurred
-                target_node.deleteKey(found_key)
+        if children:
+            left_node.children, right_node.children = children[:middle + 1], children[middle + 1:]
+            for child in left_node.children:
+                child.setParent(left_node)
+            for child in right_node.children:
+                child.setParent(right_node)
 
-                # only rebalance the node in an underflow, if it is not a leaf and the root at the same time
-                if target_node.isUnderflow() and not (target_node.isLeaf() and target_node.isRoot()):
-                    # logging
-                    logger.info(f"LEAF NODE UNDERFLOW: {target_node}")
+        if isinstance(left_node, CountedNode):
+            left_node.recount()
+            right_node.recount()
 
-                    self.__recursive_rebalance(target_node)
-            else:
-                # target_node is an internal node
-
-                # get inorder predecessor and check if node has keys to spare
-                replacement_node, replacement_key = self.__get_in_order_predecessor(target_node, key)
-                if not replacement_node.more_than_minimal_elements():
-                    # use in order successor instead
-                    replacement_node, replacement_key = self.__get_in_order_successor(target_node, key)
-
-                    # logging
-                    logger.info(
-                        f"REPLACE KEY {key} WITH IN ORDER SUCCESSOR {replacement_key} FROM NODE {replacement_node}"
-                    )
-                else:
-                    # logging
-                    logger.info(
-                        f"REPLACE KEY {key} WITH IN ORDER PREDECESSOR {replacement_key} FROM NODE {replacement_node}"
-                    )
+    def __resume_search(self, path, bounds, key_to_search) -> bool:
+        """
+        Searches a key like __search_path, but reuses the path of the previous search of a smaller key. Entries are
+        removed from the end of the path, until the subtree of the last node can contain the key. The search
+        continues from that node. Since the keys are searched in ascending order, only the upper bound of a subtree
+        has to be checked.
+
+        Args:
+            path (list[Tuple[Node, int]]): The path of the previous search, which is updated in place. An empty path
+                                            starts the search from the root.
+            bounds (list[int | None]): For every entry of the path the exclusive upper bound of the keys in the subtree
+                                        of the node or None if there is none. Updated in place as well.
+            key_to_search (int): Key to search for, must be greater than the previously searched key
+
+        Returns:
+            bool: Whether the key was found. If not, the last node of the path is the leaf the key belongs into.
 
-                # replace element that should be deleted with the predecessor_key
-                target_node.replace_key(key, replacement_key)
+        """
 
-                # delete key from replacement node
-                replacement_node.deleteKey(replacement_key)
+        while path and bounds[-1] is not None and key_to_search >= bounds[-1]:
+            path.pop()
+            bounds.pop()
 
-                # recursively fix predecessor node if it had an underflow
-                if replacement_node.isUnderflow():
-                    self.__recursive_rebalance(replacement_node)
+        if path:
+            # search again from the deepest node, which can contain the key
+            node, _ = path.pop()
+            upper_bound = bounds.pop()
         else:
-            # key wasn't found in tree
-            raise ValueError(f"{key} is not in the tree.")
+            node, upper_bound = self.root, None
+
+        while True:
+            found, index = node.searchKey(key_to_search)
+            path.append((node, index))
+            bounds.append(upper_bound)
+
+            if found:
+                return True
+            elif node.isLeaf():
+                return False
 
-    def __recursive_rebalance(self, deficient_node) -> None:
+            # the key of the node after the child is the upper bound of the child´s subtree
+            if index < len(node.keys):
+                upper_bound = node.keys[index]
+            node = node.getChildren()[index]
+
+    def __rebalance_along_path(self, path) -> None:
         """
-        Recursively rebalance the tree upwards from the given node to maintain the balanced tree properties.
+        Rebalance the tree upwards from the last node of the path to maintain the balanced tree properties.
 
         The following description is from:
         (https://www.cs.rhodes.edu/~kirlinp/courses/db/f16/handouts/btrees-deletion.pdf):
@@ -263,60 +2408,90 @@ class BalancedTree:
         • Otherwise, if the parent has fewer than the required number of elements, then rebalance the parent
 
         Args:
-            deficient_node(Node): The node, that has less than k keys and should be rebalanced.
+            path (list[Tuple[Node, int]]): Path from the root to the deficient node. The path is consumed.
 
         Returns:
             None: Nothing
 
         """
 
-        logger.info(f"NODE {deficient_node} IS DEFICIENT, START REBALANCING")
-
-        # check if either left or right sibling exist and have more than k elements
-        # if so, rotate left/right, and else merge the deficient node with either the left or right sibling
-        right_sibling, seperator_key_index_right = deficient_node.get_right_sibling()
-        left_sibling, seperator_key_index_left = deficient_node.get_left_sibling()
-        parent = deficient_node.getParent()
+        while True:
+            deficient_node, _ = path.pop()
+
+            # the position of the deficient node in its parent is known from the path, so the siblings and the
+            # separators between them are found without searching the children of the parent
+            parent, own_index = path[-1]
+            siblings = parent.getChildren()
+            seperator_key_index_right = own_index
+            seperator_key_index_left = own_index - 1
+            right_sibling = siblings[own_index + 1] if own_index + 1 < len(siblings) else None
+            left_sibling = siblings[own_index - 1] if own_index > 0 else None
+            if self.__threadSafe:
+                # the siblings are only reachable through the parent, whose latch is held
+                for sibling in (right_sibling, left_sibling):
+                    if sibling is not None:
+                        self.__latch_for_write(sibling)
+
+            # check if either left or right sibling exist and have more than k elements
+            # if so, rotate left/right, and else merge the deficient node with either the left or right sibling
+
+            if right_sibling is not None and right_sibling.more_than_minimal_elements():
+                # rotate left
+                seperator_key, new_seperator_key = parent.keys[seperator_key_index_right], right_sibling.keys[0]
+                right_sibling = self.__own_child(parent, own_index + 1)
+                self.__rotate_left(parent, deficient_node, right_sibling, seperator_key_index_right)
+
+                if self.__tracer is not None:
+                    self.__tracer.record(ROTATE_LEFT, seperator_key, new_seperator_key)
+                for observer in self.__observers:
+                    observer.onRotate(deficient_node, right_sibling, seperator_key, new_seperator_key)
+                return
+            elif left_sibling is not None and left_sibling.more_than_minimal_elements():
+                # rotate right
+                seperator_key, new_seperator_key = parent.keys[seperator_key_index_left], left_sibling.keys[-1]
+                left_sibling = self.__own_child(parent, own_index - 1)
+                self.__rotate_right(parent, deficient_node, left_sibling, seperator_key_index_left)
+
+                if self.__tracer is not None:
+                    self.__tracer.record(ROTATE_RIGHT, seperator_key, new_seperator_key)
+                for observer in self.__observers:
+                    observer.onRotate(deficient_node, left_sibling, seperator_key, new_seperator_key)
+                return
 
-        if right_sibling is not None and right_sibling.more_than_minimal_elements():
-            # rotate left
-            logger.info(f"ROTATE LEFT: DEF{deficient_node},PARENT{parent},RIGHT SIBLING{right_sibling}")
-            self.__rotate_left(deficient_node, right_sibling, seperator_key_index_right)
-            logger.info(f"AFTER ROTATION: DEF{deficient_node},PARENT{parent},RIGHT SIBLING{right_sibling}")
-        elif left_sibling is not None and left_sibling.more_than_minimal_elements():
-            # rotate right
-            logger.info(f"ROTATE RIGHT: LEFT SIBLING{left_sibling},PARENT{parent},DEF{deficient_node}")
-            self.__rotate_right(deficient_node, left_sibling, seperator_key_index_left)
-            logger.info(f"AFTER ROTATION: LEFT SIBLING{left_sibling},PARENT{parent},DEF{deficient_node}")
-        else:
             # if right sibling exist, merge with right sibling, else merge with left sibling
-
             if right_sibling is not None:
                 # merge deficient node with right sibling
-                logger.info(
-                    f"MERGE DEFICIENT NODE WITH RIGHT SIBLING: DEF{deficient_node}, RIGHT SIBLING{right_sibling}")
-                merged_node = self.__merge_nodes(deficient_node, right_sibling, seperator_key_index_right)
-                logger.info(f"MERGED NODE: {merged_node}")
+                seperator_key = parent.keys[seperator_key_index_right]
+                merged_node = self.__merge_nodes(parent, deficient_node, right_sibling, seperator_key_index_right)
             else:
                 # merge deficient node with left sibling
-                logger.info(f"MERGE DEFICIENT NODE WITH LEFT SIBLING: LEFT SIBLING{left_sibling}, DEF{deficient_node}")
-                merged_node = self.__merge_nodes(left_sibling, deficient_node, seperator_key_index_left)
-                logger.info(f"MERGED NODE: {merged_node}")
+                seperator_key = parent.keys[seperator_key_index_left]
+                left_sibling = self.__own_child(parent, own_index - 1)
+                merged_node = self.__merge_nodes(parent, left_sibling, deficient_node, seperator_key_index_left)
+
+            if self.__tracer is not None:
+                self.__tracer.record(MERGE, seperator_key, len(merged_node.keys))
+            for observer in self.__observers:
+                observer.onMerge(merged_node, seperator_key)
 
             # parent has now one element less than before.
             # if parent is the root and now has no elements, make the merged node the new root
-            if parent.isRoot() and parent.getKeys() == []:
+            parent_is_root = len(path) == 1
+            if parent_is_root and not parent.getKeys():
                 self.root = merged_node
                 merged_node.setParent(None)
 
-                # logging
-                logger.info(f"PARENT NODE IS ROOT AND EMPTY, NEW ROOT: {merged_node}")
-            elif parent.isUnderflow():
-                # if parent had an underflow, recursively rebalance the parent if it is not the root
-                if not parent.isRoot():
-                    self.__recursive_rebalance(parent)
+                if self.__tracer is not None:
+                    self.__tracer.record(SHRINK, len(merged_node.keys))
+                return
+            elif not parent.isUnderflow() or parent_is_root:
+                # the parent is balanced or the root, which may have less than k elements
+                return
+
+            # the parent had an underflow, rebalance it in the next iteration. It is the last entry of the path now.
 
-    def __merge_nodes(self, left_node, right_node, separator_index) -> Node:
+    @staticmethod
+    def __merge_nodes(parent, left_node, right_node, separator_index) -> Node:
         """
         Merge two nodes that have the minimum number of elements, lie next to each other and have the same
         parent into one node.
@@ -338,7 +2513,11 @@ class BalancedTree:
             of elements, and the right node – empty)
         3. Remove the separator from the parent along with its empty right child (the parent loses an element)
 
+        The left node is reused as the merged node, so only the right node is removed from the parent. Its position is
+        known from separator_index, the parent is not searched.
+
         Args:
+            parent (Node): Parent of both nodes
             left_node (Node): Node on the left
             right_node (Node): Node on the right
             separator_index (int): Index of key in parent, that logically separates left_node and right_node
@@ -348,38 +2527,36 @@ class BalancedTree:
 
         """
 
-        # add seperator key in parent to the left node
-        parent = left_node.getParent()
-        seperator = parent.getKeys()[separator_index]
-        left_node.addKeyAndChild(seperator)
+        # move seperator key and its value from the parent to the end of the left node
+        seperator, seperator_value = parent.popItem(separator_index)
+        left_node.insert_key(-1, seperator, seperator_value)
 
-        # create new node from the left and right nodes keys/children
-        keys = left_node.getKeys()
-        keys.extend(right_node.getKeys())
-        children = left_node.getChildren()
-        children.extend(right_node.getChildren())
-        merged_node = Node(self.k, keys=keys, children=children, parent=parent)
+        # move the keys/values/children of the right node to the left node
+        left_node.getKeys().extend(right_node.getKeys())
+        left_node.getValues().extend(right_node.getValues())
+        for child in right_node.getChildren():
+            # reset parent of the moved children to the merged node
+            child.setParent(left_node)
+            left_node.insert_child(-1, child)
 
-        # reset parent of new nodes children to the merged_node
-        for child in children:
-            child.setParent(merged_node)
+        # remove the right node, which is the child after the seperator
+        parent.popChild(separator_index + 1)
 
-        # remove seperator from parent
-        parent.deleteKey(seperator)
-        # remove child after seperator in parent and replace reference to child before seperator with new node
-        parent.deleteChild(right_node)
-        parent.setChild(merged_node, separator_index)
+        if isinstance(left_node, CountedNode):
+            # the parent keeps its count, the keys only moved within its subtree
+            left_node.recount()
 
-        return merged_node
+        return left_node
 
     @staticmethod
-    def __rotate_left(deficient_node, right_sibling, seperator_index) -> None:
+    def __rotate_left(parent, deficient_node, right_sibling, seperator_index) -> None:
         """
         Rotate an element from right_sibling to parent and from parent to deficient_node, so that deficient node has
         k elements. When deficient_node and right_sibling are internal nodes, also transfer the first child of
         right_sibling to the deficient_node.
 
         Args:
+            parent (Node): Parent of both nodes
             deficient_node (Node): The Node that receives a key during the rotation
             right_sibling (Node): The node that gives a key, must have more than k elements and is on the right of
                                     deficient_node
@@ -390,11 +2567,9 @@ class BalancedTree:
 
         """
 
-        parent = deficient_node.getParent()
-
         # insert seperator at the end of deficient node
         seperator_key = parent.getKeys()[seperator_index]
-        deficient_node.insert_key(-1, seperator_key)
+        deficient_node.insert_key(-1, seperator_key, parent.getValues()[seperator_index])
 
         # insert first child of right_sibling at the end of deficient node if nodes are internal nodes
         if not right_sibling.isLeaf():
@@ -405,17 +2580,22 @@ class BalancedTree:
 
         # Replace the separator in the parent with the first element of the right sibling
         # and delete first key from right sibling
-        first_key_right_sibling = right_sibling.popKey(0)
-        parent.replace_key(seperator_key, first_key_right_sibling)
+        first_key_right_sibling, first_value_right_sibling = right_sibling.popItem(0)
+        parent.replace_key_at(seperator_index, first_key_right_sibling, first_value_right_sibling)
+
+        if isinstance(deficient_node, CountedNode):
+            deficient_node.recount()
+            right_sibling.recount()
 
     @staticmethod
-    def __rotate_right(deficient_node, left_sibling, seperator_index) -> None:
+    def __rotate_right(parent, deficient_node, left_sibling, seperator_index) -> None:
         """
         Rotate an element from left_sibling to parent and from parent to deficient_node, so that deficient node has
         k elements. When deficient_node and right_sibling are internal nodes, also transfer the last child of
         left_sibling to the deficient_node.
 
         Args:
+            parent (Node): Parent of both nodes
             deficient_node (Node): The Node that receives a key during the rotation
             left_sibling (Node): The node that gives a key, must have more than k elements and is on the left of
                                     deficient_node
@@ -426,11 +2606,9 @@ class BalancedTree:
 
         """
 
-        parent = deficient_node.getParent()
-
         # insert seperator at the start of deficient node
         seperator_key = parent.getKeys()[seperator_index]
-        deficient_node.insert_key(0, seperator_key)
+        deficient_node.insert_key(0, seperator_key, parent.getValues()[seperator_index])
 
         # insert last child of left_sibling at the start of deficient node if nodes are internal nodes
         if not left_sibling.isLeaf():
@@ -443,27 +2621,30 @@ class BalancedTree:
 
         # Replace the separator in the parent with the last element of the left sibling
         # and delete last element from left sibling
-        last_key_left_sibling = left_sibling.popKey(-1)
-        parent.replace_key(seperator_key, last_key_left_sibling)
+        last_key_left_sibling, last_value_left_sibling = left_sibling.popItem(-1)
+        parent.replace_key_at(seperator_index, last_key_left_sibling, last_value_left_sibling)
+
+        if isinstance(deficient_node, CountedNode):
+            deficient_node.recount()
+            left_sibling.recount()
 
     @staticmethod
-    def __get_in_order_predecessor(node, key) -> Tuple[Node, int]:
+    def __get_in_order_predecessor(path) -> Tuple[Node, int]:
         """
         Get the largest key in the subtree of the child that is on the left of the key in the node.
         Return the largest key and the node it is in.
 
         Args:
-            node (Node): The node where "key" is in
-            key (int): The key, whose in order predecessor should be found.
+            path (list[Tuple[Node, int]]): Path from the root to the node and the index of the key, whose in order
+                                            predecessor should be found. The path to the predecessor is appended.
 
         Returns:
             Tuple[Node, int]: The largest key and the node it is in.
 
         """
 
-        if not node.hasKey(key):
-            raise ValueError(f"Node does not contain {key}")
-        elif node.isLeaf():
+        node, key_index = path[-1]
+        if node.isLeaf():
             raise ValueError("Node is a leaf and does not have a in order predecessor")
         else:
             # get reference to child on the left of "key" --> index equal to key as seen below
@@ -473,37 +2654,36 @@ class BalancedTree:
             #                                     ^
             # current key(7)--> left child of key |
 
-            left_child = node.getChildren()[node.getKeys().index(key)]
+            traversing_node = node.getChildren()[key_index]
 
-            traversing_node = left_child
-
-            # traverse the tree with the first reference of the node until a leaf is reached
+            # traverse the tree with the last reference of the node until a leaf is reached
             while not traversing_node.isLeaf():
+                path.append((traversing_node, len(traversing_node.getChildren()) - 1))
                 traversing_node = traversing_node.getChildren()[-1]
 
-            largest_key = traversing_node.getKeys()[-1]
+            largest_key_index = len(traversing_node.getKeys()) - 1
+            path.append((traversing_node, largest_key_index))
 
             # return the biggest key in the leaf node
-            return traversing_node, largest_key
+            return traversing_node, traversing_node.getKeys()[largest_key_index]
 
     @staticmethod
-    def __get_in_order_successor(node, key) -> Tuple[Node, int]:
+    def __get_in_order_successor(path) -> Tuple[Node, int]:
         """
         Get the smallest key in the subtree of the right child of the given node and key. Return the key and the node
         it is in.
 
         Args:
-            node (Node): The node where "key" is in
-            key (int): The key, whose in order successor should be found.
+            path (list[Tuple[Node, int]]): Path from the root to the node and the index of the key, whose in order
+                                            successor should be found. The path to the successor is appended.
 
         Returns:
-            Tuple[Node, int]: The largest key and the node it is in.
+            Tuple[Node, int]: The smallest key and the node it is in.
 
         """
 
-        if not node.hasKey(key):
-            raise ValueError(f"Node does not contain {key}")
-        elif node.isLeaf():
+        node, key_index = path[-1]
+        if node.isLeaf():
             raise ValueError("Node is a leaf and does not have a in order successor")
         else:
             # get reference to child on the right of "key" --> index equal to index of key + 1 as seen below:
@@ -513,18 +2693,19 @@ class BalancedTree:
             #                                         ^
             #                      current key (7)    | right child of key
 
-            right_child = node.getChildren()[node.getKeys().index(key) + 1]
-
-            traversing_node = right_child
+            # the search continues in the right child, the path entry of the node has to reflect that
+            path[-1] = (node, key_index + 1)
+            traversing_node = node.getChildren()[key_index + 1]
 
             # traverse the tree with the first children of a node until a leaf is reached --> first is smallest element
             while not traversing_node.isLeaf():
+                path.append((traversing_node, 0))
                 traversing_node = traversing_node.getChildren()[0]
 
-            smallest_key = traversing_node.getKeys()[0]
+            path.append((traversing_node, 0))
 
             # return the smallest key in the leaf node
-            return traversing_node, smallest_key
+            return traversing_node, traversing_node.getKeys()[0]
 
     def isEmpty(self) -> bool:
         """
@@ -536,30 +2717,356 @@ class BalancedTree:
 
         return self.root.isLeaf() and len(self.root.keys) == 0
 
-    def getAllValues(self) -> set[int]:
+    def getAllValues(self) -> list[int]:
+        """
+        Returns all values kept in the tree in ascending order. Every node is visited once, so this is linear in the
+        number of keys.
+
+        Returns:
+            list[int]: A list of integers representing the values of the tree.
+        """
+
+        return list(self)
+
+    def rank(self, key) -> int:
+        """
+        Returns the number of keys smaller than a key, which is the index of the key in the ascending keys of the tree.
+        The key doesn't need to be in the tree. On every level, the counts of the children left of the search path are
+        summed up, so this visits O(log n) nodes.
+
+        Args:
+            key (int): The key
+
+        Returns:
+            int: The number of keys smaller than key
+
+        Raises:
+            ValueError: If the tree doesn't count its keys
+        """
+
+        return self.__count_below(key, False)
+
+    def select(self, index) -> int:
+        """
+        Returns the key at an index of the ascending keys of the tree, the inverse of rank. Negative indexes count from
+        the biggest key like for lists. The search descends into the child, whose count contains the index, so this
+        visits O(log n) nodes.
+
+        Args:
+            index (int): Index of the key
+
+        Returns:
+            int: The key
+
+        Raises:
+            ValueError: If the tree doesn't count its keys
+            IndexError: If the index is out of range
+        """
+
+        if not self.__counted:
+            raise ValueError("Order statistics are only available for counted trees.")
+
+        node = self.root
+        if index < 0:
+            index += node.count
+        if not 0 <= index < node.count:
+            raise IndexError(f"{index} is out of range for a tree with {node.count} keys.")
+
+        while node.children:
+            for i, child in enumerate(node.children):
+                if index < child.count:
+                    node = child
+                    break
+                elif index == child.count:
+                    # the key after the child
+                    return node.keys[i]
+                index -= child.count + 1
+
+        return node.keys[index]
+
+    def count_range(self, lo=None, hi=None) -> int:
+        """
+        Returns the number of keys between lo and hi (both inclusive) as the difference of two ranks, see rank. Unlike
+        counting the keys of range, this visits O(log n) nodes, no matter how many keys are in the range.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+
+        Returns:
+            int: The number of keys in the range
+
+        Raises:
+            ValueError: If the tree doesn't count its keys
+        """
+
+        if not self.__counted:
+            raise ValueError("Order statistics are only available for counted trees.")
+
+        if lo is not None and hi is not None and lo > hi:
+            return 0
+
+        above = self.root.count if hi is None else self.__count_below(hi, True)
+        below = 0 if lo is None else self.__count_below(lo, False)
+        return above - below
+
+    def aggregate(self, lo=None, hi=None):
+        """
+        Returns the summary of the aggregate of the tree over the keys between lo and hi (both inclusive) in ascending
+        order, see Aggregate. The subtrees, that lie completely inside of the range, contribute their stored summary, so
+        only the nodes on the paths to lo and hi are visited, which are O(log n) nodes.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+
+        Returns:
+            The summary of the range, the identity of the aggregate for an empty range
+
+        Raises:
+            ValueError: If the tree doesn't keep an aggregate
+        """
+
+        if self.__aggregate is None:
+            raise ValueError("Aggregates are only available for trees with an aggregate.")
+
+        if lo is not None and hi is not None and lo > hi:
+            return self.__aggregate.identity
+
+        return self.__aggregate_subtree(self.root, lo, hi)
+
+    def __aggregate_subtree(self, node, lo, hi):
+        """
+        Combines the summaries of the keys of a subtree between lo and hi (both inclusive), see aggregate. Once the
+        paths to lo and hi separate, each path continues with one bound only.
+
+        Args:
+            node (AggregateNode): Root of the subtree
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+
+        Returns:
+            The summary of the keys of the subtree in the range
+        """
+
+        aggregate = self.__aggregate
+        while lo is not None or hi is not None:
+            keys, values, children = node.keys, node.values, node.children
+
+            # keys[start:end] are in the range, children[start] and children[end] may be partially
+            start = 0 if lo is None else bisect_left(keys, lo)
+            end = len(keys) if hi is None else bisect_right(keys, hi)
+            if children and start == end:
+                # the whole range is inside of one child
+                node = children[start]
+                continue
+
+            combine = aggregate.combine
+            if children:
+                summary = self.__aggregate_subtree(children[start], lo, None)
+            else:
+                summary = aggregate.identity
+            for i in range(start, end):
+                summary = combine(summary, aggregate.single(keys[i], values[i]))
+                if children and i + 1 < end:
+                    summary = combine(summary, children[i + 1].summary)
+            if children:
+                summary = combine(summary, self.__aggregate_subtree(children[end], None, hi))
+
+            return summary
+
+        return node.summary
+
+    def __count_below(self, key, inclusive) -> int:
+        """
+        Counts the keys smaller than a key, see rank.
+
+        Args:
+            key (int): The key
+            inclusive (bool): Whether the key itself is counted, if it is in the tree
+
+        Returns:
+            int: The number of keys smaller than (or equal to) key
+
+        Raises:
+            ValueError: If the tree doesn't count its keys
+        """
+
+        if not self.__counted:
+            raise ValueError("Order statistics are only available for counted trees.")
+
+        count = 0
+        node = self.root
+        while True:
+            keys = node.keys
+            index = bisect_right(keys, key) if inclusive else bisect_left(keys, key)
+            count += index
+            if not node.children:
+                return count
+
+            children = node.children
+            for i in range(index):
+                count += children[i].count
+            node = children[index]
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Iterates over the keys of the tree in ascending order. The keys are streamed, so this doesn't build a list
+        of all keys. The tree must not be modified during the iteration.
+
+        Returns:
+            Iterator[int]: The keys in ascending order
+        """
+
+        return self.range()
+
+    def __reversed__(self) -> Iterator[int]:
+        """
+        Iterates over the keys of the tree in descending order.
+
+        Returns:
+            Iterator[int]: The keys in descending order
+        """
+
+        return self.range(reverse=True)
+
+    def range(self, lo=None, hi=None, reverse=False) -> Iterator[int]:
+        """
+        Iterates over the keys between lo and hi (both inclusive) in ascending or descending order. Only the path to
+        the first key and the keys of the range are visited, so the cost is O(log n + m) for m returned keys.
+        The tree must not be modified during the iteration.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+            reverse (bool): Whether to iterate in descending order
+
+        Returns:
+            Iterator[int]: The keys of the range
+        """
+
+        if reverse:
+            keys = self.__descending(lo, hi, False)
+        else:
+            keys = self.__ascending(lo, hi, False)
+
+        return self.__exclusively(keys) if self.__threadSafe else keys
+
+    def items(self, lo=None, hi=None, reverse=False) -> Iterator[Tuple[int, object]]:
+        """
+        Iterates over the keys between lo and hi (both inclusive) together with their values, see range.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+            reverse (bool): Whether to iterate in descending order
+
+        Returns:
+            Iterator[Tuple[int, object]]: The (key, value) pairs of the range
+        """
+
+        if reverse:
+            items = self.__descending(lo, hi, True)
+        else:
+            items = self.__ascending(lo, hi, True)
+
+        return self.__exclusively(items) if self.__threadSafe else items
+
+    def __ascending(self, lo, hi, with_values) -> Iterator:
+        """
+        Generator for range in ascending order. The stack contains the nodes from the root to the current node,
+        each together with the index of the next key that is yielded from it. Before a key is yielded, the subtree
+        on its left was completely yielded.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+            with_values (bool): Whether to yield (key, value) pairs instead of keys
+
+        Returns:
+            Iterator: The keys or (key, value) pairs of the range
+        """
+
+        stack = []
+
+        # descend to the first key that is not smaller than lo
+        node = self.root
+        while True:
+            found, index = node.searchKey(lo) if lo is not None else (False, 0)
+            stack.append((node, index))
+
+            if found or node.isLeaf():
+                break
+            node = node.children[index]
+
+        while stack:
+            node, index = stack.pop()
+            if index < len(node.keys):
+                key = node.keys[index]
+                if hi is not None and key > hi:
+                    return
+
+                stack.append((node, index + 1))
+                yield (key, node.values[index]) if with_values else key
+
+                if not node.isLeaf():
+                    # the subtree on the right of the key is next, starting with its smallest key
+                    node = node.children[index + 1]
+                    while True:
+                        stack.append((node, 0))
+                        if node.isLeaf():
+                            break
+                        node = node.children[0]
+
+    def __descending(self, lo, hi, with_values) -> Iterator:
         """
-        Returns all values kept in the tree.
+        Generator for range in descending order. Like __ascending, but the index in the stack is the index of the
+        key after the next key that is yielded, which is also the index of the subtree on its right.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+            with_values (bool): Whether to yield (key, value) pairs instead of keys
 
         Returns:
-            set[int]: A set of integers representing the values of the tree.
+            Iterator: The keys or (key, value) pairs of the range
         """
 
-        values = []
-        nodes = [self.root]
+        stack = []
+
+        # descend to the last key that is not greater than hi
+        node = self.root
+        while True:
+            if hi is None:
+                found, index = False, len(node.keys)
+            else:
+                found, index = node.searchKey(hi)
+                if found:
+                    index += 1
+            stack.append((node, index))
 
-        # As long as there are nodes in the list
-        while nodes:
-            for node in nodes:
-                # Remove this node from the list
-                nodes.remove(node)
+            if found or node.isLeaf():
+                break
+            node = node.children[index]
 
-                # Add all children of the node to list
-                nodes.extend(node.children)
+        while stack:
+            node, index = stack.pop()
+            if index > 0:
+                key = node.keys[index - 1]
+                if lo is not None and key < lo:
+                    return
 
-                # Add the keys of the node to the value list
-                values.extend(node.keys)
+                stack.append((node, index - 1))
+                yield (key, node.values[index - 1]) if with_values else key
 
-        return set(values)
+                if not node.isLeaf():
+                    # the subtree on the left of the key is next, starting with its biggest key
+                    node = node.children[index - 1]
+                    while True:
+                        stack.append((node, len(node.keys)))
+                        if node.isLeaf():
+                            break
+                        node = node.children[-1]
 
     def __str__(self) -> str:
         """
@@ -0,0 +1,39 @@
+class BatchReport:
+    """
+    This class reports the outcome of a batch operation of the balanced tree (insert_many or delete_many). Instead of
+    raising an exception for the first key that can't be processed, the batch continues and every key ends up in one of
+    the two lists.
+
+    Attributes:
+        applied (list[int]): The keys that were inserted/deleted, in ascending order
+        rejected (list[tuple[int, str]]): The keys that were not processed, together with the reason
+    """
+
+    def __init__(self):
+        self.applied: list[int] = []
+        self.rejected: list[tuple[int, str]] = []
+
+    def reject(self, key, reason) -> None:
+        """
+        Adds a key to the rejected keys.
+
+        Args:
+            key (int): The rejected key
+            reason (str): Why the key was rejected
+
+        Returns:
+            None: Nothing
+        """
+
+        self.rejected.append((key, reason))
+
+    def __str__(self) -> str:
+        """
+        Override the stringify method of BatchReport.
+
+        Returns:
+            str: Number of applied and rejected keys
+
+        """
+
+        return f"{len(self.applied)} applied, {len(self.rejected)} rejected"
@@ -0,0 +1,154 @@
+"""
+This file contains the Bloom filter, that a balanced tree can keep in front of its nodes, see BalancedTree. The filter
+answers whether a key may be in the tree without visiting a node: If one of the bits of the key is not set, the key is
+definitely absent. If all of its bits are set, the key is in the tree or it is a false positive, so the tree has to be
+searched.
+
+A Bloom filter can't remove keys, since the bits of a deleted key may be shared with other keys. Deleted keys stay in
+the filter until it is rebuilt from the keys of the tree, they only make the filter answer "maybe" more often.
+"""
+from __future__ import annotations
+
+import math
+import sys
+
+# Number of keys the smallest filter is sized for
+MIN_CAPACITY = 1024
+
+# The built-in hash of an integer is the integer itself. Hashing the key in a tuple with this salt mixes it (xxHash),
+# which spreads consecutive keys over the whole array at a fraction of the cost of mixing it in Python
+_SALT = 0x5BD1E995
+_MASK = (1 << 64) - 1
+
+
+class BloomFilter:
+    """
+    This class is a Bloom filter of the keys of a balanced tree. Every key sets hashCount bits of a bit array, whose
+    positions are derived from a single 64 bit hash of the key (double hashing). The array is sized for capacity keys
+    at the given false-positive rate, adding more keys raises the rate.
+
+    The filter counts the added keys and the deleted keys, that are still in the filter, so the tree knows when to
+    rebuild it, see needsRebuild.
+
+    Args:
+        capacity (int): Number of keys the filter is sized for
+        falsePositiveRate (float): Desired share of absent keys, that the filter can't rule out, between 0 and 1
+    """
+
+    def __init__(self, capacity, falsePositiveRate):
+        self.capacity = max(capacity, MIN_CAPACITY)
+        self.falsePositiveRate = falsePositiveRate
+
+        # optimal number of bits and hashes for the capacity and the rate, rounded to whole bytes
+        bits = -self.capacity * math.log(falsePositiveRate) / math.log(2) ** 2
+        self.bitCount = max(8, math.ceil(bits / 8) * 8)
+        self.hashCount = max(1, round(self.bitCount / self.capacity * math.log(2)))
+        self.__bits = bytearray(self.bitCount // 8)
+        self.__setBits = 0
+
+        # added keys and deleted keys, that are still in the filter
+        self.count = 0
+        self.stale = 0
+
+    @classmethod
+    def fromKeys(cls, keys, keyCount, falsePositiveRate) -> BloomFilter:
+        """
+        Creates a filter of the given keys, which is sized for twice their number, so the tree can grow before the
+        filter has to be rebuilt.
+
+        Args:
+            keys (Iterable[int]): The keys
+            keyCount (int): Number of keys
+            falsePositiveRate (float): Desired false-positive rate between 0 and 1
+
+        Returns:
+            BloomFilter: The new filter
+        """
+
+        bloom_filter = cls(2 * keyCount, falsePositiveRate)
+        for key in keys:
+            bloom_filter.add(key)
+
+        return bloom_filter
+
+    def add(self, key) -> None:
+        """
+        Sets the bits of a key. A key, whose bits are all set already, isn't counted, since it doesn't fill the filter
+        any further. This is the case for keys added before, e.g. by replacing the value of a key.
+
+        Args:
+            key (int): The key
+
+        Returns:
+            None: Nothing
+        """
+
+        h = hash((key, _SALT)) & _MASK
+        step = (h >> 32) | 1
+        bits, bit_count = self.__bits, self.bitCount
+        set_bits = self.__setBits
+        for _ in range(self.hashCount):
+            position = h % bit_count
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                self.__setBits += 1
+            h += step
+
+        if self.__setBits != set_bits:
+            self.count += 1
+
+    def __contains__(self, key) -> bool:
+        """
+        Checks whether a key may be in the filter. The check stops at the first bit, that isn't set, so most absent
+        keys only cost one or two bits.
+
+        Args:
+            key (int): The key
+
+        Returns:
+            bool: False if the key is definitely not in the filter, True if it may be
+        """
+
+        h = hash((key, _SALT)) & _MASK
+        step = (h >> 32) | 1
+        bits, bit_count = self.__bits, self.bitCount
+        for _ in range(self.hashCount):
+            position = h % bit_count
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+            h += step
+
+        return True
+
+    def needsRebuild(self) -> bool:
+        """
+        Checks whether the filter should be rebuilt. This is the case once more keys were added than it is sized for,
+        which raises the false-positive rate, or once half of its capacity are deleted keys.
+
+        Returns:
+            bool: Whether the filter should be rebuilt
+        """
+
+        return self.count > self.capacity or 2 * self.stale > self.capacity
+
+    def estimatedRate(self) -> float:
+        """
+        Estimates the current false-positive rate from the share of set bits. An absent key is a false positive, if all
+        of its bits are set.
+
+        Returns:
+            float: The estimated rate between 0 and 1
+        """
+
+        return (self.__setBits / self.bitCount) ** self.hashCount
+
+    def memorySize(self) -> int:
+        """
+        Returns the memory used by the bit array of the filter.
+
+        Returns:
+            int: The size in bytes
+        """
+
+        return sys.getsizeof(self.__bits)
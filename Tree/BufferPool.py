@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+
+from .PageFile import Page, PageFile
+
+LRU = "lru"
+CLOCK = "clock"
+
+
+class BufferPool:
+    """
+    This class caches the pages of a page file in memory. At most "capacity" pages are kept, if another page is needed,
+    an unpinned page is evicted. A changed (dirty) page is written back to the file before it is evicted.
+
+    Two eviction policies are available:
+        LRU evicts the page that wasn't used for the longest time.
+        CLOCK gives every page a reference bit, which is set when the page is used. The pages are scanned in a circle,
+        a page with the bit set gets a second chance and only has its bit cleared. The first page without the bit is
+        evicted. This approximates LRU without reordering the pages on every hit.
+
+    A page is pinned as long as it is in use and is never evicted while pinned. If every page is pinned, the pool
+    temporarily grows beyond its capacity.
+
+    The counters reads, hits and writes count the pages read from the file, the requests served from memory and the
+    pages written to the file.
+
+    Args:
+        pageFile (PageFile): The file of the pages
+        capacity (int): Maximal number of unpinned pages kept in memory
+        policy (str): Eviction policy, "lru" or "clock"
+
+    Raises:
+        ValueError: If the capacity is less than 1 or the policy is unknown
+    """
+
+    def __init__(self, pageFile, capacity=64, policy=LRU):
+        if capacity < 1:
+            raise ValueError(f"The capacity must be at least 1, not {capacity}")
+        if policy not in (LRU, CLOCK):
+            raise ValueError(f"Unknown eviction policy {policy}")
+
+        self.pageFile: PageFile = pageFile
+        self.capacity = capacity
+        self.policy = policy
+
+        # for LRU the least recently used page is the first, for CLOCK the first page is below the hand of the clock
+        self.__frames: OrderedDict[int, Page] = OrderedDict()
+
+        self.reads = 0
+        self.hits = 0
+        self.writes = 0
+
+    def fetch(self, pageId) -> Page:
+        """
+        Returns a page and pins it. The page has to be unpinned afterwards.
+
+        Args:
+            pageId (int): Number of the page
+
+        Returns:
+            Page: The page
+        """
+
+        page = self.__frames.get(pageId)
+        if page is None:
+            self.reads += 1
+            page = self.pageFile.read(pageId)
+            self.__admit(page)
+        else:
+            self.hits += 1
+            if self.policy == LRU:
+                self.__frames.move_to_end(pageId)
+            else:
+                page.referenced = True
+
+        page.pins += 1
+        return page
+
+    def new(self, keys=None, children=None) -> Page:
+        """
+        Creates a new, pinned page. It is dirty, so it is written to the file at the latest when it is evicted.
+
+        Args:
+            keys (list[int] | None): Keys of the node
+            children (list[int] | None): Page numbers of the children, empty for a leaf
+
+        Returns:
+            Page: The new page
+        """
+
+        page = Page(self.pageFile.allocate(), keys, children)
+        page.dirty = True
+        self.__admit(page)
+
+        page.pins += 1
+        return page
+
+    def unpin(self, page) -> None:
+        """
+        Releases a page fetched with fetch or new. Once no one uses it anymore, it may be evicted.
+
+        Args:
+            page (Page): The page
+
+        Returns:
+            None: Nothing
+        """
+
+        page.pins -= 1
+        if page.pins == 0 and len(self.__frames) > self.capacity:
+            self.__evict()
+
+    def free(self, page) -> None:
+        """
+        Removes a page from the pool and returns it to the free list of the file. Its content is discarded.
+
+        Args:
+            page (Page): The page
+
+        Returns:
+            None: Nothing
+        """
+
+        self.__frames.pop(page.pageId, None)
+        page.pins = 0
+        page.dirty = False
+        self.pageFile.free(page.pageId)
+
+    def flush(self) -> None:
+        """
+        Writes every dirty page to the file and forces the file to the disk. The pages stay in the pool.
+
+        Returns:
+            None: Nothing
+        """
+
+        for page in self.__frames.values():
+            self.__writeBack(page)
+
+        self.pageFile.sync()
+
+    def resetStats(self) -> None:
+        """
+        Sets the counters for reads, hits and writes to 0.
+
+        Returns:
+            None: Nothing
+        """
+
+        self.reads = 0
+        self.hits = 0
+        self.writes = 0
+
+    def hitRatio(self) -> float:
+        """
+        Returns the share of requests that were served from memory.
+
+        Returns:
+            float: The hit ratio between 0 and 1, 0 if there were no requests
+        """
+
+        requests = self.reads + self.hits
+        return self.hits / requests if requests else 0.0
+
+    def __len__(self) -> int:
+        return len(self.__frames)
+
+    def __admit(self, page) -> None:
+        """
+        Adds a page to the pool and evicts pages, if the capacity is exceeded.
+
+        Args:
+            page (Page): The page
+
+        Returns:
+            None: Nothing
+        """
+
+        while len(self.__frames) >= self.capacity:
+            if not self.__evict():
+                break
+
+        self.__frames[page.pageId] = page
+
+    def __evict(self) -> bool:
+        """
+        Evicts one unpinned page according to the policy.
+
+        Returns:
+            bool: Whether a page was evicted. False if every page is pinned
+        """
+
+        if self.policy == LRU:
+            for page in self.__frames.values():
+                if not page.pins:
+                    break
+            else:
+                return False
+        else:
+            # two rounds clear every reference bit, after that only pinned pages are skipped
+            for _ in range(2 * len(self.__frames)):
+                page_id, page = self.__frames.popitem(last=False)
+                self.__frames[page_id] = page
+                if page.pins:
+                    continue
+                if page.referenced:
+                    page.referenced = False
+                    continue
+                break
+            else:
+                return False
+
+        self.__writeBack(page)
+        del self.__frames[page.pageId]
+        return True
+
+    def __writeBack(self, page) -> None:
+        """
+        Writes a page to the file, if it was changed.
+
+        Args:
+            page (Page): The page
+
+        Returns:
+            None: Nothing
+        """
+
+        if page.dirty:
+            self.pageFile.write(page)
+            self.writes += 1
+            page.dirty = False
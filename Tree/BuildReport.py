@@ -0,0 +1,65 @@
+class BuildReport:
+    """
+    This class reports the cost of a parallel bulk build of the balanced tree, see ParallelBuild. The subtrees are built
+    in other processes, so every key is pickled to the worker and every built node is pickled back. The report keeps
+    that transfer apart from the actual building, which shows how much of the parallel build is spent on moving data.
+
+    Attributes:
+        workers (int): Number of worker processes
+        partitions (int): Number of key ranges, whose subtrees were built by the workers
+        keys (int): Number of keys of the tree
+        workerLevels (int): Number of levels built by the workers, the levels above were built by the caller
+        sentBytes (int): Size of the pickled key ranges sent to the workers
+        receivedBytes (int): Size of the pickled subtrees sent back by the workers
+        encodeSeconds (float): Time spent pickling the key ranges and the subtrees, summed over all processes
+        decodeSeconds (float): Time spent unpickling the key ranges and the subtrees, summed over all processes
+        buildSeconds (float): Time spent building the subtrees, summed over all workers
+        totalSeconds (float): Wall time of the whole build
+    """
+
+    def __init__(self, workers, partitions, keys):
+        self.workers = workers
+        self.partitions = partitions
+        self.keys = keys
+        self.workerLevels = 0
+
+        self.sentBytes = 0
+        self.receivedBytes = 0
+        self.encodeSeconds = 0.0
+        self.decodeSeconds = 0.0
+        self.buildSeconds = 0.0
+        self.totalSeconds = 0.0
+
+    def transferSeconds(self) -> float:
+        """
+        Returns the time spent passing data between the processes.
+
+        Returns:
+            float: The time spent pickling and unpickling, summed over all processes
+        """
+
+        return self.encodeSeconds + self.decodeSeconds
+
+    def transferShare(self) -> float:
+        """
+        Returns the share of the work of all processes that was spent passing data instead of building.
+
+        Returns:
+            float: The share between 0 and 1, 0 if nothing was measured
+        """
+
+        work = self.transferSeconds() + self.buildSeconds
+        return self.transferSeconds() / work if work else 0.0
+
+    def __str__(self) -> str:
+        """
+        Override the stringify method of BuildReport.
+
+        Returns:
+            str: The measured costs
+        """
+
+        return (f"{self.keys} keys in {self.partitions} partitions on {self.workers} workers: "
+                f"{self.totalSeconds:.3f}s total, {self.buildSeconds:.3f}s building, "
+                f"{self.transferSeconds():.3f}s transfer ({self.transferShare():.0%}), "
+                f"{self.sentBytes / 2 ** 20:.1f} MiB sent, {self.receivedBytes / 2 ** 20:.1f} MiB received")
@@ -0,0 +1,238 @@
+"""
+This file contains the bottom-up construction of a balanced tree from many keys at once. Instead of inserting every key
+from the root, the sorted keys are cut into the leaves and the separators between them become the keys of the level
+above. This is repeated until one node is left, which is the root. Every key is touched once per level it is moved
+to, so the whole tree is built in linear time.
+"""
+from __future__ import annotations
+
+from math import ceil
+from operator import itemgetter
+
+from .Node import Node
+
+
+def sortedKeys(values) -> list[int]:
+    """
+    Returns the given keys as a sorted list. Already sorted input is detected in linear time and is not sorted again.
+
+    Args:
+        values (Iterable[int]): The keys
+
+    Returns:
+        list[int]: The sorted keys
+
+    Raises:
+        ValueError: If a key occurs more than once
+    """
+
+    keys = list(values)
+    if any(keys[i] >= keys[i + 1] for i in range(len(keys) - 1)):
+        keys.sort()
+
+        for i in range(len(keys) - 1):
+            if keys[i] == keys[i + 1]:
+                raise ValueError(f"{keys[i]} is already in the tree.")
+
+    return keys
+
+
+def sortedItems(items) -> tuple[list[int], list]:
+    """
+    Returns the keys and values of the given (key, value) pairs as two lists sorted by the keys, see sortedKeys.
+
+    Args:
+        items (Iterable[tuple[int, object]]): The (key, value) pairs
+
+    Returns:
+        tuple[list[int], list]: The sorted keys and their values
+
+    Raises:
+        ValueError: If a key occurs more than once
+    """
+
+    items = list(items)
+    if any(items[i][0] >= items[i + 1][0] for i in range(len(items) - 1)):
+        items.sort(key=itemgetter(0))
+
+        for i in range(len(items) - 1):
+            if items[i][0] == items[i + 1][0]:
+                raise ValueError(f"{items[i][0]} is already in the tree.")
+
+    return [key for key, _ in items], [value for _, value in items]
+
+
+def nodesOnLevel(key_count, k, capacity) -> int:
+    """
+    Calculates, into how many nodes a level of key_count keys is cut. The nodes of the level keep key_count - (n - 1)
+    keys, the remaining n - 1 keys are the separators, which are moved to the level above. The nodes are filled with
+    about "capacity" keys, as long as every node keeps between k and 2k keys.
+
+    Args:
+        key_count (int): The number of keys of the level, including the separators
+        k (int): Order of the balanced tree
+        capacity (int): The desired number of keys of one node, between k and 2k
+
+    Returns:
+        int: The number of nodes of the level. If this is 1, the node is the root
+    """
+
+    if key_count <= 2 * k:
+        return 1
+
+    # n nodes hold n * capacity keys and need n - 1 separators
+    nodes = ceil((key_count + 1) / (capacity + 1))
+
+    # every node needs at least k and at most 2k keys
+    nodes = min(nodes, (key_count + 1) // (k + 1))
+    return max(nodes, ceil((key_count + 1) / (2 * k + 1)))
+
+
+def buildTree(k, values, fillFactor=1.0, nodeType=Node) -> Node:
+    """
+    Builds a balanced tree bottom-up from the given keys and returns its root.
+
+    Args:
+        k (int): Order of the balanced tree
+        values (Iterable[int]): The keys of the tree, they are sorted if they aren't already
+        fillFactor (float): Desired fill factor of the nodes between 0 and 1. 1 fills every node with 2k keys, which
+                            gives the lowest tree. Nodes never hold less than k keys, so every factor below 0.5 is
+                            equal to 0.5.
+        nodeType (type[Node]): Class of the built nodes, Node or a subclass of it
+
+    Returns:
+        Node: The root of the built tree
+
+    Raises:
+        ValueError: If the fill factor is not in (0, 1] or a key occurs more than once
+    """
+
+    return buildLevels(k, sortedKeys(values), None, fillFactor, nodeType)
+
+
+def buildTreeFromItems(k, items, fillFactor=1.0, nodeType=Node) -> Node:
+    """
+    Builds a balanced tree bottom-up from (key, value) pairs and returns its root, see buildTree.
+
+    Args:
+        k (int): Order of the balanced tree
+        items (Iterable[tuple[int, object]]): The keys of the tree and their values
+        fillFactor (float): Desired fill factor of the nodes between 0 and 1
+        nodeType (type[Node]): Class of the built nodes, Node or a subclass of it
+
+    Returns:
+        Node: The root of the built tree
+
+    Raises:
+        ValueError: If the fill factor is not in (0, 1] or a key occurs more than once
+    """
+
+    keys, values = sortedItems(items)
+    return buildLevels(k, keys, values, fillFactor, nodeType)
+
+
+def buildLevels(k, keys, values, fillFactor, nodeType=Node, children=None) -> Node:
+    """
+    Builds the levels of a balanced tree from sorted keys, starting with the leaves.
+
+    Args:
+        k (int): Order of the balanced tree
+        keys (list[int]): The sorted keys of the tree without duplicates
+        values (list | None): The values of the keys, every value is None if this is None
+        fillFactor (float): Desired fill factor of the nodes between 0 and 1
+        nodeType (type[Node]): Class of the built nodes, Node or a subclass of it
+        children (list[Node] | None): The already built nodes below the keys, one more than keys. The keys are the
+                                      separators between them. None builds the tree from the leaves
+
+    Returns:
+        Node: The root of the built tree
+
+    Raises:
+        ValueError: If the fill factor is not in (0, 1]
+    """
+
+    capacity = levelCapacity(k, fillFactor)
+
+    if values is None:
+        values = [None] * len(keys)
+
+    while True:
+        node_count = nodesOnLevel(len(keys), k, capacity)
+        if node_count == 1:
+            root = nodeType(k, keys=keys, children=children, values=values)
+            for child in root.children:
+                child.setParent(root)
+
+            return root
+
+        children, keys, values = buildLevel(k, keys, values, children, node_count, nodeType)
+
+
+def levelCapacity(k, fillFactor) -> int:
+    """
+    Converts a fill factor into the desired number of keys of one node.
+
+    Args:
+        k (int): Order of the balanced tree
+        fillFactor (float): Desired fill factor of the nodes between 0 and 1
+
+    Returns:
+        int: The desired number of keys of one node, between k and 2k
+
+    Raises:
+        ValueError: If the fill factor is not in (0, 1]
+    """
+
+    if not 0 < fillFactor <= 1:
+        raise ValueError(f"The fill factor must be between 0 and 1, not {fillFactor}")
+
+    return min(2 * k, max(k, round(2 * k * fillFactor)))
+
+
+def buildLevel(k, keys, values, children, node_count, nodeType=Node) -> tuple[list[Node], list[int], list]:
+    """
+    Cuts the keys of one level into node_count nodes. The keys between the nodes are the separators, which are moved to
+    the level above.
+
+    Args:
+        k (int): Order of the balanced tree
+        keys (list[int]): The sorted keys of the level, including the separators
+        values (list): The values of the keys
+        children (list[Node] | None): The nodes of the level below, one more than keys. None for the leaves
+        node_count (int): The number of nodes, see nodesOnLevel
+        nodeType (type[Node]): Class of the built nodes, Node or a subclass of it
+
+    Returns:
+        tuple[list[Node], list[int], list]: The nodes of the level, the separators and their values
+    """
+
+    # distribute the keys evenly, the first "extra" nodes get one key more than the others
+    per_node, extra = divmod(len(keys) - (node_count - 1), node_count)
+
+    nodes = []
+    separators = []
+    separator_values = []
+    position = 0
+    for i in range(node_count):
+        size = per_node + (1 if i < extra else 0)
+
+        node_children = None
+        if children is not None:
+            # every previous node has one child more than keys, which together with the separators between them
+            # is the position of the first key of this node
+            node_children = children[position:position + size + 1]
+
+        node = nodeType(k, keys=keys[position:position + size], children=node_children,
+                        values=values[position:position + size])
+        for child in node.children:
+            child.setParent(node)
+        nodes.append(node)
+
+        position += size
+        if i < node_count - 1:
+            # the key after the node separates it from the next node
+            separators.append(keys[position])
+            separator_values.append(values[position])
+            position += 1
+
+    return nodes, separators, separator_values
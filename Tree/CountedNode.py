@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from .CompactNode import CompactNode
+from .Node import Node
+
+
+class CountedNode(Node):
+    """
+    This class is a node of a balanced tree, that keeps the number of keys in its subtree, see BalancedTree. The count
+    of a new node is computed from its keys and children. Changes of the keys or children of an existing node don't
+    update the count, the tree keeps it up to date along the paths it changes. Only split_with_value, which changes two
+    nodes at once, counts the keys of both nodes again.
+
+    Args:
+        k (int): Order of the balanced tree, minimal number of keys in one node
+        keys (list[int]): Keys of the node
+        children (list[Node]): Children of the node, for n keys are n+1 children
+        parent (Node | None): Parent of the node, if Parent is None, the node is the root
+        values (list | None): Values of the keys, every value is None if this is None
+    """
+
+    __slots__ = ("count",)
+
+    def __init__(self, k, keys=None, children=None, parent=None, values=None):
+        super().__init__(k, keys=keys, children=children, parent=parent, values=values)
+        self.recount()
+
+    def recount(self) -> None:
+        """
+        Sets the count from the keys of the node and the counts of its children, which must be correct.
+
+        Returns:
+            None: Nothing
+        """
+
+        count = len(self.keys)
+        for child in self.children:
+            count += child.count
+        self.count = count
+
+    def copy(self, parent=None) -> CountedNode:
+        """
+        Creates a shallow copy of the node including its count, see Node.copy.
+
+        Args:
+            parent (Node | None): Parent of the copy
+
+        Returns:
+            CountedNode: The copy
+        """
+
+        node = super().copy(parent)
+        node.count = self.count
+        return node
+
+    def split_with_value(self):
+        """
+        Splits the node like Node.split_with_value and counts the keys of both nodes again.
+
+        Returns:
+            Tuple(Node,int,Node,object): (left_node, middle_key, right_node, middle_value)
+        """
+
+        left_node, middle_key, right_node, middle_value = super().split_with_value()
+        left_node.recount()
+        return left_node, middle_key, right_node, middle_value
+
+
+class CountedCompactNode(CountedNode, CompactNode):
+    """
+    This class is a counted node, that stores its keys in a typed array like CompactNode.
+    """
+
+    __slots__ = ()
@@ -0,0 +1,58 @@
+class FilterReport:
+    """
+    This class reports the state of the Bloom filter of a balanced tree, see BloomFilter. Besides the size of the
+    filter, it counts the lookups of absent keys: Those, that the filter ruled out without visiting a node, and those,
+    that passed the filter and were searched in vain. The latter are the false positives, including deleted keys, that
+    are still in the filter.
+
+    Attributes:
+        capacity (int): Number of keys the filter is sized for
+        keys (int): Number of keys added since the last rebuild
+        staleKeys (int): Number of deleted keys, that are still in the filter
+        bits (int): Number of bits of the filter
+        hashes (int): Number of bits set per key
+        memoryBytes (int): Memory used by the bits of the filter
+        targetRate (float): The desired false-positive rate
+        estimatedRate (float): The false-positive rate estimated from the share of set bits
+        negatives (int): Lookups answered by the filter alone
+        falsePositives (int): Lookups of absent keys, that passed the filter
+        rebuilds (int): Number of times the filter was rebuilt from the keys of the tree
+    """
+
+    def __init__(self, capacity, keys, staleKeys, bits, hashes, memoryBytes, targetRate, estimatedRate):
+        self.capacity = capacity
+        self.keys = keys
+        self.staleKeys = staleKeys
+        self.bits = bits
+        self.hashes = hashes
+        self.memoryBytes = memoryBytes
+        self.targetRate = targetRate
+        self.estimatedRate = estimatedRate
+
+        self.negatives = 0
+        self.falsePositives = 0
+        self.rebuilds = 0
+
+    def observedRate(self) -> float:
+        """
+        Returns the measured false-positive rate, i.e. the share of the lookups of absent keys, that passed the filter.
+
+        Returns:
+            float: The rate between 0 and 1, 0 if no absent key was looked up
+        """
+
+        misses = self.negatives + self.falsePositives
+        return self.falsePositives / misses if misses else 0.0
+
+    def __str__(self) -> str:
+        """
+        Override the stringify method of FilterReport.
+
+        Returns:
+            str: The state of the filter
+        """
+
+        return (f"{self.keys} keys ({self.staleKeys} deleted) of {self.capacity}, {self.bits} bits, {self.hashes} "
+                f"hashes, {self.memoryBytes / 2 ** 10:.1f} KiB: false-positive rate {self.estimatedRate:.2%} "
+                f"estimated, {self.observedRate():.2%} observed (target {self.targetRate:.2%}), "
+                f"{self.negatives} lookups filtered, {self.rebuilds} rebuilds")
@@ -0,0 +1,70 @@
+import threading
+
+
+class RWLatch:
+    """
+    This class is a reader/writer latch. Any number of readers or a single writer may hold it at the same time.
+    Waiting writers are preferred: Once a writer waits, no further readers are admitted, so a steady stream of readers
+    can't starve the writers. The latch is not reentrant.
+    """
+
+    __slots__ = ("__condition", "__readers", "__writer", "__waitingWriters")
+
+    def __init__(self):
+        self.__condition = threading.Condition(threading.Lock())
+        self.__readers = 0
+        self.__writer = False
+        self.__waitingWriters = 0
+
+    def acquireRead(self) -> None:
+        """
+        Waits until no writer holds or waits for the latch and acquires it for reading.
+
+        Returns:
+            None: Nothing
+        """
+
+        with self.__condition:
+            while self.__writer or self.__waitingWriters:
+                self.__condition.wait()
+            self.__readers += 1
+
+    def releaseRead(self) -> None:
+        """
+        Releases the latch held for reading.
+
+        Returns:
+            None: Nothing
+        """
+
+        with self.__condition:
+            self.__readers -= 1
+            if not self.__readers:
+                self.__condition.notify_all()
+
+    def acquireWrite(self) -> None:
+        """
+        Waits until no one holds the latch and acquires it for writing.
+
+        Returns:
+            None: Nothing
+        """
+
+        with self.__condition:
+            self.__waitingWriters += 1
+            while self.__writer or self.__readers:
+                self.__condition.wait()
+            self.__waitingWriters -= 1
+            self.__writer = True
+
+    def releaseWrite(self) -> None:
+        """
+        Releases the latch held for writing.
+
+        Returns:
+            None: Nothing
+        """
+
+        with self.__condition:
+            self.__writer = False
+            self.__condition.notify_all()
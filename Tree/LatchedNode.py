@@ -0,0 +1,47 @@
+from .Latch import RWLatch
+from .Node import Node
+
+
+class LatchedNode(Node):
+    """
+    This class is a node of a thread-safe balanced tree. Every node has its own reader/writer latch, which an operation
+    acquires before it reads or changes the node, see BalancedTree.
+
+    Args:
+        k (int): Order of the balanced tree, minimal number of keys in one node
+        keys (list[int]): Keys of the node
+        children (list[Node]): Children of the node, for n keys are n+1 children
+        parent (Node | None): Parent of the node, if Parent is None, the node is the root
+        values (list | None): Values of the keys, every value is None if this is None
+    """
+
+    __slots__ = ("latch",)
+
+    def __init__(self, k, keys=None, children=None, parent=None, values=None):
+        super().__init__(k, keys=keys, children=children, parent=parent, values=values)
+        self.latch = RWLatch()
+
+    def __getstate__(self) -> tuple[None, dict]:
+        """
+        Returns the state of the node for pickle. The latch can't be pickled and is left out.
+
+        Returns:
+            tuple[None, dict]: The slots of the node without the latch
+        """
+
+        return None, {name: getattr(self, name) for name in Node.__slots__}
+
+    def __setstate__(self, state) -> None:
+        """
+        Restores a pickled node with a new, released latch.
+
+        Args:
+            state (tuple[None, dict]): The state returned by __getstate__
+
+        Returns:
+            None: Nothing
+        """
+
+        for name, value in state[1].items():
+            setattr(self, name, value)
+        self.latch = RWLatch()
@@ -0,0 +1,68 @@
+# this is needed, so that a method in the LeafNode class can return an Instance of type "LeafNode"
+from __future__ import annotations
+
+from .Node import Node
+
+
+class LeafNode(Node):
+    """
+    This class represents a leaf of a BPlusTree. Unlike the nodes of a BalancedTree, the leaves of a B+ tree hold all
+    records (keys and values) of the tree, and they are linked to their neighbours in both directions, so ordered
+    scans can move from leaf to leaf without going up the tree.
+
+    Args:
+        k (int): Order of the leaf, minimal number of records in the leaf, max is 2*k
+        keys (list[int]): Keys of the leaf
+        values (list | None): Values of the keys, every value is None if this is None
+        parent (Node | None): Parent of the leaf, if Parent is None, the leaf is the root
+    """
+
+    __slots__ = ("previous", "next")
+
+    def __init__(self, k, keys=None, values=None, parent=None):
+        super().__init__(k, keys=keys, parent=parent, values=values)
+        self.previous: LeafNode | None = None
+        self.next: LeafNode | None = None
+
+    def split_leaf(self) -> LeafNode:
+        """
+        Splits an overflowing leaf into two leaves. The leaf keeps the smaller half of its records, the bigger half is
+        moved into a new leaf, which is linked in on the right of this leaf. Unlike Node.split, no key is removed: The
+        first key of the new leaf is copied into the parent as the separator.
+
+        Returns:
+            LeafNode: The new right leaf
+        """
+
+        middle_index = len(self.keys) // 2
+        right_leaf = LeafNode(self.k, keys=self.keys[middle_index:], values=self.values[middle_index:],
+                              parent=self.parent)
+        del self.keys[middle_index:]
+        del self.values[middle_index:]
+
+        # link the new leaf between this leaf and its old successor
+        right_leaf.previous = self
+        right_leaf.next = self.next
+        if self.next is not None:
+            self.next.previous = right_leaf
+        self.next = right_leaf
+
+        return right_leaf
+
+    def absorb(self, right_leaf) -> None:
+        """
+        Moves all records of the leaf on the right into this leaf and unlinks the right leaf.
+
+        Args:
+            right_leaf (LeafNode): The successor of this leaf
+
+        Returns:
+            None: Nothing
+        """
+
+        self.keys.extend(right_leaf.keys)
+        self.values.extend(right_leaf.values)
+
+        self.next = right_leaf.next
+        if right_leaf.next is not None:
+            right_leaf.next.previous = self
@@ -1,36 +1,88 @@
 # this is needed, so that a method in the Node class can return an Instance of type "Node"
 from __future__ import annotations
 
+from bisect import bisect_left
+from heapq import merge
+from operator import itemgetter
 from typing import Tuple
 
+# Children of every leaf. Leaves share this empty container instead of owning an empty list each
+NO_CHILDREN = ()
+
 
 class Node:
     """
     This class represents one node in the BalancedTree class. A node has one parent, a minimal number of k and a maximal
-    number of 2k keys. If the node has n keys, it must have n+1 children.
+    number of 2k keys. If the node has n keys, it must have n+1 children. Every key has a value (payload) attached,
+    which is stored at the same index in node.values and moves together with the key.
 
     Args:
         k (int): Order of the balanced tree, minimal number of keys in one node
         keys (list[int]): Keys of the node
         children (list[Node]): Children of the node, for n keys are n+1 children
         parent (Node | None): Parent of the node, if Parent is None, the node is the root
+        values (list | None): Values of the keys, every value is None if this is None
     """
 
-    def __init__(self, k, keys=None, children=None, parent=None):
+    # Nodes don't have a __dict__, which saves memory for every node of a tree
+    __slots__ = ("k", "keys", "values", "children", "parent")
+
+    def __init__(self, k, keys=None, children=None, parent=None, values=None):
         self.k = k
         if keys is None:
-            self.keys = []  # min k max 2k entries
+            self.keys = self.newKeys(())  # min k max 2k entries
+        else:
+            self.keys = self.newKeys(keys)
+        if values is None:
+            self.values = [None] * len(self.keys)  # values[i] belongs to keys[i]
         else:
-            self.keys = keys
-        if children is None:
-            self.children = []  # max 2k + 1 children, references child nodes
+            self.values = values
+        if not children:
+            self.children = NO_CHILDREN  # leaf
         else:
-            self.children = children
+            self.children = children  # max 2k + 1 children, references child nodes
         if parent is None:
             self.parent = None
         else:
             self.parent = parent
 
+    @staticmethod
+    def newKeys(keys) -> list[int]:
+        """
+        Returns the container the node stores its keys in. Subclasses can override this to store the keys differently,
+        the container must behave like a list.
+
+        Args:
+            keys (Iterable[int]): The keys
+
+        Returns:
+            list[int]: The keys as list
+        """
+
+        return keys if type(keys) is list else list(keys)
+
+    def searchKey(self, key) -> Tuple[bool, int]:
+        """
+        Locates a key in the sorted keys of the node with a binary search. The returned index has two meanings:
+        If the key was found, it is the index of the key in node.keys. Otherwise, it is the index of the child whose
+        subtree must contain the key, which is also the position the key has to be inserted at in a leaf.
+
+            node.keys:               [1,   3,   7,   8]
+            node.children:         [R1,  R2,  R3,  R4,  R5]
+
+            searchKey(7) --> (True, 2)      searchKey(5) --> (False, 2), continue in R3
+
+        Args:
+            key (int): The key to locate
+
+        Returns:
+            Tuple[bool, int]: Whether the key was found and the index described above
+        """
+
+        keys = self.keys
+        index = bisect_left(keys, key)
+        return index < len(keys) and keys[index] == key, index
+
     def hasKey(self, key):
         """
         Checks if the node contains a key.
@@ -42,9 +94,9 @@ class Node:
             bool: True, if key is in node, else false
         """
 
-        return key in self.keys
+        return self.searchKey(key)[0]
 
-    def addKeyAndChild(self, insert_key, child=None) -> None:
+    def addKeyAndChild(self, insert_key, child=None, value=None) -> None:
         """
         Inserts a key sorted into a leaf node (child=None)
         or insert a key and a corresponding child in a non leaf node (child=Node).
@@ -53,24 +105,26 @@ class Node:
         Args:
             insert_key (int): Inserted key
             child (Node | None): Child, that should be inserted logically after insert_key
+            value: Value of the inserted key
 
         Returns:
             None: Nothing
         """
 
         # insert new key into keys array so that it stays sorted
-        key_insert_index = self.insert_key_sorted(insert_key)
+        key_insert_index = self.insert_key_sorted(insert_key, value)
         # insert new child into children array
         if child is not None:
             self.children.insert(key_insert_index + 1, child)
 
-    def insert_key(self, index, key) -> None:
+    def insert_key(self, index, key, value=None) -> None:
         """
-        Insert a key at a given index.
+        Insert a key and its value at a given index.
 
         Args:
             index (int): Index to be inserted
             key (int): Key that is inserted
+            value: Value of the key
 
         Returns:
             None: Nothing
@@ -78,8 +132,10 @@ class Node:
 
         if index >= 0:
             self.keys.insert(index, key)
+            self.values.insert(index, value)
         else:
             self.keys.append(key)
+            self.values.append(value)
 
     def insert_child(self, index, child) -> None:
         """
@@ -93,6 +149,10 @@ class Node:
             None: Nothing
         """
 
+        if not self.children:
+            # the node was a leaf, which shares the empty children container
+            self.children = []
+
         if index >= 0:
             self.children.insert(index, child)
         else:
@@ -109,7 +169,12 @@ class Node:
             None: Nothing
         """
 
-        self.keys.remove(key)
+        found, index = self.searchKey(key)
+        if not found:
+            raise ValueError(f"Node does not contain {key}")
+
+        del self.keys[index]
+        del self.values[index]
 
     def deleteChild(self, child) -> None:
         """
@@ -127,6 +192,7 @@ class Node:
 
     def popKey(self, index) -> int:
         """
+        Remove the key and its value at an index.
 
         Args:
             index:
@@ -135,7 +201,20 @@ class Node:
             int: key
 
         """
-        return self.keys.pop(index)
+        return self.popItem(index)[0]
+
+    def popItem(self, index) -> Tuple[int, object]:
+        """
+        Remove the key and its value at an index.
+
+        Args:
+            index (int): Index of the key
+
+        Returns:
+            Tuple[int, object]: The key and its value
+
+        """
+        return self.keys.pop(index), self.values.pop(index)
 
     def popChild(self, index):
         """
@@ -149,19 +228,77 @@ class Node:
         """
         return self.children.pop(index)
 
-    def replace_key(self, old_key, new_key) -> None:
+    def replace_key(self, old_key, new_key, new_value=None) -> None:
         """
+        Replace a key and its value.
 
         Args:
             old_key:
             new_key:
+            new_value: Value of the new key
 
         Returns:
             None
 
         """
 
-        self.keys = [new_key if key == old_key else key for key in self.keys]
+        found, index = self.searchKey(old_key)
+        if found:
+            self.replace_key_at(index, new_key, new_value)
+
+    def replace_key_at(self, index, new_key, new_value=None) -> None:
+        """
+        Replace the key and its value at an index. The new key must keep the keys sorted.
+
+        Args:
+            index (int): Index of the replaced key
+            new_key (int): The new key
+            new_value: Value of the new key
+
+        Returns:
+            None: Nothing
+
+        """
+
+        self.keys[index] = new_key
+        self.values[index] = new_value
+
+    def copy(self, parent=None) -> Node:
+        """
+        Creates a shallow copy of the node. The keys, values and children are copied into new containers, the children
+        themselves are shared with this node and are not changed.
+
+        Args:
+            parent (Node | None): Parent of the copy
+
+        Returns:
+            Node: The copy
+        """
+
+        # the containers are copied directly, the constructor would check and convert them again
+        node = object.__new__(type(self))
+        node.k = self.k
+        node.keys = self.keys[:]
+        node.values = self.values[:]
+        node.children = self.children[:] if self.children else NO_CHILDREN
+        node.parent = parent
+        return node
+
+    def newSibling(self, keys, children, values) -> Node:
+        """
+        Creates a node of the same type with the same parent, like the right node of a split. Subclasses, whose
+        constructor takes further arguments, override this.
+
+        Args:
+            keys (list[int]): Keys of the new node
+            children (list[Node]): Children of the new node
+            values (list): Values of the keys
+
+        Returns:
+            Node: The new node
+        """
+
+        return type(self)(self.k, keys=keys, children=children, parent=self.parent, values=values)
 
     def split(self):
         """
@@ -192,6 +329,19 @@ class Node:
             Tuple(Node,int,Node): Returns the middle element of the overfilled node, the right and left nodes:
                                  (left_node, middle_key, right_node)
 
+        """
+        if self.isOverflow():
+            left_node, middle_key, right_node, _ = self.split_with_value()
+            return left_node, middle_key, right_node
+
+    def split_with_value(self):
+        """
+        Splits a node like split, but additionally returns the value of the middle key. The values of all other keys
+        move together with their keys into the left and right node.
+
+        Returns:
+            Tuple(Node,int,Node,object): (left_node, middle_key, right_node, middle_value)
+
         """
         if self.isOverflow():
             keys = self.keys
@@ -204,24 +354,31 @@ class Node:
             keys_left_node = keys[:middle_index]
             keys_right_node = keys[middle_index + 1:]
 
-            # split children
+            # split values the same way
+            values = self.values
+            middle_value = values[middle_index]
+            values_left_node = values[:middle_index]
+            values_right_node = values[middle_index + 1:]
+
+            # split children, the left node keeps the children up to the one before the middle key. This also holds for
+            # an even number of keys, which a node of a top-down tree can have, see BalancedTree
             children = self.children
-            children_left_node = children[:int(len(children) // 2)]
-            children_right_node = children[int(len(children) / 2):]
+            children_left_node = children[:middle_index + 1]
+            children_right_node = children[middle_index + 1:]
 
             # update current node (left_node)
             self.keys = keys_left_node
+            self.values = values_left_node
             self.children = children_left_node
 
             # create new right node
-            new_right_node = Node(self.k, keys=keys_right_node, children=children_right_node,
-                                  parent=self.parent)
+            new_right_node = self.newSibling(keys_right_node, children_right_node, values_right_node)
 
             # set new_right_node as the parent of it´s children
             for child in new_right_node.children:
                 child.setParent(new_right_node)
 
-            return self, middle_key, new_right_node
+            return self, middle_key, new_right_node, middle_value
 
     def getSubtree(self, key_to_search) -> Node | None:
         """
@@ -235,31 +392,23 @@ class Node:
 
         """
 
-        # iterate over the nodes keys until key_to_search is smaller than a key, to find the subtree that must contain
-        # key_to_search
-        for index, key in enumerate(self.keys):
-            if key_to_search < key:
-                # The index of "key" is equal to index of the child node that should be searched next.
-                # This is seen in the example below for key_to_search = 2, where (key_to_search < key)
-                # is first true for key=3 (node.keys[1]). Since the keys with values less than 3 and
-                # greater than 2 lie by definition in the subtree referenced by R2, one should recursively
-                # search this son. R2(node.children[1]) has the same index as the current key.
-                # node.keys:               [1,   3,   7,   8]
-                # correspondences:         /    /    /    /
-                # node.children:         [R1,  R2,  R3,  R4,  R5]
-
-                if self.isLeaf():
-                    # a leaf has no children, key is not in the tree
-                    return None
-                else:
-                    return self.children[index]
-
-        # "key_to_search" is greater than all the nodes keys
-        # If the node isn´t a leaf, the key is in the subtree, where the last reference of node.children points to.
+        # The index of the first key greater than key_to_search is equal to the index of the child node that should be
+        # searched next. This is seen in the example below for key_to_search = 2, where the first greater key is 3
+        # (node.keys[1]). Since the keys with values less than 3 and greater than 2 lie by definition in the subtree
+        # referenced by R2, one should search this son. R2(node.children[1]) has the same index as the key 3.
+        # node.keys:               [1,   3,   7,   8]
+        # correspondences:         /    /    /    /
+        # node.children:         [R1,  R2,  R3,  R4,  R5]
         if self.isLeaf():
+            # a leaf has no children, key is not in the tree
             return None
-        else:
-            return self.children[-1]
+
+        found, index = self.searchKey(key_to_search)
+        if found:
+            # the key itself is in this node, keys greater than it are in the subtree on its right
+            index += 1
+
+        return self.children[index]
 
     def isLeaf(self) -> bool:
         """
@@ -270,7 +419,7 @@ class Node:
 
         """
 
-        return self.children == []
+        return not self.children
 
     def isRoot(self) -> bool:
         """
@@ -313,25 +462,44 @@ class Node:
 
         return len(self.keys) > self.k
 
-    def insert_key_sorted(self, insert_key) -> int:
+    def insert_key_sorted(self, insert_key, value=None) -> int:
         """
         Insert key into the correct position of the nodes sorted key array and return the index.
 
         Args:
             insert_key (int): Key to be inserted
+            value: Value of the key
 
         Returns:
             int: Index of new key
 
         """
 
-        for index, key in enumerate(self.keys):
-            if insert_key < key:
-                self.keys.insert(index, insert_key)
-                return index
+        index = bisect_left(self.keys, insert_key)
+        self.keys.insert(index, insert_key)
+        self.values.insert(index, value)
+        return index
+
+    def insert_keys_sorted(self, insert_keys, insert_values=None) -> None:
+        """
+        Merges sorted keys into the sorted key array of the node. This is linear in the number of keys, unlike inserting
+        the keys one by one.
+
+        Args:
+            insert_keys (list[int]): Sorted keys, none of them may be in the node already
+            insert_values (list | None): Values of the keys, every value is None if this is None
+
+        Returns:
+            None: Nothing
+
+        """
+
+        if insert_values is None:
+            insert_values = [None] * len(insert_keys)
 
-        self.keys.append(insert_key)
-        return len(self.keys) - 1
+        items = list(merge(zip(self.keys, self.values), zip(insert_keys, insert_values), key=itemgetter(0)))
+        self.keys = self.newKeys(key for key, _ in items)
+        self.values = [value for _, value in items]
 
     def __str__(self) -> str:
         """
@@ -353,11 +521,15 @@ class Node:
 
         return self.parent
 
-    def get_right_sibling(self) -> Tuple[Node, int] | Tuple[None, None]:
+    def get_right_sibling(self, own_index=None) -> Tuple[Node, int] | Tuple[None, None]:
         """
         Get the right sibling of the current node and it´s index in parent children.
         Return (None,None), if right sibling does not exist.
 
+        Args:
+            own_index (int | None): Position of the node in the children of its parent, if it is known already.
+                                    Otherwise, the position is searched in the parent.
+
         Returns:
             Tuple[Node,int] | Tuple[None,None]: Right sibling and it´s index in parent children.
 
@@ -367,8 +539,9 @@ class Node:
             raise ValueError("No right sibling exist, node is root")
         else:
             # get index of node in the parent node.children on the right of the current node
-            own_index = self.parent.children.index(self)
-            right_index = self.parent.children.index(self) + 1
+            if own_index is None:
+                own_index = self.parent.children.index(self)
+            right_index = own_index + 1
 
             try:
                 # get the right_sibling and the index of the seperator key between this node and right_sibling
@@ -377,11 +550,15 @@ class Node:
                 # no right sibling exists
                 return None, None
 
-    def get_left_sibling(self) -> Tuple[Node, int] | Tuple[None, None]:
+    def get_left_sibling(self, own_index=None) -> Tuple[Node, int] | Tuple[None, None]:
         """
         Get the left sibling of the current node and it´s index in parent children.
         Return (None,None), if right sibling does not exist.
 
+        Args:
+            own_index (int | None): Position of the node in the children of its parent, if it is known already.
+                                    Otherwise, the position is searched in the parent.
+
         Returns:
             Tuple[Node, int] | Tuple[None, None]: Left sibling and it´s index in parent children.
 
@@ -390,7 +567,9 @@ class Node:
             raise ValueError("No left sibling exist, node is root")
         else:
             # get index of node in the parent node.children on the left of the current node
-            left_index = self.parent.children.index(self) - 1
+            if own_index is None:
+                own_index = self.parent.children.index(self)
+            left_index = own_index - 1
 
             # when left_index is -1, no left sibling exists
             if left_index < 0:
@@ -423,6 +602,16 @@ class Node:
         """
         return self.children
 
+    def getValues(self) -> list:
+        """
+        Get the values of all keys of node.
+
+        Returns:
+            list: List of all values, values[i] belongs to keys[i].
+
+        """
+        return self.values
+
     def getKeys(self) -> list[int]:
         """
         Get all keys of node.
@@ -0,0 +1,275 @@
+"""
+This file contains the on-disk format of a paged balanced tree. The file is a sequence of fixed-size pages: Page 0 is
+the header with the order of the tree, the root and the list of free pages, every other page holds one node.
+
+A node page starts with its kind and number of keys, followed by the keys as signed 64 bit integers and, for internal
+nodes, the numbers of the child pages as unsigned 32 bit integers. Page number 0 is never a node, so it marks "no page".
+"""
+from __future__ import annotations
+
+import os
+import struct
+from typing import BinaryIO
+
+MAGIC = b"BTPG"
+VERSION = 1
+
+# magic, version, page size, order, root page, number of pages, first free page, number of keys
+HEADER = struct.Struct("<4sHIIIIIQ")
+# kind, number of keys
+PAGE_HEADER = struct.Struct("<BH")
+# kind, next free page
+FREE_PAGE = struct.Struct("<BI")
+
+LEAF = 0
+INTERNAL = 1
+FREE = 2
+
+NO_PAGE = 0
+
+
+def requiredPageSize(k) -> int:
+    """
+    Calculates the number of bytes a page needs to hold a node of a tree of order k.
+
+    Args:
+        k (int): Order of the balanced tree
+
+    Returns:
+        int: The minimal page size
+    """
+
+    return PAGE_HEADER.size + 8 * 2 * k + 4 * (2 * k + 1)
+
+
+def largestOrder(pageSize) -> int:
+    """
+    Calculates the largest order whose nodes still fit into a page of the given size.
+
+    Args:
+        pageSize (int): Size of a page in bytes
+
+    Returns:
+        int: The largest order
+    """
+
+    return (pageSize - PAGE_HEADER.size - 4) // (2 * (8 + 4))
+
+
+class Page:
+    """
+    This class is the in-memory image of one node page. The tree reads and changes the keys and children directly and
+    sets dirty afterwards, so the buffer pool writes the page back before it is evicted.
+
+    Args:
+        pageId (int): Number of the page in the file
+        keys (list[int] | None): Keys of the node
+        children (list[int] | None): Page numbers of the children, empty for a leaf
+    """
+
+    __slots__ = ("pageId", "keys", "children", "dirty", "pins", "referenced")
+
+    def __init__(self, pageId, keys=None, children=None):
+        self.pageId = pageId
+        self.keys: list[int] = [] if keys is None else keys
+        self.children: list[int] = [] if children is None else children
+
+        self.dirty = False
+        self.pins = 0
+        self.referenced = False
+
+    def isLeaf(self) -> bool:
+        """
+        Checks whether the page holds a leaf.
+
+        Returns:
+            bool: Whether the page holds a leaf
+        """
+
+        return not self.children
+
+    def encode(self, pageSize) -> bytes:
+        """
+        Serializes the node into the bytes of a page.
+
+        Args:
+            pageSize (int): Size of a page in bytes
+
+        Returns:
+            bytes: The page, exactly pageSize bytes long
+        """
+
+        key_count = len(self.keys)
+        data = PAGE_HEADER.pack(INTERNAL if self.children else LEAF, key_count)
+        data += struct.pack(f"<{key_count}q", *self.keys)
+        if self.children:
+            data += struct.pack(f"<{key_count + 1}I", *self.children)
+
+        return data.ljust(pageSize, b"\0")
+
+    @classmethod
+    def decode(cls, pageId, data) -> Page:
+        """
+        Reads a node from the bytes of a page.
+
+        Args:
+            pageId (int): Number of the page in the file
+            data (bytes): The page
+
+        Returns:
+            Page: The node of the page
+
+        Raises:
+            ValueError: If the page doesn't hold a node
+        """
+
+        kind, key_count = PAGE_HEADER.unpack_from(data)
+        if kind not in (LEAF, INTERNAL):
+            raise ValueError(f"Page {pageId} does not contain a node.")
+
+        offset = PAGE_HEADER.size
+        keys = list(struct.unpack_from(f"<{key_count}q", data, offset))
+
+        children = []
+        if kind == INTERNAL:
+            children = list(struct.unpack_from(f"<{key_count + 1}I", data, offset + 8 * key_count))
+
+        return cls(pageId, keys, children)
+
+
+class PageFile:
+    """
+    This class reads and writes the pages of a paged balanced tree. It has no cache, every call is one access to the
+    file, see BufferPool. Freed pages are kept in a linked list and reused before the file grows.
+
+    If the file doesn't exist or is empty, it is initialized as an empty tree of order k.
+
+    Args:
+        path (str): Path of the file
+        k (int | None): Order of the tree. Only used for a new file, the largest order fitting a page if None
+        pageSize (int): Size of a page in bytes, only used for a new file
+
+    Raises:
+        ValueError: If the file is no page file or a node of order k doesn't fit a page
+    """
+
+    def __init__(self, path, k=None, pageSize=4096):
+        self.path = path
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.__file: BinaryIO = open(path, "w+b" if is_new else "r+b")
+
+        if is_new:
+            if k is None:
+                k = largestOrder(pageSize)
+            if k < 1 or requiredPageSize(k) > pageSize:
+                raise ValueError(f"A node of order {k} does not fit into a page of {pageSize} bytes.")
+
+            self.pageSize = pageSize
+            self.k = k
+            self.root = NO_PAGE
+            self.pageCount = 1
+            self.freeHead = NO_PAGE
+            self.keyCount = 0
+            self.writeHeader()
+        else:
+            magic, version, self.pageSize, self.k, self.root, self.pageCount, self.freeHead, self.keyCount = \
+                HEADER.unpack(self.__file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a page file.")
+
+    def writeHeader(self) -> None:
+        """
+        Writes the header page with the current root, page count, free list and key count.
+
+        Returns:
+            None: Nothing
+        """
+
+        header = HEADER.pack(MAGIC, VERSION, self.pageSize, self.k, self.root, self.pageCount, self.freeHead,
+                             self.keyCount)
+        self.__file.seek(0)
+        self.__file.write(header.ljust(self.pageSize, b"\0"))
+
+    def read(self, pageId) -> Page:
+        """
+        Reads a node page.
+
+        Args:
+            pageId (int): Number of the page
+
+        Returns:
+            Page: The node of the page
+        """
+
+        self.__file.seek(pageId * self.pageSize)
+        return Page.decode(pageId, self.__file.read(self.pageSize))
+
+    def write(self, page) -> None:
+        """
+        Writes a node page.
+
+        Args:
+            page (Page): The node to write
+
+        Returns:
+            None: Nothing
+        """
+
+        self.__file.seek(page.pageId * self.pageSize)
+        self.__file.write(page.encode(self.pageSize))
+
+    def allocate(self) -> int:
+        """
+        Returns the number of an unused page, either from the free list or from the end of the file.
+
+        Returns:
+            int: Number of the page
+        """
+
+        if self.freeHead == NO_PAGE:
+            self.pageCount += 1
+            return self.pageCount - 1
+
+        page_id = self.freeHead
+        self.__file.seek(page_id * self.pageSize)
+        _, self.freeHead = FREE_PAGE.unpack(self.__file.read(FREE_PAGE.size))
+        return page_id
+
+    def free(self, pageId) -> None:
+        """
+        Adds a page to the free list.
+
+        Args:
+            pageId (int): Number of the page
+
+        Returns:
+            None: Nothing
+        """
+
+        self.__file.seek(pageId * self.pageSize)
+        self.__file.write(FREE_PAGE.pack(FREE, self.freeHead).ljust(self.pageSize, b"\0"))
+        self.freeHead = pageId
+
+    def sync(self) -> None:
+        """
+        Writes the header and forces all written pages to the disk.
+
+        Returns:
+            None: Nothing
+        """
+
+        self.writeHeader()
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+
+    def close(self) -> None:
+        """
+        Writes the header and closes the file.
+
+        Returns:
+            None: Nothing
+        """
+
+        if not self.__file.closed:
+            self.writeHeader()
+            self.__file.close()
@@ -0,0 +1,476 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Iterator, Tuple
+
+from .BufferPool import BufferPool, LRU
+from .PageFile import NO_PAGE, Page, PageFile
+
+
+class PagedTree:
+    """
+    This class represents a balanced tree, whose nodes are stored as fixed-size pages in a single file instead of
+    living in memory. Every node access goes through a buffer pool, which keeps a limited number of pages in memory and
+    writes changed pages back to the file. The tree can therefore be larger than the memory, and the page accesses
+    reported by search and the counters of the buffer pool are real accesses.
+
+    The algorithms are the same as in BalancedTree: A search records the path of (page, index) entries from the root,
+    inserts split full nodes upwards along the path and deletes rebalance by rotating or merging with siblings. The
+    pages are only stored as keys and child page numbers, so the tree holds keys without values.
+
+    Changes are written to the file, when pages are evicted and with flush or close. The file is only consistent after
+    flush or close returned.
+
+    Args:
+        path (str): Path of the page file. An existing file is opened, otherwise a new, empty tree is created
+        k (int | None): Order of a new tree, the largest order fitting a page if None. Ignored for an existing file
+        pageSize (int): Size of a page in bytes of a new tree. Ignored for an existing file
+        poolCapacity (int): Number of pages the buffer pool keeps in memory
+        policy (str): Eviction policy of the buffer pool, "lru" or "clock"
+
+    Raises:
+        ValueError: If the file is no page file or a node of order k doesn't fit a page
+    """
+
+    def __init__(self, path, k=None, pageSize=4096, poolCapacity=64, policy=LRU):
+        self.__file = PageFile(path, k, pageSize)
+        self.pool = BufferPool(self.__file, poolCapacity, policy)
+        self.k = self.__file.k
+
+        self.__searchCount = 0
+        # pages pinned by the current operation, they are released together once the operation is finished
+        self.__pinned: list[Page] = []
+
+    def __enter__(self) -> PagedTree:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def search(self, key) -> Tuple[int | None, int]:
+        """
+        Searches the tree for a given key from the root.
+
+        Args:
+            key (int): Key that is searched for
+
+        Returns:
+            Tuple[int | None, int]: The key or None if it is not in the tree and the number of accessed pages
+        """
+
+        try:
+            path, found = self.__search_path(key)
+            self.__searchCount = len(path)
+            return key if found else None, self.__searchCount
+        finally:
+            self.__release()
+
+    def __contains__(self, key) -> bool:
+        return self.search(key)[0] is not None
+
+    def __len__(self) -> int:
+        return self.__file.keyCount
+
+    def isEmpty(self) -> bool:
+        """
+        Checks whether the tree contains no keys.
+
+        Returns:
+            bool: Whether the tree is empty
+        """
+
+        return self.__file.keyCount == 0
+
+    def insert(self, insert_key) -> None:
+        """
+        Inserts a new key into the tree.
+
+        Args:
+            insert_key (int): Key to be inserted
+
+        Returns:
+            None: Nothing
+
+        Raises:
+            ValueError: If the key is already in the tree
+        """
+
+        try:
+            if self.__file.root == NO_PAGE:
+                self.__file.root = self.__new().pageId
+
+            path, found = self.__search_path(insert_key)
+            if found:
+                raise ValueError(f"{insert_key} is already in the tree.")
+
+            self.__insert_along_path(path, insert_key)
+            self.__file.keyCount += 1
+        finally:
+            self.__release()
+
+    def delete(self, key) -> None:
+        """
+        Deletes a key from the tree, see BalancedTree.delete.
+
+        Args:
+            key (int): Key to delete
+
+        Returns:
+            None: Nothing
+
+        Raises:
+            ValueError: If the key is not in the tree
+        """
+
+        try:
+            path, found = self.__search_path(key)
+            if not found:
+                raise ValueError(f"{key} is not in the tree.")
+
+            self.__delete_along_path(path)
+            self.__file.keyCount -= 1
+        finally:
+            self.__release()
+
+    def getAllValues(self) -> list[int]:
+        """
+        Returns all keys of the tree in ascending order.
+
+        Returns:
+            list[int]: The keys
+        """
+
+        return list(self)
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Yields the keys in ascending order. The keys and children of a page are copied, when the page is reached, so
+        no page stays pinned while the iteration is suspended. The tree must not be changed during the iteration.
+
+        Returns:
+            Iterator[int]: The keys
+        """
+
+        if self.__file.root == NO_PAGE:
+            return
+
+        # entries of [keys, children, index of the next key]
+        stack = []
+
+        def descend(page_id):
+            # push the page and its leftmost descendants
+            while True:
+                page = self.pool.fetch(page_id)
+                keys, children = list(page.keys), list(page.children)
+                self.pool.unpin(page)
+
+                stack.append([keys, children, 0])
+                if not children:
+                    return
+                page_id = children[0]
+
+        descend(self.__file.root)
+        while stack:
+            entry = stack[-1]
+            keys, children, index = entry
+
+            if not children:
+                yield from keys
+                stack.pop()
+            elif index < len(keys):
+                # the subtree on the left of the key is finished
+                yield keys[index]
+                entry[2] += 1
+                descend(children[index + 1])
+            else:
+                stack.pop()
+
+    def flush(self) -> None:
+        """
+        Writes every changed page and the header to the file and forces them to the disk.
+
+        Returns:
+            None: Nothing
+        """
+
+        self.pool.flush()
+
+    def close(self) -> None:
+        """
+        Flushes the tree and closes the file.
+
+        Returns:
+            None: Nothing
+        """
+
+        self.flush()
+        self.__file.close()
+
+    def __fetch(self, pageId) -> Page:
+        """
+        Fetches a page from the buffer pool for the current operation.
+
+        Args:
+            pageId (int): Number of the page
+
+        Returns:
+            Page: The pinned page
+        """
+
+        page = self.pool.fetch(pageId)
+        self.__pinned.append(page)
+        return page
+
+    def __new(self, keys=None, children=None) -> Page:
+        """
+        Creates a new page for the current operation.
+
+        Args:
+            keys (list[int] | None): Keys of the node
+            children (list[int] | None): Page numbers of the children, empty for a leaf
+
+        Returns:
+            Page: The pinned page
+        """
+
+        page = self.pool.new(keys, children)
+        self.__pinned.append(page)
+        return page
+
+    def __free(self, page) -> None:
+        """
+        Returns a page, which isn't part of the tree anymore, to the free pages of the file.
+
+        Args:
+            page (Page): The page
+
+        Returns:
+            None: Nothing
+        """
+
+        self.pool.free(page)
+
+    def __release(self) -> None:
+        """
+        Unpins every page pinned by the current operation.
+
+        Returns:
+            None: Nothing
+        """
+
+        for page in self.__pinned:
+            # freed pages are not in the pool anymore
+            if page.pins:
+                self.pool.unpin(page)
+
+        self.__pinned.clear()
+
+    def __search_path(self, key_to_search) -> Tuple[list[Tuple[Page, int]], bool]:
+        """
+        Searches the tree from the root and records the visited pages in a path, see BalancedTree.__search_path.
+
+        Args:
+            key_to_search (int): Key to search for
+
+        Returns:
+            Tuple[list[Tuple[Page, int]], bool]: The path from the root to the last visited page and whether the key
+                                                  was found in that page. The path is empty for an empty tree.
+        """
+
+        path = []
+        page_id = self.__file.root
+        while page_id != NO_PAGE:
+            page = self.__fetch(page_id)
+            index = bisect_left(page.keys, key_to_search)
+            path.append((page, index))
+
+            if index < len(page.keys) and page.keys[index] == key_to_search:
+                return path, True
+            elif page.isLeaf():
+                return path, False
+
+            page_id = page.children[index]
+
+        return path, False
+
+    def __insert_along_path(self, path, key) -> None:
+        """
+        Inserts a key into the last page of the path and splits full pages upwards, see
+        BalancedTree.__insert_along_path.
+
+        Args:
+            path (list[Tuple[Page, int]]): Path from the root to the leaf, the index of the leaf entry must be the
+                                            insert position of "key". The path is consumed.
+            key (int): Key that should be inserted
+
+        Returns:
+            None: Nothing
+        """
+
+        # number of the page, which should be inserted after "key". Only set for internal pages
+        child = NO_PAGE
+
+        while True:
+            page, index = path.pop()
+            page.keys.insert(index, key)
+            if child != NO_PAGE:
+                page.children.insert(index + 1, child)
+            page.dirty = True
+
+            if len(page.keys) <= 2 * self.k:
+                return
+
+            # split the page, the left half stays in the page and the right half moves to a new page
+            middle = len(page.keys) // 2
+            middle_key = page.keys[middle]
+            right_page = self.__new(page.keys[middle + 1:], page.children[middle + 1:])
+            del page.keys[middle:]
+            del page.children[middle + 1:]
+
+            if not path:
+                # the root was split, the new root has the two halves as children
+                new_root = self.__new([middle_key], [page.pageId, right_page.pageId])
+                self.__file.root = new_root.pageId
+                return
+
+            key, child = middle_key, right_page.pageId
+
+    def __delete_along_path(self, path) -> None:
+        """
+        Deletes the key at the end of the path, see BalancedTree.__delete_along_path.
+
+        Args:
+            path (list[Tuple[Page, int]]): Path from the root to the page containing the key, the index of the last
+                                            entry is the index of the key. The path is consumed.
+
+        Returns:
+            None: Nothing
+        """
+
+        target_page, key_index = path[-1]
+
+        if not target_page.isLeaf():
+            # replace the key with its in order predecessor or successor, which is deleted from its leaf instead
+            replacement_path = list(path)
+            replacement_page = self.__descend(replacement_path, key_index, rightmost=True)
+            if len(replacement_page.keys) <= self.k:
+                replacement_path = list(path)
+                replacement_page = self.__descend(replacement_path, key_index + 1, rightmost=False)
+
+            _, replacement_index = replacement_path[-1]
+            target_page.keys[key_index] = replacement_page.keys[replacement_index]
+            target_page.dirty = True
+
+            path = replacement_path
+            target_page, key_index = path[-1]
+
+        del target_page.keys[key_index]
+        target_page.dirty = True
+
+        if len(target_page.keys) < self.k and len(path) > 1:
+            self.__rebalance_along_path(path)
+
+    def __descend(self, path, childIndex, rightmost) -> Page:
+        """
+        Appends the path from the child of the last page to its rightmost or leftmost leaf.
+
+        Args:
+            path (list[Tuple[Page, int]]): Path to the page, the index of the last entry is replaced by childIndex
+            childIndex (int): Index of the child to descend into
+            rightmost (bool): Whether the path follows the last or the first children
+
+        Returns:
+            Page: The reached leaf. The index of its entry is its last or first key
+        """
+
+        page, _ = path[-1]
+        path[-1] = (page, childIndex)
+        page = self.__fetch(page.children[childIndex])
+
+        while not page.isLeaf():
+            index = len(page.children) - 1 if rightmost else 0
+            path.append((page, index))
+            page = self.__fetch(page.children[index])
+
+        path.append((page, len(page.keys) - 1 if rightmost else 0))
+        return page
+
+    def __rebalance_along_path(self, path) -> None:
+        """
+        Rebalances the tree upwards from the last page of the path by rotating or merging with a sibling, see
+        BalancedTree.__rebalance_along_path.
+
+        Args:
+            path (list[Tuple[Page, int]]): Path from the root to the deficient page. The path is consumed.
+
+        Returns:
+            None: Nothing
+        """
+
+        while True:
+            deficient_page, _ = path.pop()
+            parent, own_index = path[-1]
+
+            right_sibling = None
+            if own_index + 1 < len(parent.children):
+                right_sibling = self.__fetch(parent.children[own_index + 1])
+                if len(right_sibling.keys) > self.k:
+                    # rotate left
+                    deficient_page.keys.append(parent.keys[own_index])
+                    if right_sibling.children:
+                        deficient_page.children.append(right_sibling.children.pop(0))
+                    parent.keys[own_index] = right_sibling.keys.pop(0)
+
+                    parent.dirty = deficient_page.dirty = right_sibling.dirty = True
+                    return
+
+            left_sibling = None
+            if own_index > 0:
+                left_sibling = self.__fetch(parent.children[own_index - 1])
+                if len(left_sibling.keys) > self.k:
+                    # rotate right
+                    deficient_page.keys.insert(0, parent.keys[own_index - 1])
+                    if left_sibling.children:
+                        deficient_page.children.insert(0, left_sibling.children.pop())
+                    parent.keys[own_index - 1] = left_sibling.keys.pop()
+
+                    parent.dirty = deficient_page.dirty = left_sibling.dirty = True
+                    return
+
+            # merge with the right sibling if it exists, else with the left one
+            if right_sibling is not None:
+                merged_page = self.__merge_pages(parent, deficient_page, right_sibling, own_index)
+            else:
+                merged_page = self.__merge_pages(parent, left_sibling, deficient_page, own_index - 1)
+
+            parent_is_root = len(path) == 1
+            if parent_is_root and not parent.keys:
+                # the root lost its last key, the merged page is the new root
+                self.__file.root = merged_page.pageId
+                self.__free(parent)
+                return
+            elif len(parent.keys) >= self.k or parent_is_root:
+                return
+
+    def __merge_pages(self, parent, left_page, right_page, separator_index) -> Page:
+        """
+        Merges two neighboring pages together with their separator into the left page and frees the right page.
+
+        Args:
+            parent (Page): Parent of both pages
+            left_page (Page): Page on the left
+            right_page (Page): Page on the right
+            separator_index (int): Index of the key in the parent, that separates both pages
+
+        Returns:
+            Page: The merged page
+        """
+
+        left_page.keys.append(parent.keys.pop(separator_index))
+        left_page.keys.extend(right_page.keys)
+        left_page.children.extend(right_page.children)
+        parent.children.pop(separator_index + 1)
+
+        parent.dirty = left_page.dirty = True
+        self.__free(right_page)
+        return left_page
@@ -0,0 +1,168 @@
+"""
+This file contains the parallel bottom-up construction of a balanced tree, see BulkLoad. Building a large tree is CPU
+bound, so the work is split between several processes:
+
+    1. The sorted keys are cut into one key range per worker. The key between two ranges is kept back, it becomes a
+       separator of the level above the subtrees.
+    2. Every worker builds the lower levels of its range with BulkLoad.buildLevel. All workers build the same number
+       of levels, which is the number of levels the smallest range can build without reaching its root, so every
+       node keeps between k and 2k keys and all subtrees have the same height.
+    3. The top nodes of all workers and the kept back keys form one level, from which the remaining levels up to the
+       root are built in the calling process.
+
+The key ranges and the built nodes are pickled explicitly, so the time and the bytes spent passing data between the
+processes are measured and reported in a BuildReport.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from .BuildReport import BuildReport
+from .BulkLoad import buildLevel, buildLevels, levelCapacity, nodesOnLevel
+from .Node import Node
+
+
+def workerLevels(key_count, k, capacity) -> int:
+    """
+    Calculates, how many levels can be built from key_count keys before the level of the root is reached.
+
+    Args:
+        key_count (int): The number of keys
+        k (int): Order of the balanced tree
+        capacity (int): The desired number of keys of one node, between k and 2k
+
+    Returns:
+        int: The number of levels below the root
+    """
+
+    levels = 0
+    while True:
+        node_count = nodesOnLevel(key_count, k, capacity)
+        if node_count == 1:
+            return levels
+
+        levels += 1
+        key_count = node_count - 1
+
+
+def buildPartition(payload) -> tuple[bytes, float, float, float]:
+    """
+    Builds the lower levels of one key range. This runs in a worker process.
+
+    Args:
+        payload (bytes): The pickled order, keys, values (None if every value is None), number of levels, node
+                         capacity and node class
+
+    Returns:
+        tuple[bytes, float, float, float]: The pickled nodes of the top level, separators between them and values of
+                                           the separators, followed by the seconds spent unpickling, building and
+                                           pickling
+    """
+
+    start = perf_counter()
+    k, keys, values, levels, capacity, nodeType = pickle.loads(payload)
+    decoded = perf_counter()
+
+    if values is None:
+        values = [None] * len(keys)
+    children = None
+    for _ in range(levels):
+        children, keys, values = buildLevel(k, keys, values, children, nodesOnLevel(len(keys), k, capacity), nodeType)
+    built = perf_counter()
+
+    data = pickle.dumps((children, keys, values), pickle.HIGHEST_PROTOCOL)
+    return data, decoded - start, built - decoded, perf_counter() - built
+
+
+def buildTreeParallel(k, keys, values=None, fillFactor=1.0, nodeType=Node, workers=None) -> tuple[Node, BuildReport]:
+    """
+    Builds a balanced tree bottom-up from sorted keys in several processes and returns its root. If the key ranges are
+    too small to build at least one level of the tree, it is built in the calling process.
+
+    Args:
+        k (int): Order of the balanced tree
+        keys (list[int]): The sorted keys of the tree without duplicates
+        values (list | None): The values of the keys, every value is None if this is None
+        fillFactor (float): Desired fill factor of the nodes between 0 and 1
+        nodeType (type[Node]): Class of the built nodes, Node or a subclass of it. It has to be picklable
+        workers (int | None): Number of worker processes, the number of CPUs if None
+
+    Returns:
+        tuple[Node, BuildReport]: The root of the built tree and the costs of the build
+
+    Raises:
+        ValueError: If the fill factor is not in (0, 1] or workers is less than 1
+    """
+
+    start = perf_counter()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"The number of workers must be at least 1, not {workers}")
+
+    capacity = levelCapacity(k, fillFactor)
+
+    # every range is followed by one key for the level above, except for the last one
+    partitions = min(workers, (len(keys) + 1) // 2) if keys else 1
+    per_partition, extra = divmod(len(keys) - (partitions - 1), partitions)
+    levels = workerLevels(per_partition, k, capacity)
+
+    if partitions < 2 or levels == 0:
+        report = BuildReport(workers, 1, len(keys))
+        root = buildLevels(k, keys, values, fillFactor, nodeType)
+        report.buildSeconds = report.totalSeconds = perf_counter() - start
+        return root, report
+
+    report = BuildReport(workers, partitions, len(keys))
+    report.workerLevels = levels
+
+    payloads = []
+    boundaries = []
+    position = 0
+    for i in range(partitions):
+        size = per_partition + (1 if i < extra else 0)
+
+        encode_start = perf_counter()
+        payload = pickle.dumps((k, keys[position:position + size],
+                                None if values is None else values[position:position + size], levels, capacity,
+                                nodeType), pickle.HIGHEST_PROTOCOL)
+        report.encodeSeconds += perf_counter() - encode_start
+        report.sentBytes += len(payload)
+        payloads.append(payload)
+
+        position += size
+        if i < partitions - 1:
+            boundaries.append((keys[position], None if values is None else values[position]))
+            position += 1
+
+    children = []
+    level_keys = []
+    level_values = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for i, (data, decode_seconds, build_seconds, encode_seconds) in enumerate(executor.map(buildPartition,
+                                                                                                payloads)):
+            report.decodeSeconds += decode_seconds
+            report.buildSeconds += build_seconds
+            report.encodeSeconds += encode_seconds
+            report.receivedBytes += len(data)
+
+            decode_start = perf_counter()
+            nodes, separators, separator_values = pickle.loads(data)
+            report.decodeSeconds += perf_counter() - decode_start
+
+            children.extend(nodes)
+            level_keys.extend(separators)
+            level_values.extend(separator_values)
+            if i < partitions - 1:
+                level_keys.append(boundaries[i][0])
+                level_values.append(boundaries[i][1])
+
+    build_start = perf_counter()
+    root = buildLevels(k, level_keys, level_values, fillFactor, nodeType, children)
+    report.buildSeconds += perf_counter() - build_start
+
+    report.totalSeconds = perf_counter() - start
+    return root, report
@@ -0,0 +1,340 @@
+"""
+This file contains the binary protocol between a TreeServer and a TreeClient. Every request and every response is a
+frame: A header with the length of the payload, the id of the request and the command (request) or the status
+(response), followed by the payload. The server answers the requests of a connection in the order they arrived and
+copies the id of a request into its response, so a client can send many requests without waiting for the answers
+(pipelining) and match the answers by their ids.
+
+Keys are signed 64 bit integers. Values are tagged with their type, only None, bool, int, float, str and bytes are
+supported, so the server never unpickles data received from the network.
+
+The payloads of the commands:
+    PING            -                                   -> -
+    GET             key                                 -> value, status NOT_FOUND if the key is missing
+    INSERT          key, value                          -> -
+    PUT             key, value                          -> -
+    POP             key                                 -> value, status NOT_FOUND if the key is missing
+    RANGE           flags, lo, hi, limit                -> count, keys (and values, if the flag WITH_VALUES is set)
+    GET_MANY        count, keys                         -> count, (found, value) for every key
+    INSERT_MANY     count, keys                         -> report, see encodeReport
+    DELETE_MANY     count, keys                         -> report, see encodeReport
+    BATCH           count, (command, length, payload)   -> count, (status, length, payload) for every command
+
+Errors of a command, like inserting a key twice, are answered with the status ERROR and the message as payload.
+"""
+from __future__ import annotations
+
+import struct
+
+from .BatchReport import BatchReport
+
+DEFAULT_PORT = 7878
+
+# length of the payload, id of the request, command or status
+FRAME = struct.Struct("<IIB")
+# frames with a longer payload are rejected and close the connection
+MAX_PAYLOAD = 64 * 2 ** 20
+
+# Commands
+PING = 0
+GET = 1
+INSERT = 2
+PUT = 3
+POP = 4
+RANGE = 5
+GET_MANY = 6
+INSERT_MANY = 7
+DELETE_MANY = 8
+BATCH = 9
+
+# Status of a response
+OK = 0
+NOT_FOUND = 1
+ERROR = 2
+
+# Flags of a RANGE request
+HAS_LO = 1
+HAS_HI = 2
+REVERSE = 4
+WITH_VALUES = 8
+
+KEY = struct.Struct("<q")
+COUNT = struct.Struct("<I")
+# flags, lo, hi, limit (0 for no limit)
+RANGE_REQUEST = struct.Struct("<BqqI")
+# command or status, length of the payload of a command in a batch
+BATCH_ENTRY = struct.Struct("<BI")
+
+# Type tags of the values
+NONE = 0
+FALSE = 1
+TRUE = 2
+INT = 3
+FLOAT = 4
+STR = 5
+BYTES = 6
+
+FLOAT_VALUE = struct.Struct("<d")
+
+
+class Encoder:
+    """
+    This class builds the payload of a frame.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def key(self, key) -> Encoder:
+        """
+        Appends a key.
+
+        Args:
+            key (int): The key
+
+        Returns:
+            Encoder: The encoder itself
+
+        Raises:
+            struct.error: If the key is not an integer in the range of 64 bit
+        """
+
+        self.data += KEY.pack(key)
+        return self
+
+    def keys(self, keys) -> Encoder:
+        """
+        Appends the number of keys followed by the keys.
+
+        Args:
+            keys (list[int]): The keys
+
+        Returns:
+            Encoder: The encoder itself
+        """
+
+        self.data += COUNT.pack(len(keys))
+        self.data += struct.pack(f"<{len(keys)}q", *keys)
+        return self
+
+    def count(self, count) -> Encoder:
+        """
+        Appends a number.
+
+        Args:
+            count (int): The number, at least 0
+
+        Returns:
+            Encoder: The encoder itself
+        """
+
+        self.data += COUNT.pack(count)
+        return self
+
+    def bytes(self, data) -> Encoder:
+        """
+        Appends the length of some bytes followed by the bytes.
+
+        Args:
+            data (bytes): The bytes
+
+        Returns:
+            Encoder: The encoder itself
+        """
+
+        self.data += COUNT.pack(len(data))
+        self.data += data
+        return self
+
+    def value(self, value) -> Encoder:
+        """
+        Appends a value with its type tag.
+
+        Args:
+            value (None | bool | int | float | str | bytes): The value
+
+        Returns:
+            Encoder: The encoder itself
+
+        Raises:
+            TypeError: If the type of the value is not supported
+        """
+
+        if value is None:
+            self.data.append(NONE)
+        elif value is True or value is False:
+            self.data.append(TRUE if value else FALSE)
+        elif isinstance(value, int):
+            self.data.append(INT)
+            self.bytes(value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True))
+        elif isinstance(value, float):
+            self.data.append(FLOAT)
+            self.data += FLOAT_VALUE.pack(value)
+        elif isinstance(value, str):
+            self.data.append(STR)
+            self.bytes(value.encode())
+        elif isinstance(value, (bytes, bytearray)):
+            self.data.append(BYTES)
+            self.bytes(value)
+        else:
+            raise TypeError(f"Values of type {type(value).__name__} can't be sent to a tree server.")
+
+        return self
+
+
+class Decoder:
+    """
+    This class reads the payload of a frame from the front.
+
+    Args:
+        data (bytes): The payload
+
+    Raises:
+        struct.error: If the payload ends before a read is complete
+    """
+
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.position = 0
+
+    def key(self) -> int:
+        """
+        Reads a key.
+
+        Returns:
+            int: The key
+        """
+
+        key, = KEY.unpack_from(self.data, self.position)
+        self.position += KEY.size
+        return key
+
+    def keys(self) -> list[int]:
+        """
+        Reads a number of keys followed by the keys.
+
+        Returns:
+            list[int]: The keys
+        """
+
+        count = self.count()
+        keys = list(struct.unpack_from(f"<{count}q", self.data, self.position))
+        self.position += KEY.size * count
+        return keys
+
+    def count(self) -> int:
+        """
+        Reads a number.
+
+        Returns:
+            int: The number
+        """
+
+        count, = COUNT.unpack_from(self.data, self.position)
+        self.position += COUNT.size
+        return count
+
+    def bytes(self) -> bytes:
+        """
+        Reads the length of some bytes followed by the bytes.
+
+        Returns:
+            bytes: The bytes
+
+        Raises:
+            struct.error: If the payload is shorter than the length
+        """
+
+        length = self.count()
+        if self.position + length > len(self.data):
+            raise struct.error("The payload ends inside of a value.")
+
+        data = bytes(self.data[self.position:self.position + length])
+        self.position += length
+        return data
+
+    def value(self):
+        """
+        Reads a value with its type tag.
+
+        Returns:
+            None | bool | int | float | str | bytes: The value
+
+        Raises:
+            ValueError: If the type tag is unknown
+            struct.error: If the payload ends before the type tag
+        """
+
+        if self.position >= len(self.data):
+            raise struct.error("The payload ends before a value.")
+
+        tag = self.data[self.position]
+        self.position += 1
+
+        if tag == NONE:
+            return None
+        elif tag == TRUE or tag == FALSE:
+            return tag == TRUE
+        elif tag == INT:
+            return int.from_bytes(self.bytes(), "little", signed=True)
+        elif tag == FLOAT:
+            value, = FLOAT_VALUE.unpack_from(self.data, self.position)
+            self.position += FLOAT_VALUE.size
+            return value
+        elif tag == STR:
+            return self.bytes().decode()
+        elif tag == BYTES:
+            return self.bytes()
+
+        raise ValueError(f"Unknown value type {tag}.")
+
+    def remaining(self) -> bytes:
+        """
+        Reads the rest of the payload.
+
+        Returns:
+            bytes: The unread bytes
+        """
+
+        data = bytes(self.data[self.position:])
+        self.position = len(self.data)
+        return data
+
+
+def encodeReport(report) -> bytes:
+    """
+    Encodes the report of a batch operation: The applied keys, followed by the number of rejected keys and every
+    rejected key with its reason.
+
+    Args:
+        report (BatchReport): The report
+
+    Returns:
+        bytes: The payload
+    """
+
+    encoder = Encoder().keys(report.applied).count(len(report.rejected))
+    for key, reason in report.rejected:
+        encoder.key(key).bytes(reason.encode())
+
+    return bytes(encoder.data)
+
+
+def decodeReport(data) -> BatchReport:
+    """
+    Decodes the report of a batch operation, see encodeReport.
+
+    Args:
+        data (bytes): The payload
+
+    Returns:
+        BatchReport: The report
+    """
+
+    decoder = Decoder(data)
+    report = BatchReport()
+    report.applied = decoder.keys()
+    for _ in range(decoder.count()):
+        report.reject(decoder.key(), decoder.bytes().decode())
+
+    return report
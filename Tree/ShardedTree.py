@@ -0,0 +1,828 @@
+"""
+This file contains a balanced tree that is split into range-partitioned shards. Every shard is a BalancedTree in its
+own worker process, so the shards use their own CPU and memory. The front end in the calling process only knows the
+boundaries between the shards and sends every request to the shard whose key range contains the key.
+
+The shards communicate through pipes. A request is sent to all shards it touches before any answer is read, so the
+shards of a range scan or a batch operation work in parallel.
+"""
+from __future__ import annotations
+
+import multiprocessing
+from bisect import bisect_left, bisect_right
+from typing import Iterator, Tuple
+
+from .BalancedTree import BalancedTree
+from .BatchReport import BatchReport
+from .BulkLoad import sortedItems, sortedKeys
+
+# Marks that no default was passed to ShardedTree.pop
+_MISSING = object()
+
+# Boundaries of a new, empty sharded tree are spread evenly over the signed 64 bit integers
+KEY_MIN = -2 ** 63
+KEY_MAX = 2 ** 63
+
+# Request, that stops a shard
+STOP = "stop"
+
+
+class ShardServer:
+    """
+    This class is one shard in its worker process. It answers the requests of the front end with its BalancedTree and
+    counts its keys, since the tree doesn't.
+
+    The methods answering a request mirror the methods of BalancedTree with the same name. Their results are sent
+    through a pipe, so they return lists instead of iterators and a flag whether a key was found instead of a default.
+
+    Args:
+        k (int): Order of the balanced tree
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self.tree = BalancedTree(k)
+        self.size = 0
+
+    def get(self, key) -> Tuple[bool, object]:
+        """
+        Looks up a key.
+
+        Args:
+            key (int): The key to look up
+
+        Returns:
+            Tuple[bool, object]: Whether the key was found and its value
+        """
+
+        value = self.tree.get(key, _MISSING)
+        return (False, None) if value is _MISSING else (True, value)
+
+    def get_many(self, keys) -> list[Tuple[bool, object]]:
+        """
+        Looks up many keys, see get.
+
+        Args:
+            keys (list[int]): The keys to look up
+
+        Returns:
+            list[Tuple[bool, object]]: Whether the keys were found and their values
+        """
+
+        return [self.get(key) for key in keys]
+
+    def insert(self, key, value) -> None:
+        """
+        Inserts a key, see BalancedTree.insert.
+
+        Args:
+            key (int): The key to insert
+            value: The value of the key
+
+        Returns:
+            None: Nothing
+        """
+
+        self.tree.insert(key, value)
+        self.size += 1
+
+    def put(self, key, value) -> None:
+        """
+        Sets the value of a key, see BalancedTree.put.
+
+        Args:
+            key (int): The key
+            value: The new value of the key
+
+        Returns:
+            None: Nothing
+        """
+
+        if self.tree.get(key, _MISSING) is _MISSING:
+            self.size += 1
+        self.tree.put(key, value)
+
+    def pop(self, key) -> Tuple[bool, object]:
+        """
+        Deletes a key, see BalancedTree.pop.
+
+        Args:
+            key (int): The key to delete
+
+        Returns:
+            Tuple[bool, object]: Whether the key was found and its value
+        """
+
+        value = self.tree.pop(key, _MISSING)
+        if value is _MISSING:
+            return False, None
+
+        self.size -= 1
+        return True, value
+
+    def insert_many(self, keys) -> BatchReport:
+        """
+        Inserts many keys, see BalancedTree.insert_many.
+
+        Args:
+            keys (list[int]): The keys to insert
+
+        Returns:
+            BatchReport: The inserted and the rejected keys
+        """
+
+        report = self.tree.insert_many(keys)
+        self.size += len(report.applied)
+        return report
+
+    def delete_many(self, keys) -> BatchReport:
+        """
+        Deletes many keys, see BalancedTree.delete_many.
+
+        Args:
+            keys (list[int]): The keys to delete
+
+        Returns:
+            BatchReport: The deleted and the rejected keys
+        """
+
+        report = self.tree.delete_many(keys)
+        self.size -= len(report.applied)
+        return report
+
+    def range(self, lo, hi, reverse) -> list[int]:
+        """
+        Returns the keys of a range, see BalancedTree.range.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+            reverse (bool): Whether to return the keys in descending order
+
+        Returns:
+            list[int]: The keys of the range
+        """
+
+        return list(self.tree.range(lo, hi, reverse))
+
+    def items(self, lo, hi, reverse) -> list[Tuple[int, object]]:
+        """
+        Returns the (key, value) pairs of a range, see BalancedTree.items.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+            reverse (bool): Whether to return the pairs in descending order
+
+        Returns:
+            list[Tuple[int, object]]: The (key, value) pairs of the range
+        """
+
+        return list(self.tree.items(lo, hi, reverse))
+
+    def takeLowest(self, count) -> Tuple[list[Tuple[int, object]], int | None]:
+        """
+        Removes the count smallest keys from the shard.
+
+        Args:
+            count (int): The number of keys to remove
+
+        Returns:
+            Tuple[list[Tuple[int, object]], int | None]: The removed (key, value) pairs in ascending order and the
+                                                         smallest remaining key, None if the shard is empty now
+        """
+
+        items = list(self.tree.items())
+        self.__rebuild(items[count:])
+        return items[:count], items[count][0] if count < len(items) else None
+
+    def takeHighest(self, count) -> list[Tuple[int, object]]:
+        """
+        Removes the count biggest keys from the shard.
+
+        Args:
+            count (int): The number of keys to remove
+
+        Returns:
+            list[Tuple[int, object]]: The removed (key, value) pairs in ascending order
+        """
+
+        items = list(self.tree.items())
+        self.__rebuild(items[:len(items) - count])
+        return items[len(items) - count:]
+
+    def add(self, items) -> None:
+        """
+        Adds (key, value) pairs taken from a neighbouring shard or loaded into an empty shard. They are either all
+        smaller or all bigger than the keys of this shard, so the tree is rebuilt from the concatenated pairs in linear
+        time.
+
+        Args:
+            items (list[tuple[int, object]]): The (key, value) pairs in ascending order
+
+        Returns:
+            None: Nothing
+        """
+
+        existing = list(self.tree.items())
+        if existing and items and items[0][0] < existing[0][0]:
+            self.__rebuild(items + existing)
+        else:
+            self.__rebuild(existing + items)
+
+    def __rebuild(self, items) -> None:
+        """
+        Replaces the tree of the shard with a tree built bottom-up from sorted (key, value) pairs.
+
+        Args:
+            items (list[tuple[int, object]]): The (key, value) pairs in ascending order
+
+        Returns:
+            None: Nothing
+        """
+
+        self.tree = BalancedTree.fromItems(self.k, items)
+        self.size = len(items)
+
+
+def serveShard(connection, k) -> None:
+    """
+    Answers the requests of the front end until it sends STOP. This is the main function of a worker process.
+
+    A request is the name of a method of ShardServer and its arguments. The answer contains whether the request
+    succeeded, its result or the raised exception and the number of keys of the shard afterwards.
+
+    Args:
+        connection (multiprocessing.connection.Connection): The end of the pipe to the front end
+        k (int): Order of the balanced tree
+
+    Returns:
+        None: Nothing
+    """
+
+    server = ShardServer(k)
+    while True:
+        command, arguments = connection.recv()
+        if command == STOP:
+            connection.close()
+            return
+
+        try:
+            connection.send((True, getattr(server, command)(*arguments), server.size))
+        except Exception as error:
+            connection.send((False, error, server.size))
+
+
+class ShardedTree:
+    """
+    This class is the front end of a balanced tree, whose keys are split into shards by their range. Shard i holds the
+    keys between boundaries[i - 1] (inclusive) and boundaries[i] (exclusive), the first and the last shard are
+    unbounded below and above.
+
+    The front end knows the number of keys of every shard. If a change makes one shard hold more than rebalanceRatio
+    times the average, the boundaries are moved, until every shard holds about the same number of keys. Keys only move
+    between neighbouring shards: First, every shard hands its surplus over to its right neighbour, then every shard
+    hands its surplus over to its left neighbour. Rebalancing is skipped, while the tree holds less than minShardKeys
+    keys per shard.
+
+    The front end must only be used from one thread. Use close or a with statement to stop the worker processes.
+
+    Args:
+        k (int): Order of the balanced trees of the shards
+        shards (int): Number of shards and worker processes
+        boundaries (list[int] | None): The shards - 1 ascending boundaries between the shards. If None, they are spread
+                                       evenly over the signed 64 bit integers
+        rebalanceRatio (float | None): Rebalances the shards, if one holds more than this multiple of the average
+                                       number of keys. Never rebalanced automatically if None
+        minShardKeys (int): Minimal average number of keys per shard for an automatic rebalancing
+
+    Raises:
+        ValueError: If there is no shard, the number of boundaries doesn't match or they aren't ascending
+    """
+
+    def __init__(self, k, shards=4, boundaries=None, rebalanceRatio=2.0, minShardKeys=1000):
+        if shards < 1:
+            raise ValueError(f"The number of shards must be at least 1, not {shards}")
+        if boundaries is None:
+            boundaries = [KEY_MIN + (KEY_MAX - KEY_MIN) * i // shards for i in range(1, shards)]
+        if len(boundaries) != shards - 1 or any(boundaries[i] > boundaries[i + 1] for i in range(shards - 2)):
+            raise ValueError(f"{shards} shards need {shards - 1} ascending boundaries.")
+
+        self.k = k
+        self.boundaries: list[int] = list(boundaries)
+        self.rebalanceRatio = rebalanceRatio
+        self.minShardKeys = minShardKeys
+
+        # number of keys moved between shards by all rebalancings
+        self.rebalances = 0
+        self.movedKeys = 0
+
+        self.__sizes = [0] * shards
+        self.__connections = []
+        self.__processes = []
+        for _ in range(shards):
+            connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=serveShard, args=(child_connection, k), name="TreeShard",
+                                              daemon=True)
+            process.start()
+            child_connection.close()
+
+            self.__connections.append(connection)
+            self.__processes.append(process)
+
+    @classmethod
+    def fromValues(cls, k, values, shards=4, rebalanceRatio=2.0, minShardKeys=1000) -> ShardedTree:
+        """
+        Creates a sharded tree containing the given keys. The boundaries are chosen, so that every shard holds the same
+        number of keys, and every shard builds its tree bottom-up in its own process, see BalancedTree.fromItems.
+
+        Args:
+            k (int): Order of the balanced trees of the shards
+            values (Iterable[int]): The keys of the tree, they are sorted if they aren't already
+            shards (int): Number of shards and worker processes
+            rebalanceRatio (float | None): See ShardedTree
+            minShardKeys (int): See ShardedTree
+
+        Returns:
+            ShardedTree: The new tree
+
+        Raises:
+            ValueError: If a key occurs more than once or there is no shard
+        """
+
+        keys = sortedKeys(values)
+        return cls.fromItems(k, zip(keys, [None] * len(keys)), shards, rebalanceRatio, minShardKeys)
+
+    @classmethod
+    def fromItems(cls, k, items, shards=4, rebalanceRatio=2.0, minShardKeys=1000) -> ShardedTree:
+        """
+        Creates a sharded tree containing the given keys and their values, see fromValues.
+
+        Args:
+            k (int): Order of the balanced trees of the shards
+            items (Iterable[tuple[int, object]]): (key, value) pairs, they are sorted if they aren't already
+            shards (int): Number of shards and worker processes
+            rebalanceRatio (float | None): See ShardedTree
+            minShardKeys (int): See ShardedTree
+
+        Returns:
+            ShardedTree: The new tree
+
+        Raises:
+            ValueError: If a key occurs more than once or there is no shard
+        """
+
+        keys, values = sortedItems(items)
+
+        boundaries = None
+        if len(keys) >= shards:
+            boundaries = [keys[len(keys) * i // shards] for i in range(1, shards)]
+        tree = cls(k, shards, boundaries, rebalanceRatio, minShardKeys)
+
+        # the keys of shard i are keys[cuts[i]:cuts[i + 1]]
+        cuts = [0] + [bisect_left(keys, boundary) for boundary in tree.boundaries] + [len(keys)]
+        parts = [list(zip(keys[cuts[i]:cuts[i + 1]], values[cuts[i]:cuts[i + 1]])) for i in range(shards)]
+        tree.__fanOut([shard for shard in range(shards) if parts[shard]], "add", lambda shard: (parts[shard],))
+        return tree
+
+    def __enter__(self) -> ShardedTree:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stops the worker processes. The keys of the shards are lost.
+
+        Returns:
+            None: Nothing
+        """
+
+        for connection in self.__connections:
+            connection.send((STOP, ()))
+            connection.close()
+        for process in self.__processes:
+            process.join()
+
+        self.__connections = []
+        self.__processes = []
+
+    def shardOf(self, key) -> int:
+        """
+        Returns the shard whose key range contains a key.
+
+        Args:
+            key (int): The key
+
+        Returns:
+            int: The number of the shard
+        """
+
+        return bisect_right(self.boundaries, key)
+
+    def shardSizes(self) -> list[int]:
+        """
+        Returns the number of keys of every shard.
+
+        Returns:
+            list[int]: The number of keys of the shards in the order of their ranges
+        """
+
+        return list(self.__sizes)
+
+    def search(self, key) -> bool:
+        """
+        Searches the shard of a key for it.
+
+        Args:
+            key (int): Key that is searched for
+
+        Returns:
+            bool: Whether the key is in the tree
+        """
+
+        return self.__request(self.shardOf(key), "get", key)[0]
+
+    def __contains__(self, key) -> bool:
+        return self.search(key)
+
+    def __len__(self) -> int:
+        return sum(self.__sizes)
+
+    def isEmpty(self) -> bool:
+        """
+        Checks whether the tree contains no keys.
+
+        Returns:
+            bool: Whether the tree is empty
+        """
+
+        return not any(self.__sizes)
+
+    def get(self, key, default=None):
+        """
+        Returns the value of a key.
+
+        Args:
+            key (int): The key to look up
+            default: Returned if the key is not in the tree
+
+        Returns:
+            The value of the key or default
+        """
+
+        found, value = self.__request(self.shardOf(key), "get", key)
+        return value if found else default
+
+    def get_many(self, keys, default=None) -> list:
+        """
+        Returns the values of many keys. The keys are sent to their shards at once, which look them up in parallel.
+
+        Args:
+            keys (Iterable[int]): The keys to look up
+            default: The value of the keys that are not in the tree
+
+        Returns:
+            list: The values in the order of the keys
+        """
+
+        keys = list(keys)
+        positions = [[] for _ in self.__connections]
+        for position, key in enumerate(keys):
+            positions[self.shardOf(key)].append(position)
+
+        values = [default] * len(keys)
+        shards = [shard for shard, shard_positions in enumerate(positions) if shard_positions]
+        results = self.__fanOut(shards, "get_many", lambda shard: ([keys[position] for position in positions[shard]],))
+        for shard, result in zip(shards, results):
+            for position, (found, value) in zip(positions[shard], result):
+                if found:
+                    values[position] = value
+
+        return values
+
+    def insert(self, key, value=None) -> None:
+        """
+        Inserts a key into its shard.
+
+        Args:
+            key (int): The key to insert
+            value: The value of the key
+
+        Returns:
+            None: Nothing
+
+        Raises:
+            ValueError: If the key is already in the tree
+        """
+
+        self.__request(self.shardOf(key), "insert", key, value)
+        self.__rebalanceIfSkewed()
+
+    def put(self, key, value) -> None:
+        """
+        Sets the value of a key. If the key is not in the tree yet, it is inserted (upsert).
+
+        Args:
+            key (int): The key
+            value: The new value of the key
+
+        Returns:
+            None: Nothing
+        """
+
+        self.__request(self.shardOf(key), "put", key, value)
+        self.__rebalanceIfSkewed()
+
+    def delete(self, key) -> None:
+        """
+        Deletes a key from its shard.
+
+        Args:
+            key (int): The key to delete
+
+        Returns:
+            None: Nothing
+
+        Raises:
+            ValueError: If the key is not in the tree
+        """
+
+        self.pop(key)
+
+    def pop(self, key, default=_MISSING):
+        """
+        Deletes a key from its shard and returns its value.
+
+        Args:
+            key (int): The key to delete
+            default: Returned if the key is not in the tree. If no default is given, a missing key raises a ValueError
+
+        Returns:
+            The value of the deleted key or default
+
+        Raises:
+            ValueError: If the key is not in the tree and no default is given
+        """
+
+        found, value = self.__request(self.shardOf(key), "pop", key)
+        if not found:
+            if default is _MISSING:
+                raise ValueError(f"{key} is not in the tree.")
+            return default
+
+        self.__rebalanceIfSkewed()
+        return value
+
+    def insert_many(self, values) -> BatchReport:
+        """
+        Inserts many keys at once. Every shard inserts its keys in parallel, see BalancedTree.insert_many.
+
+        Args:
+            values (Iterable[int]): The keys to insert
+
+        Returns:
+            BatchReport: The inserted keys and the rejected keys, which are already in the tree
+        """
+
+        report = self.__batch("insert_many", values)
+        self.__rebalanceIfSkewed()
+        return report
+
+    def delete_many(self, values) -> BatchReport:
+        """
+        Deletes many keys at once. Every shard deletes its keys in parallel, see BalancedTree.delete_many.
+
+        Args:
+            values (Iterable[int]): The keys to delete
+
+        Returns:
+            BatchReport: The deleted keys and the rejected keys, which are not in the tree
+        """
+
+        report = self.__batch("delete_many", values)
+        self.__rebalanceIfSkewed()
+        return report
+
+    def range(self, lo=None, hi=None, reverse=False) -> Iterator[int]:
+        """
+        Iterates over the keys between lo and hi (both inclusive) in ascending or descending order. Every shard
+        overlapping the range scans its part in parallel.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+            reverse (bool): Whether to iterate in descending order
+
+        Returns:
+            Iterator[int]: The keys of the range
+        """
+
+        return self.__scan("range", lo, hi, reverse)
+
+    def items(self, lo=None, hi=None, reverse=False) -> Iterator[Tuple[int, object]]:
+        """
+        Iterates over the keys between lo and hi (both inclusive) together with their values, see range.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+            reverse (bool): Whether to iterate in descending order
+
+        Returns:
+            Iterator[Tuple[int, object]]: The (key, value) pairs of the range
+        """
+
+        return self.__scan("items", lo, hi, reverse)
+
+    def __iter__(self) -> Iterator[int]:
+        return self.range()
+
+    def getAllValues(self) -> list[int]:
+        """
+        Returns every key of the tree in ascending order.
+
+        Returns:
+            list[int]: The keys of all shards
+        """
+
+        return list(self.range())
+
+    def rebalance(self) -> None:
+        """
+        Moves the boundaries between the shards, so that every shard holds about the same number of keys. The moved
+        keys are removed from one shard and added to its neighbour.
+
+        Returns:
+            None: Nothing
+        """
+
+        total = sum(self.__sizes)
+        shard_count = len(self.__sizes)
+        # the number of keys the shards 0..i should hold together
+        targets = [total * (i + 1) // shard_count for i in range(shard_count)]
+        moved = 0
+
+        # hand the surplus of every shard over to the right neighbour
+        held = 0
+        for shard in range(shard_count - 1):
+            held += self.__sizes[shard]
+            if held > targets[shard]:
+                items = self.__request(shard, "takeHighest", held - targets[shard])
+                self.__request(shard + 1, "add", items)
+                self.boundaries[shard] = items[0][0]
+                moved += len(items)
+                held = targets[shard]
+
+        # hand the surplus of every shard over to the left neighbour, which holds too few keys
+        held = total
+        for shard in range(shard_count - 1, 0, -1):
+            held -= self.__sizes[shard]
+            if held < targets[shard - 1]:
+                items, first = self.__request(shard, "takeLowest", targets[shard - 1] - held)
+                self.__request(shard - 1, "add", items)
+                if first is not None:
+                    self.boundaries[shard - 1] = first
+                elif shard < shard_count - 1:
+                    # the shard is empty now, its range shrinks to nothing at its upper boundary
+                    self.boundaries[shard - 1] = self.boundaries[shard]
+                else:
+                    self.boundaries[shard - 1] = items[-1][0] + 1
+                moved += len(items)
+                held = targets[shard - 1]
+
+        if moved:
+            self.rebalances += 1
+            self.movedKeys += moved
+
+    def __rebalanceIfSkewed(self) -> None:
+        """
+        Rebalances the shards, if the biggest shard holds more than rebalanceRatio times the average number of keys.
+
+        Returns:
+            None: Nothing
+        """
+
+        if self.rebalanceRatio is None or len(self.__sizes) < 2:
+            return
+
+        total = sum(self.__sizes)
+        if total >= self.minShardKeys * len(self.__sizes) and \
+                max(self.__sizes) * len(self.__sizes) > self.rebalanceRatio * total:
+            self.rebalance()
+
+    def __batch(self, command, values) -> BatchReport:
+        """
+        Sends the keys of a batch operation to their shards and combines the reports of the shards.
+
+        Args:
+            command (str): insert_many or delete_many
+            values (Iterable[int]): The keys
+
+        Returns:
+            BatchReport: The combined report
+        """
+
+        keys = sorted(values)
+        # the keys of shard i are keys[cuts[i]:cuts[i + 1]]
+        cuts = [0] + [bisect_left(keys, boundary) for boundary in self.boundaries] + [len(keys)]
+        shards = [shard for shard in range(len(self.__connections)) if cuts[shard] < cuts[shard + 1]]
+
+        report = BatchReport()
+        for shard_report in self.__fanOut(shards, command, lambda shard: (keys[cuts[shard]:cuts[shard + 1]],)):
+            report.applied.extend(shard_report.applied)
+            report.rejected.extend(shard_report.rejected)
+
+        return report
+
+    def __scan(self, command, lo, hi, reverse) -> Iterator:
+        """
+        Scans a range in all shards overlapping it in parallel and concatenates their results.
+
+        Args:
+            command (str): range or items
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+            reverse (bool): Whether to iterate in descending order
+
+        Returns:
+            Iterator: The keys or (key, value) pairs of the range
+        """
+
+        if lo is not None and hi is not None and lo > hi:
+            return iter(())
+
+        first = 0 if lo is None else self.shardOf(lo)
+        last = len(self.__connections) - 1 if hi is None else self.shardOf(hi)
+        shards = [shard for shard in range(first, last + 1) if self.__sizes[shard]]
+        if reverse:
+            shards.reverse()
+
+        results = self.__fanOut(shards, command, lambda shard: (lo, hi, reverse))
+        return (entry for result in results for entry in result)
+
+    def __fanOut(self, shards, command, arguments) -> list:
+        """
+        Sends a request to several shards before waiting for the first answer, so the shards work in parallel.
+
+        Args:
+            shards (list[int]): The shards
+            command (str): The method of ShardServer
+            arguments (Callable[[int], tuple]): Returns the arguments of the request of a shard
+
+        Returns:
+            list: The results in the order of the shards
+
+        Raises:
+            Exception: The first exception raised by a shard, after all answers were received
+        """
+
+        for shard in shards:
+            self.__connections[shard].send((command, arguments(shard)))
+
+        # read every answer before raising, so no answer is left in a pipe
+        answers = [self.__receive(shard) for shard in shards]
+        for succeeded, result in answers:
+            if not succeeded:
+                raise result
+
+        return [result for _, result in answers]
+
+    def __request(self, shard, command, *arguments):
+        """
+        Sends a request to one shard and waits for its answer.
+
+        Args:
+            shard (int): The shard
+            command (str): The method of ShardServer
+            *arguments: The arguments of the method
+
+        Returns:
+            The result of the method
+
+        Raises:
+            Exception: The exception raised by the shard
+        """
+
+        self.__connections[shard].send((command, arguments))
+        succeeded, result = self.__receive(shard)
+        if not succeeded:
+            raise result
+
+        return result
+
+    def __receive(self, shard) -> Tuple[bool, object]:
+        """
+        Receives the answer of a shard and updates its number of keys.
+
+        Args:
+            shard (int): The shard
+
+        Returns:
+            Tuple[bool, object]: Whether the request succeeded and its result or exception
+        """
+
+        succeeded, result, size = self.__connections[shard].recv()
+        self.__sizes[shard] = size
+        return succeeded, result
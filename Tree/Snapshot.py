@@ -0,0 +1,150 @@
+"""
+This file contains the binary snapshot format of a balanced tree. A snapshot is written once and opened through mmap, so
+opening it doesn't read the nodes: They are decoded when they are touched for the first time, see SnapshotNode.
+
+The file consists of three sections:
+    1. The header with the order and the height of the tree, the number of nodes and the number of keys
+    2. One fixed-width record per node in breadth-first order, the root is record 0. A record contains the number of
+       keys, the keys as signed 64 bit integers, the record numbers of the children as unsigned 32 bit integers and the
+       offset and length of the values of the node. Since every record has the same width, the offset of a node is
+       computed from its record number.
+    3. The pickled values of the nodes. Nodes whose values are all None don't store any values
+"""
+from __future__ import annotations
+
+import mmap
+import pickle
+import struct
+
+MAGIC = b"BTSN"
+VERSION = 1
+
+# magic, version, order, height (number of levels), number of nodes, number of keys
+HEADER = struct.Struct("<4sHIIQQ")
+# number of keys, number of children
+RECORD_HEADER = struct.Struct("<HH")
+# offset and length of the pickled values, length 0 if every value is None
+RECORD_VALUES = struct.Struct("<QI")
+
+
+def recordSize(k) -> int:
+    """
+    Calculates the width of a node record of a tree of order k.
+
+    Args:
+        k (int): Order of the balanced tree
+
+    Returns:
+        int: The number of bytes of a record
+    """
+
+    return RECORD_HEADER.size + 8 * 2 * k + 4 * (2 * k + 1) + RECORD_VALUES.size
+
+
+def writeSnapshot(root, k, path) -> None:
+    """
+    Writes a snapshot of the tree below root to a file.
+
+    Args:
+        root (Node): Root of the tree
+        k (int): Order of the tree
+        path (str): Path of the snapshot file
+
+    Returns:
+        None: Nothing
+
+    Raises:
+        struct.error: If a key is not an integer in the range of 64 bit
+    """
+
+    size = recordSize(k)
+
+    # number the nodes in breadth-first order, the children of a node get consecutive numbers
+    nodes = [root]
+    height = 1
+    level_end = 1
+    i = 0
+    while i < len(nodes):
+        nodes.extend(nodes[i].children)
+        i += 1
+        if i == level_end and i < len(nodes):
+            height += 1
+            level_end = len(nodes)
+
+    records = bytearray(size * len(nodes))
+    values_section = bytearray()
+    values_start = HEADER.size + len(records)
+    key_count = 0
+    next_child = 1
+
+    for number, node in enumerate(nodes):
+        keys, values, children = node.keys, node.values, node.children
+        key_count += len(keys)
+        offset = number * size
+
+        RECORD_HEADER.pack_into(records, offset, len(keys), len(children))
+        struct.pack_into(f"<{len(keys)}q", records, offset + RECORD_HEADER.size, *keys)
+        struct.pack_into(f"<{len(children)}I", records, offset + RECORD_HEADER.size + 8 * 2 * k,
+                         *range(next_child, next_child + len(children)))
+        next_child += len(children)
+
+        values_offset, values_length = 0, 0
+        if any(value is not None for value in values):
+            data = pickle.dumps(list(values), pickle.HIGHEST_PROTOCOL)
+            values_offset, values_length = values_start + len(values_section), len(data)
+            values_section += data
+        RECORD_VALUES.pack_into(records, offset + size - RECORD_VALUES.size, values_offset, values_length)
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, k, height, len(nodes), key_count))
+        file.write(records)
+        file.write(values_section)
+
+
+class SnapshotFile:
+    """
+    This class is an opened snapshot. The file is mapped into memory, reading a node only decodes its record.
+
+    Args:
+        path (str): Path of the snapshot file
+
+    Raises:
+        ValueError: If the file is no snapshot
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.k, self.height, self.nodeCount, self.keyCount = HEADER.unpack_from(self.__map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a snapshot.")
+
+        self.__recordSize = recordSize(self.k)
+
+    def readNode(self, number) -> tuple[list[int], list, list[int]]:
+        """
+        Decodes the record of a node.
+
+        Args:
+            number (int): Record number of the node, 0 is the root
+
+        Returns:
+            tuple[list[int], list, list[int]]: The keys, the values and the record numbers of the children
+        """
+
+        offset = HEADER.size + number * self.__recordSize
+        key_count, child_count = RECORD_HEADER.unpack_from(self.__map, offset)
+        offset += RECORD_HEADER.size
+
+        keys = list(struct.unpack_from(f"<{key_count}q", self.__map, offset))
+        children = list(struct.unpack_from(f"<{child_count}I", self.__map, offset + 8 * 2 * self.k))
+
+        values_offset, values_length = RECORD_VALUES.unpack_from(
+            self.__map, offset - RECORD_HEADER.size + self.__recordSize - RECORD_VALUES.size)
+        if values_length:
+            values = pickle.loads(self.__map[values_offset:values_offset + values_length])
+        else:
+            values = [None] * key_count
+
+        return keys, values, children
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from .Node import Node, NO_CHILDREN
+from .Snapshot import SnapshotFile
+
+
+class SnapshotNode(Node):
+    """
+    This class is a node of a balanced tree opened from a snapshot. A node is created as a placeholder, which only knows
+    its record in the snapshot. Its keys, values and children are decoded, when one of them is accessed for the first
+    time. After that, the node is a normal node and can be changed like every other node. The children of a decoded
+    node are placeholders again, so only the touched nodes are ever read from the snapshot.
+
+    Nodes created by the tree itself, e.g. by a split, are constructed like every other Node and are never lazy.
+
+    Args:
+        k (int): Order of the balanced tree, minimal number of keys in one node
+        keys (list[int]): Keys of the node
+        children (list[Node]): Children of the node, for n keys are n+1 children
+        parent (Node | None): Parent of the node, if Parent is None, the node is the root
+        values (list | None): Values of the keys, every value is None if this is None
+    """
+
+    __slots__ = ("__snapshot", "__number")
+
+    @classmethod
+    def lazy(cls, snapshot, number, parent=None) -> SnapshotNode:
+        """
+        Creates the placeholder of a node in a snapshot without reading its record.
+
+        Args:
+            snapshot (SnapshotFile): The opened snapshot
+            number (int): Record number of the node
+            parent (Node | None): Parent of the node, None for the root
+
+        Returns:
+            SnapshotNode: The placeholder
+        """
+
+        node = cls.__new__(cls)
+        node.k = snapshot.k
+        node.parent = parent
+        node.__snapshot = snapshot
+        node.__number = number
+        return node
+
+    def __getattr__(self, name):
+        # only called, if the attribute is not set yet, which is the case for the content of a placeholder
+        if name in ("keys", "values", "children"):
+            self.__load()
+            return getattr(self, name)
+
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __load(self) -> None:
+        """
+        Decodes the record of the node from the snapshot.
+
+        Returns:
+            None: Nothing
+        """
+
+        snapshot: SnapshotFile = self.__snapshot
+        keys, values, children = snapshot.readNode(self.__number)
+
+        self.keys = keys
+        self.values = values
+        if children:
+            self.children = [SnapshotNode.lazy(snapshot, child, self) for child in children]
+        else:
+            self.children = NO_CHILDREN
+
+        del self.__snapshot
+        del self.__number
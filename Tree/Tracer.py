@@ -0,0 +1,152 @@
+"""
+This file contains the tracing facility of the balanced tree. Instead of formatting a log line for every step of an
+operation, the tree records compact event tuples into a bounded ring buffer. Formatting and writing to disk only
+happen in a background thread, if a trace file is given.
+"""
+from __future__ import annotations
+
+import atexit
+import os.path
+import threading
+from collections import deque
+from time import perf_counter_ns
+from typing import Optional
+
+# Names of the recorded events. The fields of an event are listed behind the name
+SEARCH = "search"  # key, found, number of visited nodes
+INSERT = "insert"  # key
+DELETE = "delete"  # key
+REPLACE = "replace"  # deleted key, replacement key
+SPLIT = "split"  # middle key, number of keys in the left node, number of keys in the right node
+NEW_ROOT = "new_root"  # key of the new root
+ROTATE_LEFT = "rotate_left"  # old separator, new separator
+ROTATE_RIGHT = "rotate_right"  # old separator, new separator
+MERGE = "merge"  # separator, number of keys in the merged node
+SHRINK = "shrink"  # number of keys in the new root
+DELETE_RANGE = "delete_range"  # smallest key, biggest key
+SPLIT_TREE = "split_tree"  # smallest key of the right tree
+JOIN_TREES = "join_trees"  # separator key
+
+
+class Tracer:
+    """
+    This class records the events of a balanced tree into a ring buffer. Every event is a tuple of
+    (timestamp in ns, event name, *fields), the oldest events are dropped once the capacity is reached.
+
+    If a path is given, the events are additionally formatted and appended to that file by a background thread, so
+    the operations of the tree never wait for file I/O.
+
+    Args:
+        capacity (int): Maximal number of events kept in memory
+        path (str | None): File the events are flushed to. No file is written, if this is None
+        flushInterval (float): Seconds between two flushes of the background thread
+    """
+
+    def __init__(self, capacity=4096, path=None, flushInterval=1.0):
+        self.__buffer: deque[tuple] = deque(maxlen=capacity)
+
+        # Events which still have to be written to the file. Bounded as well, so a slow disk can't exhaust the memory
+        self.__pending: Optional[deque[tuple]] = None
+        self.__path = path
+        self.__flushInterval = flushInterval
+        self.__stopped = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+        if path is not None:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self.__pending = deque(maxlen=capacity)
+            self.__thread = threading.Thread(target=self.__flushLoop, name="TreeTracer", daemon=True)
+            self.__thread.start()
+
+            # write the remaining events when the interpreter exits
+            atexit.register(self.close)
+
+    def record(self, event, *fields) -> None:
+        """
+        Records an event. This is the only method called on the operation path, it does not format anything.
+
+        Args:
+            event (str): Name of the event, one of the constants of this module
+            *fields: The fields of the event
+
+        Returns:
+            None: Nothing
+        """
+
+        entry = (perf_counter_ns(), event, *fields)
+        self.__buffer.append(entry)
+
+        if self.__pending is not None:
+            self.__pending.append(entry)
+
+    def getEvents(self) -> list[tuple]:
+        """
+        Returns the events currently kept in the ring buffer, the oldest first.
+
+        Returns:
+            list[tuple]: The recorded events
+        """
+
+        return list(self.__buffer)
+
+    def clear(self) -> None:
+        """
+        Removes all events from the ring buffer.
+
+        Returns:
+            None: Nothing
+        """
+
+        self.__buffer.clear()
+
+    def flush(self) -> None:
+        """
+        Formats and writes all pending events to the trace file.
+
+        Returns:
+            None: Nothing
+        """
+
+        if self.__pending is None or not self.__pending:
+            return
+
+        lines = []
+        while True:
+            try:
+                timestamp, event, *fields = self.__pending.popleft()
+            except IndexError:
+                break
+
+            lines.append(f"{timestamp} {event} {' '.join(str(field) for field in fields)}\n")
+
+        with open(self.__path, "a") as file:
+            file.writelines(lines)
+
+    def close(self) -> None:
+        """
+        Stops the background thread and writes the remaining events.
+
+        Returns:
+            None: Nothing
+        """
+
+        if self.__thread is not None:
+            self.__stopped.set()
+            self.__thread.join()
+            self.__thread = None
+
+            self.flush()
+
+    def __flushLoop(self) -> None:
+        """
+        Periodically flushes the pending events until the tracer is closed.
+
+        Returns:
+            None: Nothing
+        """
+
+        while not self.__stopped.wait(self.__flushInterval):
+            self.flush()
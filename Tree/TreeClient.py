@@ -0,0 +1,482 @@
+"""
+This file contains the asyncio client of a TreeServer, see Protocol for the format of the requests.
+
+A client keeps one connection open for all its requests. Requests don't wait for the answers of the previous requests:
+Coroutines sharing a client can send their requests at the same time (e.g. with asyncio.gather) and the requests are
+pipelined on the connection. A background task reads the answers and hands every answer to the request with its id.
+"""
+from __future__ import annotations
+
+import asyncio
+from itertools import count
+from typing import Callable, Tuple
+
+from .BatchReport import BatchReport
+from .Protocol import FRAME, DEFAULT_PORT, PING, GET, INSERT, PUT, POP, RANGE, GET_MANY, INSERT_MANY, DELETE_MANY, \
+    BATCH, OK, NOT_FOUND, ERROR, HAS_LO, HAS_HI, REVERSE, WITH_VALUES, RANGE_REQUEST, BATCH_ENTRY, Decoder, Encoder, \
+    decodeReport
+
+# Marks that no default was passed to TreeClient.pop
+_MISSING = object()
+
+# A prepared request: the command, its payload and a function turning the status and payload of the answer into the
+# result
+Request = Tuple[int, bytes, Callable[[int, bytes], object]]
+
+
+def checkStatus(status, data) -> None:
+    """
+    Raises the error of an answer.
+
+    Args:
+        status (int): Status of the answer
+        data (bytes): Payload of the answer
+
+    Returns:
+        None: Nothing
+
+    Raises:
+        ValueError: If the status is ERROR, with the message of the server
+    """
+
+    if status == ERROR:
+        raise ValueError(bytes(data).decode())
+
+
+class Commands:
+    """
+    This class prepares the requests of all commands, see Request. TreeClient sends every request on its own, Batch
+    collects them and sends them in one BATCH request.
+    """
+
+    def _send(self, request):
+        raise NotImplementedError
+
+    def ping(self):
+        """
+        Sends an empty request.
+
+        Returns:
+            None: Nothing
+        """
+
+        return self._send((PING, b"", checkStatus))
+
+    def get(self, key, default=None):
+        """
+        Looks up the value of a key.
+
+        Args:
+            key (int): The key to look up
+            default: Returned if the key is not in the tree
+
+        Returns:
+            The value of the key or default
+        """
+
+        def decode(status, data):
+            checkStatus(status, data)
+            return default if status == NOT_FOUND else Decoder(data).value()
+
+        return self._send((GET, bytes(Encoder().key(key).data), decode))
+
+    def contains(self, key):
+        """
+        Checks whether a key is in the tree.
+
+        Args:
+            key (int): The key to look up
+
+        Returns:
+            bool: Whether the key is in the tree
+        """
+
+        def decode(status, data):
+            checkStatus(status, data)
+            return status == OK
+
+        return self._send((GET, bytes(Encoder().key(key).data), decode))
+
+    def insert(self, key, value=None):
+        """
+        Inserts a key, see BalancedTree.insert.
+
+        Args:
+            key (int): The key to insert
+            value (None | bool | int | float | str | bytes): The value of the key
+
+        Returns:
+            None: Nothing
+
+        Raises:
+            ValueError: If the key is already in the tree
+        """
+
+        return self._send((INSERT, bytes(Encoder().key(key).value(value).data), checkStatus))
+
+    def put(self, key, value):
+        """
+        Sets the value of a key, see BalancedTree.put.
+
+        Args:
+            key (int): The key
+            value (None | bool | int | float | str | bytes): The new value of the key
+
+        Returns:
+            None: Nothing
+        """
+
+        return self._send((PUT, bytes(Encoder().key(key).value(value).data), checkStatus))
+
+    def pop(self, key, default=_MISSING):
+        """
+        Deletes a key and returns its value, see BalancedTree.pop.
+
+        Args:
+            key (int): The key to delete
+            default: Returned if the key is not in the tree. If no default is given, a missing key raises a ValueError
+
+        Returns:
+            The value of the deleted key or default
+
+        Raises:
+            ValueError: If the key is not in the tree and no default is given
+        """
+
+        def decode(status, data):
+            checkStatus(status, data)
+            if status == OK:
+                return Decoder(data).value()
+            if default is _MISSING:
+                raise ValueError(f"{key} is not in the tree.")
+            return default
+
+        return self._send((POP, bytes(Encoder().key(key).data), decode))
+
+    def delete(self, key):
+        """
+        Deletes a key.
+
+        Args:
+            key (int): The key to delete
+
+        Returns:
+            None: Nothing
+
+        Raises:
+            ValueError: If the key is not in the tree
+        """
+
+        def decode(status, data):
+            checkStatus(status, data)
+            if status == NOT_FOUND:
+                raise ValueError(f"{key} is not in the tree.")
+
+        return self._send((POP, bytes(Encoder().key(key).data), decode))
+
+    def range(self, lo=None, hi=None, reverse=False, limit=None):
+        """
+        Returns the keys between lo and hi (both inclusive), see BalancedTree.range.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+            reverse (bool): Whether to return the keys in descending order
+            limit (int | None): Maximal number of returned keys, all keys of the range if None
+
+        Returns:
+            list[int]: The keys of the range
+        """
+
+        def decode(status, data):
+            checkStatus(status, data)
+            return Decoder(data).keys()
+
+        return self._send((RANGE, self.__rangeRequest(lo, hi, reverse, limit, 0), decode))
+
+    def items(self, lo=None, hi=None, reverse=False, limit=None):
+        """
+        Returns the keys between lo and hi (both inclusive) together with their values, see range.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+            reverse (bool): Whether to return the pairs in descending order
+            limit (int | None): Maximal number of returned pairs, all pairs of the range if None
+
+        Returns:
+            list[tuple[int, object]]: The (key, value) pairs of the range
+        """
+
+        def decode(status, data):
+            checkStatus(status, data)
+            decoder = Decoder(data)
+            return [(decoder.key(), decoder.value()) for _ in range(decoder.count())]
+
+        return self._send((RANGE, self.__rangeRequest(lo, hi, reverse, limit, WITH_VALUES), decode))
+
+    def get_many(self, keys, default=None):
+        """
+        Looks up the values of many keys with one request.
+
+        Args:
+            keys (Iterable[int]): The keys to look up
+            default: The value of the keys that are not in the tree
+
+        Returns:
+            list: The values in the order of the keys
+        """
+
+        def decode(status, data):
+            checkStatus(status, data)
+            decoder = Decoder(data)
+            values = []
+            for _ in range(decoder.count()):
+                found = decoder.data[decoder.position]
+                decoder.position += 1
+                values.append(decoder.value() if found else default)
+            return values
+
+        return self._send((GET_MANY, bytes(Encoder().keys(list(keys)).data), decode))
+
+    def insert_many(self, keys):
+        """
+        Inserts many keys with one request, see BalancedTree.insert_many.
+
+        Args:
+            keys (Iterable[int]): The keys to insert
+
+        Returns:
+            BatchReport: The inserted keys and the rejected keys, which are already in the tree
+        """
+
+        return self._send((INSERT_MANY, bytes(Encoder().keys(list(keys)).data), self.__decodeReport))
+
+    def delete_many(self, keys):
+        """
+        Deletes many keys with one request, see BalancedTree.delete_many.
+
+        Args:
+            keys (Iterable[int]): The keys to delete
+
+        Returns:
+            BatchReport: The deleted keys and the rejected keys, which are not in the tree
+        """
+
+        return self._send((DELETE_MANY, bytes(Encoder().keys(list(keys)).data), self.__decodeReport))
+
+    @staticmethod
+    def __rangeRequest(lo, hi, reverse, limit, flags) -> bytes:
+        """
+        Encodes the arguments of a RANGE request.
+
+        Args:
+            lo (int | None): The smallest key of the range, no lower bound if None
+            hi (int | None): The biggest key of the range, no upper bound if None
+            reverse (bool): Whether to return the keys in descending order
+            limit (int | None): Maximal number of returned keys, no limit if None
+            flags (int): Additional flags
+
+        Returns:
+            bytes: The payload
+        """
+
+        flags |= (HAS_LO if lo is not None else 0) | (HAS_HI if hi is not None else 0) | (REVERSE if reverse else 0)
+        return RANGE_REQUEST.pack(flags, lo or 0, hi or 0, limit or 0)
+
+    @staticmethod
+    def __decodeReport(status, data) -> BatchReport:
+        checkStatus(status, data)
+        return decodeReport(data)
+
+
+class TreeClient(Commands):
+    """
+    This class is a connection to a TreeServer. The commands are coroutines returning the result described in
+    Commands, use connect or connectUnix to create a client.
+
+    Args:
+        reader (asyncio.StreamReader): Receives the answers of the server
+        writer (asyncio.StreamWriter): Sends the requests to the server
+    """
+
+    def __init__(self, reader, writer):
+        self.__reader = reader
+        self.__writer = writer
+        self.__ids = count()
+        # the requests waiting for their answer by their id
+        self.__waiting: dict[int, Tuple[asyncio.Future, Callable]] = {}
+        self.__receiver = asyncio.get_running_loop().create_task(self.__receive())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=DEFAULT_PORT) -> TreeClient:
+        """
+        Connects to a server over TCP.
+
+        Args:
+            host (str): Address of the server
+            port (int): TCP port of the server
+
+        Returns:
+            TreeClient: The connected client
+        """
+
+        return cls(*await asyncio.open_connection(host, port))
+
+    @classmethod
+    async def connectUnix(cls, path) -> TreeClient:
+        """
+        Connects to a server over a Unix socket.
+
+        Args:
+            path (str): Path of the socket of the server
+
+        Returns:
+            TreeClient: The connected client
+        """
+
+        return cls(*await asyncio.open_unix_connection(path))
+
+    async def __aenter__(self) -> TreeClient:
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Closes the connection. Requests still waiting for their answer fail with a ConnectionError.
+
+        Returns:
+            None: Nothing
+        """
+
+        self.__writer.close()
+        try:
+            await self.__writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self.__receiver
+
+    def batch(self) -> Batch:
+        """
+        Creates a batch of commands, which are sent to the server in one request.
+
+        Returns:
+            Batch: The empty batch
+        """
+
+        return Batch(self)
+
+    async def _send(self, request):
+        """
+        Sends a request and waits for its answer.
+
+        Args:
+            request (Request): The request
+
+        Returns:
+            The result of the request
+
+        Raises:
+            ConnectionError: If the connection was closed before the answer arrived
+        """
+
+        command, payload, decode = request
+        if self.__receiver.done():
+            raise ConnectionError("The connection to the tree server is closed.")
+
+        request_id = next(self.__ids) & 0xFFFFFFFF
+        answer = asyncio.get_running_loop().create_future()
+        self.__waiting[request_id] = (answer, decode)
+
+        self.__writer.write(FRAME.pack(len(payload), request_id, command))
+        self.__writer.write(payload)
+        await self.__writer.drain()
+
+        return await answer
+
+    async def __receive(self) -> None:
+        """
+        Reads the answers of the server and completes the waiting requests, until the connection is closed.
+
+        Returns:
+            None: Nothing
+        """
+
+        try:
+            while True:
+                length, request_id, status = FRAME.unpack(await self.__reader.readexactly(FRAME.size))
+                data = await self.__reader.readexactly(length)
+
+                answer, decode = self.__waiting.pop(request_id)
+                if answer.cancelled():
+                    continue
+                try:
+                    answer.set_result(decode(status, data))
+                except Exception as error:
+                    answer.set_exception(error)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for answer, _ in self.__waiting.values():
+                if not answer.done():
+                    answer.set_exception(ConnectionError("The connection to the tree server was closed."))
+            self.__waiting.clear()
+
+
+class Batch(Commands):
+    """
+    This class collects commands, which are sent to the server in one BATCH request. The server executes them in their
+    order without answering other requests in between. The commands return the batch itself, so they can be chained:
+
+        results = await client.batch().insert(1).get(1).pop(2, None).execute()
+
+    Args:
+        client (TreeClient): The client sending the batch
+    """
+
+    def __init__(self, client):
+        self.__client = client
+        self.__requests: list[Request] = []
+
+    def __len__(self) -> int:
+        return len(self.__requests)
+
+    def _send(self, request) -> Batch:
+        self.__requests.append(request)
+        return self
+
+    async def execute(self) -> list:
+        """
+        Sends the collected commands and waits for their results. A failed command doesn't stop the batch, its
+        exception is returned in place of its result.
+
+        Returns:
+            list: The result or the exception of every command in their order
+        """
+
+        encoder = Encoder().count(len(self.__requests))
+        for command, payload, _ in self.__requests:
+            encoder.data += BATCH_ENTRY.pack(command, len(payload))
+            encoder.data += payload
+
+        requests = self.__requests
+        self.__requests = []
+
+        def decode(status, data):
+            checkStatus(status, data)
+            decoder = Decoder(data)
+            results = []
+            for _, _, decode_result in requests[:decoder.count()]:
+                answer_status, length = BATCH_ENTRY.unpack_from(decoder.data, decoder.position)
+                decoder.position += BATCH_ENTRY.size
+                answer = decoder.data[decoder.position:decoder.position + length]
+                decoder.position += length
+                try:
+                    results.append(decode_result(answer_status, answer))
+                except ValueError as error:
+                    results.append(error)
+            return results
+
+        return await self.__client._send((BATCH, bytes(encoder.data), decode))
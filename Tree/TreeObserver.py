@@ -0,0 +1,58 @@
+class TreeObserver:
+    """
+    This class is the interface for observers of a balanced tree. An observer is registered with
+    BalancedTree.addObserver and is notified about the structural steps of the operations. Every method does nothing
+    by default, so subclasses only override the notifications they are interested in.
+
+    As long as no observer is registered, the tree does not pay anything for the notifications.
+    """
+
+    def onVisit(self, node) -> None:
+        """
+        Called for every node a search visits, in the order from the root to the last node.
+
+        Args:
+            node (Node): The visited node
+
+        Returns:
+            None: Nothing
+        """
+
+    def onSplit(self, left_node, middle_key, right_node) -> None:
+        """
+        Called after an overflowing node was split.
+
+        Args:
+            left_node (Node): The split node, which now contains the keys smaller than middle_key
+            middle_key (int): The key that is moved into the parent
+            right_node (Node): The new node containing the keys greater than middle_key
+
+        Returns:
+            None: Nothing
+        """
+
+    def onMerge(self, merged_node, separator_key) -> None:
+        """
+        Called after two siblings were merged together with their separator.
+
+        Args:
+            merged_node (Node): The node resulting from the merge
+            separator_key (int): The key that was moved down from the parent
+
+        Returns:
+            None: Nothing
+        """
+
+    def onRotate(self, deficient_node, sibling, old_separator, new_separator) -> None:
+        """
+        Called after a key was rotated from a sibling over the parent into a deficient node.
+
+        Args:
+            deficient_node (Node): The node that received a key
+            sibling (Node): The node that gave a key
+            old_separator (int): The separator that was moved down into the deficient node
+            new_separator (int): The key of the sibling, which is the new separator in the parent
+
+        Returns:
+            None: Nothing
+        """
@@ -0,0 +1,233 @@
+"""
+This file contains a server, which makes a balanced tree available to other processes over TCP or a Unix socket, see
+Protocol for the format of the requests.
+
+The server runs on one asyncio event loop. The commands are executed between two awaits, so they never overlap and the
+tree needs no latches. Every connection can send many requests before it reads the answers, the requests of one
+connection are executed in their order.
+"""
+from __future__ import annotations
+
+import asyncio
+import struct
+from typing import Tuple
+
+from .BalancedTree import BalancedTree
+from .Protocol import FRAME, MAX_PAYLOAD, DEFAULT_PORT, PING, GET, INSERT, PUT, POP, RANGE, GET_MANY, INSERT_MANY, \
+    DELETE_MANY, BATCH, OK, NOT_FOUND, ERROR, HAS_LO, HAS_HI, REVERSE, WITH_VALUES, RANGE_REQUEST, BATCH_ENTRY, \
+    Decoder, Encoder, encodeReport
+
+# Marks a missing key in the answers of the tree
+_MISSING = object()
+
+
+class TreeServer:
+    """
+    This class answers the requests of TreeClients with a balanced tree.
+
+    The counters requests and connections count the executed commands, including the commands inside of batches, and
+    the accepted connections.
+
+    Args:
+        tree (BalancedTree): The tree, it must only be changed through the server while the server is running
+    """
+
+    def __init__(self, tree):
+        self.tree: BalancedTree = tree
+        self.requests = 0
+        self.connections = 0
+
+        self.__server: asyncio.AbstractServer | None = None
+        self.__commands = {
+            PING: self.__ping,
+            GET: self.__get,
+            INSERT: self.__insert,
+            PUT: self.__put,
+            POP: self.__pop,
+            RANGE: self.__range,
+            GET_MANY: self.__get_many,
+            INSERT_MANY: self.__insert_many,
+            DELETE_MANY: self.__delete_many,
+            BATCH: self.__batch,
+        }
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, path=None) -> asyncio.AbstractServer:
+        """
+        Starts listening for connections.
+
+        Args:
+            host (str): Address to listen on, only used without a path
+            port (int): TCP port to listen on, 0 chooses a free port. Only used without a path
+            path (str | None): Path of a Unix socket to listen on instead of TCP
+
+        Returns:
+            asyncio.AbstractServer: The listening server, its sockets contain the chosen port
+        """
+
+        if path is not None:
+            self.__server = await asyncio.start_unix_server(self.__serve, path)
+        else:
+            self.__server = await asyncio.start_server(self.__serve, host, port)
+
+        return self.__server
+
+    async def serveForever(self) -> None:
+        """
+        Answers requests until the server is closed.
+
+        Returns:
+            None: Nothing
+        """
+
+        async with self.__server:
+            await self.__server.serve_forever()
+
+    async def close(self) -> None:
+        """
+        Stops listening and waits until the server is closed.
+
+        Returns:
+            None: Nothing
+        """
+
+        self.__server.close()
+        await self.__server.wait_closed()
+
+    async def __serve(self, reader, writer) -> None:
+        """
+        Answers the requests of one connection until the client closes it.
+
+        Args:
+            reader (asyncio.StreamReader): Receives the requests
+            writer (asyncio.StreamWriter): Sends the answers
+
+        Returns:
+            None: Nothing
+        """
+
+        self.connections += 1
+        try:
+            while True:
+                length, request_id, command = FRAME.unpack(await reader.readexactly(FRAME.size))
+                if length > MAX_PAYLOAD:
+                    break
+
+                status, payload = self.execute(command, await reader.readexactly(length))
+                writer.write(FRAME.pack(len(payload), request_id, status))
+                writer.write(payload)
+
+                # only wait for the client, if it doesn't read the answers fast enough
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def execute(self, command, payload) -> Tuple[int, bytes]:
+        """
+        Executes one command on the tree.
+
+        Args:
+            command (int): The command, see Protocol
+            payload (bytes): The arguments of the command
+
+        Returns:
+            Tuple[int, bytes]: The status and the payload of the answer
+        """
+
+        self.requests += 1
+        handler = self.__commands.get(command)
+        if handler is None:
+            return ERROR, f"Unknown command {command}.".encode()
+
+        try:
+            return handler(Decoder(payload))
+        except (ValueError, TypeError, struct.error) as error:
+            return ERROR, str(error).encode()
+
+    # the handlers of the commands read the arguments from the payload and return the status and the payload of the
+    # answer, see Protocol
+
+    @staticmethod
+    def __ping(_) -> Tuple[int, bytes]:
+        return OK, b""
+
+    def __get(self, decoder) -> Tuple[int, bytes]:
+        value = self.tree.get(decoder.key(), _MISSING)
+        if value is _MISSING:
+            return NOT_FOUND, b""
+
+        return OK, bytes(Encoder().value(value).data)
+
+    def __insert(self, decoder) -> Tuple[int, bytes]:
+        key = decoder.key()
+        self.tree.insert(key, decoder.value())
+        return OK, b""
+
+    def __put(self, decoder) -> Tuple[int, bytes]:
+        key = decoder.key()
+        self.tree.put(key, decoder.value())
+        return OK, b""
+
+    def __pop(self, decoder) -> Tuple[int, bytes]:
+        value = self.tree.pop(decoder.key(), _MISSING)
+        if value is _MISSING:
+            return NOT_FOUND, b""
+
+        return OK, bytes(Encoder().value(value).data)
+
+    def __range(self, decoder) -> Tuple[int, bytes]:
+        flags, lo, hi, limit = RANGE_REQUEST.unpack_from(decoder.data, decoder.position)
+        lo = lo if flags & HAS_LO else None
+        hi = hi if flags & HAS_HI else None
+
+        encoder = Encoder()
+        count = 0
+        if flags & WITH_VALUES:
+            for key, value in self.tree.items(lo, hi, bool(flags & REVERSE)):
+                if limit and count == limit:
+                    break
+                encoder.key(key).value(value)
+                count += 1
+        else:
+            for key in self.tree.range(lo, hi, bool(flags & REVERSE)):
+                if limit and count == limit:
+                    break
+                encoder.key(key)
+                count += 1
+
+        return OK, bytes(Encoder().count(count).data + encoder.data)
+
+    def __get_many(self, decoder) -> Tuple[int, bytes]:
+        keys = decoder.keys()
+        encoder = Encoder().count(len(keys))
+        for key in keys:
+            value = self.tree.get(key, _MISSING)
+            if value is _MISSING:
+                encoder.data.append(0)
+            else:
+                encoder.data.append(1)
+                encoder.value(value)
+
+        return OK, bytes(encoder.data)
+
+    def __insert_many(self, decoder) -> Tuple[int, bytes]:
+        return OK, encodeReport(self.tree.insert_many(decoder.keys()))
+
+    def __delete_many(self, decoder) -> Tuple[int, bytes]:
+        return OK, encodeReport(self.tree.delete_many(decoder.keys()))
+
+    def __batch(self, decoder) -> Tuple[int, bytes]:
+        count = decoder.count()
+        encoder = Encoder().count(count)
+        for _ in range(count):
+            command, length = BATCH_ENTRY.unpack_from(decoder.data, decoder.position)
+            decoder.position += BATCH_ENTRY.size
+            payload = decoder.data[decoder.position:decoder.position + length]
+            decoder.position += length
+
+            status, answer = self.execute(command, payload) if command != BATCH else (ERROR, b"Nested batch.")
+            encoder.data += BATCH_ENTRY.pack(status, len(answer))
+            encoder.data += answer
+
+        return OK, bytes(encoder.data)
@@ -0,0 +1,302 @@
+"""
+This file contains the write-ahead log of a balanced tree. Every change of the tree is appended to the log as a
+record, so the tree can be rebuilt after a crash from the last checkpoint and the records written after it.
+
+The operations of the tree don't write to the file themselves. They only append the record to a buffer in memory. A
+background thread writes all buffered records at once and forces them to the disk with a single fsync (group commit).
+The records are synced after at most syncInterval seconds or as soon as syncBatch records are waiting. Callers that
+need a change to be durable before they continue can wait for it with sync.
+
+Every record is stored as its length and CRC32 checksum followed by the pickled record, so a record that was only
+partially written by a crash is detected and ignored by the recovery.
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import os.path
+import pickle
+import struct
+import threading
+import zlib
+from time import monotonic
+from typing import Optional
+
+# Names of the logged operations
+PUT = "put"  # key, value
+DELETE = "delete"  # key
+DELETE_RANGE = "delete_range"  # smallest key, biggest key (as value)
+
+# length, checksum of a record
+RECORD_HEADER = struct.Struct("<II")
+
+
+class WriteAheadLog:
+    """
+    This class is an append-only log of the changes of a balanced tree with group commit and checkpoints. A
+    checkpoint stores all (key, value) pairs of the tree in a separate file and empties the log, so the recovery only
+    has to replay the records written after the last checkpoint.
+
+    Every record gets a log sequence number (LSN), which increases by 1 for every record.
+
+    Args:
+        path (str): File of the log. The checkpoint is stored next to it in "<path>.checkpoint"
+        syncInterval (float): Maximal number of seconds between appending a record and forcing it to the disk
+        syncBatch (int): Number of waiting records, which triggers a sync before syncInterval passed
+        checkpointEvery (int | None): Number of records after which needsCheckpoint is True, never if None
+    """
+
+    def __init__(self, path, syncInterval=0.05, syncBatch=1024, checkpointEvery=100000):
+        self.path = path
+        self.checkpointPath = f"{path}.checkpoint"
+        self.syncInterval = syncInterval
+        self.syncBatch = syncBatch
+        self.checkpointEvery = checkpointEvery
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # records, which were appended but not written yet
+        self.__pending: list[bytes] = []
+        self.__lock = threading.Lock()
+        self.__appended = threading.Condition(self.__lock)
+        self.__synced = threading.Condition(self.__lock)
+        # number of threads waiting in sync
+        self.__waiting = 0
+        # serializes the accesses to the file of the background thread, checkpoints and the recovery
+        self.__fileLock = threading.Lock()
+
+        self.__checkpointLsn, _, _ = self.__readCheckpoint()
+        self.__lsn = self.__checkpointLsn
+        for lsn, *_ in self.__readRecords():
+            self.__lsn = max(self.__lsn, lsn)
+        self.__durableLsn = self.__lsn
+        self.__recordsSinceCheckpoint = 0
+
+        self.__file = open(path, "ab")
+        self.__stopped = False
+        self.__thread: Optional[threading.Thread] = threading.Thread(target=self.__syncLoop, name="TreeWAL",
+                                                                     daemon=True)
+        self.__thread.start()
+
+        # write the remaining records when the interpreter exits
+        atexit.register(self.close)
+
+    def append(self, operation, key, value=None) -> int:
+        """
+        Appends a record to the log. This does not wait for the disk, the record is written by the background thread.
+
+        Args:
+            operation (str): The operation, PUT, DELETE or DELETE_RANGE
+            key (int): The changed key, the smallest key for DELETE_RANGE
+            value: The new value of the key for PUT, the biggest key for DELETE_RANGE
+
+        Returns:
+            int: The LSN of the record
+        """
+
+        with self.__lock:
+            self.__lsn += 1
+            data = pickle.dumps((self.__lsn, operation, key, value), pickle.HIGHEST_PROTOCOL)
+            self.__pending.append(RECORD_HEADER.pack(len(data), zlib.crc32(data)) + data)
+            self.__recordsSinceCheckpoint += 1
+
+            if len(self.__pending) >= self.syncBatch:
+                self.__appended.notify()
+
+            return self.__lsn
+
+    def sync(self, lsn=None) -> None:
+        """
+        Waits until a record is written and synced to the disk. Several threads waiting at the same time share one
+        fsync.
+
+        Args:
+            lsn (int | None): LSN of the record, the last appended record if None
+
+        Returns:
+            None: Nothing
+        """
+
+        with self.__lock:
+            if lsn is None:
+                lsn = self.__lsn
+
+            self.__waiting += 1
+            while self.__durableLsn < lsn and not self.__stopped:
+                self.__appended.notify()
+                self.__synced.wait()
+            self.__waiting -= 1
+
+    def needsCheckpoint(self) -> bool:
+        """
+        Checks whether checkpointEvery records were appended since the last checkpoint.
+
+        Returns:
+            bool: Whether a checkpoint should be written
+        """
+
+        return self.checkpointEvery is not None and self.__recordsSinceCheckpoint >= self.checkpointEvery
+
+    def checkpoint(self, k, items) -> None:
+        """
+        Writes all (key, value) pairs of the tree into the checkpoint file and empties the log. The checkpoint is
+        written into a temporary file first, which replaces the old checkpoint, so a crash never leaves a partial
+        checkpoint. No records may be appended while the checkpoint is written.
+
+        Args:
+            k (int): Order of the tree
+            items (Iterable[tuple[int, object]]): The (key, value) pairs of the tree in ascending order
+
+        Returns:
+            None: Nothing
+        """
+
+        self.sync()
+
+        with self.__lock:
+            lsn = self.__lsn
+            temporary_path = f"{self.checkpointPath}.tmp"
+            with open(temporary_path, "wb") as file:
+                pickle.dump((lsn, k, list(items)), file, pickle.HIGHEST_PROTOCOL)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary_path, self.checkpointPath)
+
+            # every record is contained in the checkpoint now. A crash before the truncation is harmless, the
+            # recovery skips records up to the LSN of the checkpoint
+            with self.__fileLock:
+                self.__file.truncate(0)
+                self.__file.flush()
+                os.fsync(self.__file.fileno())
+
+            self.__checkpointLsn = lsn
+            self.__recordsSinceCheckpoint = 0
+
+    def recover(self) -> tuple[int | None, list[tuple[int, object]], list[tuple[str, int, object]]]:
+        """
+        Reads the last checkpoint and the records written after it. A partially written record at the end of the log
+        is removed from the file.
+
+        Returns:
+            tuple[int | None, list[tuple[int, object]], list[tuple[str, int, object]]]: The order of the tree of the
+                checkpoint (None without a checkpoint), the (key, value) pairs of the checkpoint and the
+                (operation, key, value) records to replay in their order
+        """
+
+        self.sync()
+
+        with self.__lock:
+            checkpoint_lsn, k, items = self.__readCheckpoint()
+            records = [(operation, key, value) for lsn, operation, key, value in self.__readRecords(truncate=True)
+                       if lsn > checkpoint_lsn]
+
+        return k, items, records
+
+    def close(self) -> None:
+        """
+        Writes the remaining records, stops the background thread and closes the file.
+
+        Returns:
+            None: Nothing
+        """
+
+        if self.__thread is None:
+            return
+
+        with self.__lock:
+            self.__stopped = True
+            self.__appended.notify()
+        self.__thread.join()
+        self.__thread = None
+
+        self.__file.close()
+
+    def __syncLoop(self) -> None:
+        """
+        Writes and syncs the appended records in batches until the log is closed.
+
+        Returns:
+            None: Nothing
+        """
+
+        while True:
+            with self.__lock:
+                while not self.__pending and not self.__stopped:
+                    self.__appended.wait()
+
+                # give other records the chance to join the batch, unless it is full or someone waits for it
+                deadline = monotonic() + self.syncInterval
+                while len(self.__pending) < self.syncBatch and not self.__waiting and not self.__stopped:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        break
+                    self.__appended.wait(remaining)
+
+                batch, self.__pending = self.__pending, []
+                lsn = self.__lsn
+                stopped = self.__stopped
+
+            # write outside of the lock, so the tree can continue to append records
+            if batch:
+                with self.__fileLock:
+                    self.__file.write(b"".join(batch))
+                    self.__file.flush()
+                    os.fsync(self.__file.fileno())
+
+            with self.__lock:
+                self.__durableLsn = max(self.__durableLsn, lsn)
+                self.__synced.notify_all()
+
+            if stopped:
+                return
+
+    def __readCheckpoint(self) -> tuple[int, int | None, list[tuple[int, object]]]:
+        """
+        Reads the checkpoint file.
+
+        Returns:
+            tuple[int, int | None, list[tuple[int, object]]]: The LSN, the order and the (key, value) pairs of the
+                                                             checkpoint. (0, None, []) if there is no checkpoint
+        """
+
+        if not os.path.exists(self.checkpointPath):
+            return 0, None, []
+
+        with open(self.checkpointPath, "rb") as file:
+            return pickle.load(file)
+
+    def __readRecords(self, truncate=False) -> list[tuple[int, str, int, object]]:
+        """
+        Reads all complete records of the log. Reading stops at the first incomplete or damaged record.
+
+        Args:
+            truncate (bool): Whether the damaged end of the log is removed from the file
+
+        Returns:
+            list[tuple[int, str, int, object]]: The (LSN, operation, key, value) records
+        """
+
+        if not os.path.exists(self.path):
+            return []
+
+        with open(self.path, "rb") as file:
+            data = file.read()
+
+        records = []
+        position = 0
+        while position + RECORD_HEADER.size <= len(data):
+            length, checksum = RECORD_HEADER.unpack_from(data, position)
+            record = data[position + RECORD_HEADER.size:position + RECORD_HEADER.size + length]
+            if len(record) < length or zlib.crc32(record) != checksum:
+                break
+
+            records.append(pickle.loads(record))
+            position += RECORD_HEADER.size + length
+
+        if truncate and position < len(data):
+            with self.__fileLock:
+                self.__file.truncate(position)
+
+        return records
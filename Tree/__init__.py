@@ -1,2 +1,22 @@
 from .BalancedTree import BalancedTree
 from .Node import Node
+from .Tracer import Tracer
+from .TreeObserver import TreeObserver
+from .BatchReport import BatchReport
+from .BPlusTree import BPlusTree
+from .LeafNode import LeafNode
+from .CompactNode import CompactNode
+from .BufferPool import BufferPool
+from .PagedTree import PagedTree
+from .WriteAheadLog import WriteAheadLog
+from .SnapshotNode import SnapshotNode
+from .LatchedNode import LatchedNode
+from .CountedNode import CountedNode, CountedCompactNode
+from .Aggregate import Aggregate
+from .AggregateNode import AggregateNode, AggregateCompactNode
+from .BuildReport import BuildReport
+from .BloomFilter import BloomFilter
+from .FilterReport import FilterReport
+from .ShardedTree import ShardedTree
+from .TreeServer import TreeServer
+from .TreeClient import TreeClient
@@ -0,0 +1,142 @@
+"""
+This benchmark measures how the throughput of a balanced tree scales with the number of threads. It compares a plain
+tree behind one global lock with the thread-safe tree, which uses latch coupling, on a read heavy and a mixed workload.
+
+On a regular CPython build, the global interpreter lock runs one thread at a time, so the latches can only show their
+overhead. Run the benchmark with a free-threaded build (e.g. python3.13t) to see the threads run in parallel.
+
+Usage:
+    python benchmarks/latch_scaling.py [--threads 1 2 4 8] [--operations 20000] [--order 16] [--keys 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Tree import BalancedTree  # noqa: E402
+
+# share of searches in the workloads, the rest is split evenly into inserts and deletes
+WORKLOADS = {"read heavy": 0.9, "mixed": 0.5}
+
+
+class LockedTree:
+    """
+    A plain balanced tree, whose operations are serialized by one global lock.
+
+    Args:
+        tree (BalancedTree): The tree
+    """
+
+    def __init__(self, tree):
+        self.__tree = tree
+        self.__lock = threading.Lock()
+
+    def search(self, key):
+        with self.__lock:
+            return self.__tree.search(key)
+
+    def insert(self, key):
+        with self.__lock:
+            self.__tree.insert(key)
+
+    def pop(self, key, default):
+        with self.__lock:
+            return self.__tree.pop(key, default)
+
+
+def runWorker(tree, keys, operations, readShare, seed, barrier) -> None:
+    """
+    Runs the operations of one thread.
+
+    Args:
+        tree (BalancedTree | LockedTree): The tree
+        keys (int): Keys are drawn from range(keys)
+        operations (int): Number of operations
+        readShare (float): Share of searches
+        seed (int): Seed of the random operations
+        barrier (threading.Barrier): Starts all threads at the same time
+
+    Returns:
+        None: Nothing
+    """
+
+    rnd = random.Random(seed)
+    work = []
+    for _ in range(operations):
+        draw = rnd.random()
+        work.append((0 if draw < readShare else 1 if draw < (1 + readShare) / 2 else 2, rnd.randrange(keys)))
+
+    barrier.wait()
+    for operation, key in work:
+        if operation == 0:
+            tree.search(key)
+        elif operation == 1:
+            try:
+                tree.insert(key)
+            except ValueError:
+                pass
+        else:
+            tree.pop(key, None)
+
+
+def measure(makeTree, threads, operations, keys, readShare) -> float:
+    """
+    Measures the throughput of a tree.
+
+    Args:
+        makeTree (Callable): Creates the tree, which is filled with every second key
+        threads (int): Number of threads
+        operations (int): Number of operations of every thread
+        keys (int): Keys are drawn from range(keys)
+        readShare (float): Share of searches
+
+    Returns:
+        float: Operations per second
+    """
+
+    tree = makeTree(range(0, keys, 2))
+    barrier = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=runWorker, args=(tree, keys, operations, readShare, seed, barrier))
+               for seed in range(threads)]
+    for worker in workers:
+        worker.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+
+    return threads * operations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--operations", type=int, default=20000, help="operations per thread")
+    parser.add_argument("--order", type=int, default=16)
+    parser.add_argument("--keys", type=int, default=100000)
+    arguments = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, {os.cpu_count()} CPUs")
+
+    trees = {
+        "global lock": lambda values: LockedTree(BalancedTree.fromValues(arguments.order, values)),
+        "latch coupling": lambda values: BalancedTree.fromValues(arguments.order, values, threadSafe=True),
+    }
+
+    for workload, readShare in WORKLOADS.items():
+        print(f"\n{workload} ({readShare:.0%} searches), operations per second")
+        print(f"{'threads':>8}" + "".join(f"{name:>16}" for name in trees))
+        for threads in arguments.threads:
+            results = [measure(makeTree, threads, arguments.operations, arguments.keys, readShare)
+                       for makeTree in trees.values()]
+            print(f"{threads:>8}" + "".join(f"{result:>16,.0f}" for result in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+This benchmark compares the bottom-up build of a balanced tree in one process with the parallel build in several worker
+processes, see Tree.ParallelBuild. For the parallel build, it reports how much of the work was spent passing the keys
+to the workers and the built subtrees back.
+
+Only CPUs that are actually available can run the workers in parallel, with fewer CPUs the extra workers only add
+transfer costs.
+
+Usage:
+    python benchmarks/parallel_build.py [--workers 1 2 4 8] [--keys 2000000] [--order 32] [--values]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Tree import BalancedTree  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--keys", type=int, default=2000000)
+    parser.add_argument("--order", type=int, default=32)
+    parser.add_argument("--values", action="store_true", help="attach a string value to every key")
+    arguments = parser.parse_args()
+
+    print(f"{arguments.keys:,} keys, order {arguments.order}, {os.cpu_count()} CPUs")
+
+    if arguments.values:
+        data = [(key, str(key)) for key in range(arguments.keys)]
+
+        def build(workers):
+            return BalancedTree.fromItems(arguments.order, data, workers=workers)
+    else:
+        data = range(arguments.keys)
+
+        def build(workers):
+            return BalancedTree.fromValues(arguments.order, data, workers=workers)
+
+    start = time.perf_counter()
+    build(None)
+    serial = time.perf_counter() - start
+    print(f"\n{'workers':>8}{'seconds':>10}{'speedup':>10}{'building':>10}{'transfer':>10}{'share':>8}"
+          f"{'sent MiB':>10}{'recv MiB':>10}")
+    print(f"{'serial':>8}{serial:>10.2f}{1:>10.2f}{serial:>10.2f}")
+
+    for workers in arguments.workers:
+        report = build(workers).buildReport
+        print(f"{workers:>8}{report.totalSeconds:>10.2f}{serial / report.totalSeconds:>10.2f}"
+              f"{report.buildSeconds:>10.2f}{report.transferSeconds():>10.2f}{report.transferShare():>8.0%}"
+              f"{report.sentBytes / 2 ** 20:>10.1f}{report.receivedBytes / 2 ** 20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+This benchmark measures the throughput and the latency of a tree server on localhost, see Tree.TreeServer. The server
+runs in its own process, the client sends a mixed workload (90% get, 10% put) over one connection and keeps up to
+"depth" requests in flight at the same time (pipelining). The latency of a request is the time between sending it and
+receiving its answer.
+
+Usage:
+    python benchmarks/server_latency.py [--depth 1 8 64] [--requests 50000] [--keys 100000] [--batch 100] [--unix PATH]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Tree import BalancedTree, TreeClient, TreeServer  # noqa: E402
+
+PORT = 7879
+
+
+def runServer(keys, order, path, ready) -> None:
+    """
+    Runs a server with every second key of range(keys) until the process is terminated.
+
+    Args:
+        keys (int): The keys of the tree are range(0, keys, 2)
+        order (int): Order of the tree
+        path (str | None): Path of the Unix socket, TCP if None
+        ready (multiprocessing.Event): Set, once the server listens
+
+    Returns:
+        None: Nothing
+    """
+
+    async def serve():
+        server = TreeServer(BalancedTree.fromValues(order, range(0, keys, 2)))
+        await server.start(port=PORT, path=path)
+        ready.set()
+        await server.serveForever()
+
+    asyncio.run(serve())
+
+
+def percentile(latencies, share) -> float:
+    """
+    Returns a percentile of sorted latencies in microseconds.
+
+    Args:
+        latencies (list[float]): The sorted latencies in seconds
+        share (float): The percentile between 0 and 1
+
+    Returns:
+        float: The latency in microseconds
+    """
+
+    return latencies[min(len(latencies) - 1, int(share * len(latencies)))] * 1e6
+
+
+async def measure(client, depth, requests, keys, batch) -> tuple[float, list[float]]:
+    """
+    Sends the workload with up to depth requests in flight.
+
+    Args:
+        client (TreeClient): The connected client
+        depth (int): Number of requests in flight
+        requests (int): Number of requests
+        keys (int): Keys are drawn from range(keys)
+        batch (int): Number of keys of every request, single-key requests if 1
+
+    Returns:
+        tuple[float, list[float]]: Keys per second and the sorted latencies in seconds
+    """
+
+    latencies = []
+
+    async def worker(seed):
+        rnd = random.Random(seed)
+        for _ in range(requests // depth):
+            start = time.perf_counter()
+            if batch > 1:
+                await client.get_many([rnd.randrange(keys) for _ in range(batch)])
+            elif rnd.random() < 0.9:
+                await client.get(rnd.randrange(keys))
+            else:
+                await client.put(rnd.randrange(keys), "value")
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(seed) for seed in range(depth)))
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+    return len(latencies) * batch / seconds, latencies
+
+
+async def run(arguments) -> None:
+    if arguments.unix:
+        client = await TreeClient.connectUnix(arguments.unix)
+    else:
+        client = await TreeClient.connect(port=PORT)
+
+    async with client:
+        print(f"{'depth':>6}{'batch':>7}{'keys/s':>12}{'p50 us':>10}{'p99 us':>10}{'p99.9 us':>10}")
+        for batch in (1, arguments.batch):
+            for depth in arguments.depth:
+                requests = arguments.requests if batch == 1 else arguments.requests // batch * 10
+                throughput, latencies = await measure(client, depth, requests, arguments.keys, batch)
+                print(f"{depth:>6}{batch:>7}{throughput:>12,.0f}{percentile(latencies, 0.5):>10.0f}"
+                      f"{percentile(latencies, 0.99):>10.0f}{percentile(latencies, 0.999):>10.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depth", type=int, nargs="+", default=[1, 8, 64], help="requests in flight")
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--keys", type=int, default=100000)
+    parser.add_argument("--order", type=int, default=16)
+    parser.add_argument("--batch", type=int, default=100, help="keys per get_many request")
+    parser.add_argument("--unix", help="path of a Unix socket, TCP on localhost if not given")
+    arguments = parser.parse_args()
+
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(target=runServer, args=(arguments.keys, arguments.order, arguments.unix, ready),
+                                     daemon=True)
+    server.start()
+    ready.wait()
+
+    print(f"{'Unix socket' if arguments.unix else 'TCP'}, {arguments.keys:,} keys, {os.cpu_count()} CPUs\n")
+    try:
+        asyncio.run(run(arguments))
+    finally:
+        server.terminate()
+        if arguments.unix and os.path.exists(arguments.unix):
+            os.remove(arguments.unix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+This benchmark measures how the throughput of a sharded tree scales with the number of shards, see Tree.ShardedTree.
+Every shard is a worker process, so the shards only run in parallel on a machine with several CPUs.
+
+Single-key requests wait for the answer of their shard before the next request is sent, so they never run in parallel
+and only show the cost of a round trip through a pipe. Batches and range scans are sent to all shards at once.
+
+Usage:
+    python benchmarks/sharded_throughput.py [--shards 1 2 4 8] [--keys 1000000] [--batch 10000] [--rounds 20]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Tree.ShardedTree import ShardedTree  # noqa: E402
+
+
+def measure(tree, keys, batch, rounds, rnd) -> dict[str, float]:
+    """
+    Measures the throughput of the workloads on one tree.
+
+    Args:
+        tree (ShardedTree): The tree, which holds every second key of range(keys)
+        keys (int): Keys are drawn from range(keys)
+        batch (int): Number of keys of one batch
+        rounds (int): Number of batches of every workload
+        rnd (random.Random): Source of the random keys
+
+    Returns:
+        dict[str, float]: Keys per second of every workload
+    """
+
+    results = {}
+
+    start = time.perf_counter()
+    for _ in range(batch // 10):
+        tree.get(rnd.randrange(keys))
+    results["single get"] = batch // 10 / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        tree.get_many([rnd.randrange(keys) for _ in range(batch)])
+    results["batch get"] = rounds * batch / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        tree.insert_many([rnd.randrange(keys) | 1 for _ in range(batch)])
+    results["batch insert"] = rounds * batch / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    scanned = 0
+    for _ in range(rounds):
+        lo = rnd.randrange(keys)
+        scanned += sum(1 for _ in tree.range(lo, lo + 20 * batch))
+    results["range scan"] = scanned / (time.perf_counter() - start)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--keys", type=int, default=1000000)
+    parser.add_argument("--order", type=int, default=16)
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=20)
+    arguments = parser.parse_args()
+
+    print(f"{arguments.keys:,} keys, order {arguments.order}, batches of {arguments.batch:,} keys, "
+          f"{os.cpu_count()} CPUs\n")
+
+    header = None
+    for shards in arguments.shards:
+        with ShardedTree.fromValues(arguments.order, range(0, arguments.keys, 2), shards) as tree:
+            results = measure(tree, arguments.keys, arguments.batch, arguments.rounds, random.Random(shards))
+
+        if header is None:
+            header = f"{'shards':>8}" + "".join(f"{name:>16}" for name in results)
+            print("keys per second")
+            print(header)
+        print(f"{shards:>8}" + "".join(f"{result:>16,.0f}" for result in results.values()))
+
+
+if __name__ == "__main__":
+    main()
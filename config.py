@@ -10,12 +10,24 @@ QIntValidator_MAX = 2147483647
 # Global Variables
 mainWindow = None
 
-# Should be set to true, when the BalancedTree class is used without GUI
-DEBUG = False
-
 # Enable/disable logging
 LOGGING = True
 
+# Enable/disable tracing of the tree operations. The events are kept in a ring buffer of TRACE_CAPACITY entries and
+# written to a .trace file in the logs folder by a background thread
+TRACING = True
+TRACE_CAPACITY = 10000
+
+# Enable/disable the write-ahead log of the tree. The changes are appended to WAL_PATH, from which the tree is recovered
+# when the application starts
+WAL = True
+WAL_PATH = "data/tree.wal"
+
+# False-positive rate of the Bloom filter in front of the tree, which answers lookups of absent keys without visiting a
+# node. The tree has no filter if this is None. A filtered search shows no path and no page accesses, so the filter is
+# disabled to show the cost of every search
+BLOOM_FILTER_RATE = None
+
 # base64 encoded icon
 # noinspection SpellCheckingInspection
 icon = """
@@ -0,0 +1,62 @@
+"""
+This file starts a server, which makes a balanced tree available to other processes, see Tree.TreeServer. Clients
+connect with Tree.TreeClient.
+
+Usage:
+    python server.py [--host 127.0.0.1] [--port 7878] [--unix PATH] [--order 16] [--wal PATH]
+"""
+import argparse
+import asyncio
+
+from loguru import logger
+
+import config
+from Tree import BalancedTree, TreeServer, WriteAheadLog
+from Tree.Protocol import DEFAULT_PORT
+
+
+async def serve(arguments) -> None:
+    """
+    Creates the tree and answers requests until the process is stopped.
+
+    Args:
+        arguments (argparse.Namespace): The parsed command line arguments
+
+    Returns:
+        None: Nothing
+    """
+
+    if arguments.wal is not None:
+        tree = BalancedTree.recover(arguments.order, WriteAheadLog(arguments.wal))
+        logger.info(f"SERVER: RECOVERED THE TREE FROM {arguments.wal}")
+    else:
+        tree = BalancedTree(arguments.order)
+
+    server = TreeServer(tree)
+    await server.start(arguments.host, arguments.port, arguments.unix)
+    logger.info(f"SERVER: LISTENING ON {arguments.unix or f'{arguments.host}:{arguments.port}'}")
+
+    await server.serveForever()
+
+
+@logger.catch
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--order", type=int, default=config.DEFAULT_ORDER)
+    parser.add_argument("--wal", help="write-ahead log, the tree is recovered from it and every change is logged")
+    arguments = parser.parse_args()
+
+    if not config.LOGGING:
+        logger.disable("")
+
+    try:
+        asyncio.run(serve(arguments))
+    except KeyboardInterrupt:
+        logger.info("SERVER: STOPPED")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import pytest
+
+from Tree import BalancedTree
+from Tree.Aggregate import SUM
+
+
+def test_insert_many_without_values_keeps_the_tree():
+    tree = BalancedTree.fromItems(2, [(i, i) for i in range(0, 40, 2)], aggregate=SUM)
+
+    with pytest.raises(ValueError):
+        tree.insert_many([5, 7, 9])
+
+    assert list(tree) == list(range(0, 40, 2))
+    assert tree.aggregate() == sum(range(0, 40, 2))
+
+
+def test_insert_without_value_keeps_the_tree():
+    tree = BalancedTree(2, aggregate=SUM)
+
+    with pytest.raises(ValueError):
+        tree.insert(3)
+
+    assert list(tree) == []
+    assert tree.aggregate() == 0
+
+    tree.insert(3, 3)
+    with pytest.raises(ValueError):
+        tree.put(3, None)
+    assert tree.get(3) == 3
+    assert tree.aggregate() == 3
@@ -0,0 +1,19 @@
+from Tree import BalancedTree
+
+
+def test_delete_range_counts_deleted_keys_without_counts():
+    # the filter is sized for twice the keys it is built from, i.e. 20000 keys
+    tree = BalancedTree.fromValues(2, range(10000), bloomFilter=0.01)
+    tree.insert_many(range(10000, 15000))
+    rebuilds = tree.filterReport().rebuilds
+
+    tree.delete_range(100, 199)
+    assert tree.filterReport().staleKeys == 100
+
+    # more than half of the capacity of the filter are deleted keys now
+    tree.delete_range(1000, 11999)
+    report = tree.filterReport()
+    assert report.rebuilds == rebuilds + 1
+    assert report.staleKeys == 0
+    assert report.keys <= 3900
+    assert all(key in tree for key in range(100)) and 150 not in tree and 5000 not in tree
@@ -0,0 +1,12 @@
+from Tree import BalancedTree, TreeServer
+from Tree.Protocol import ERROR, INSERT, OK, Encoder
+
+
+def test_value_missing_from_payload_is_answered_with_an_error():
+    server = TreeServer(BalancedTree(2))
+
+    status, payload = server.execute(INSERT, bytes(Encoder().key(5).data))
+
+    assert status == ERROR and payload
+    assert list(server.tree) == []
+    assert server.execute(INSERT, bytes(Encoder().key(5).value(1).data)) == (OK, b"")
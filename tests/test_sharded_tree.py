@@ -0,0 +1,31 @@
+import random
+
+from Tree import ShardedTree
+
+
+def test_rebalance_routes_every_key_to_its_shard():
+    for seed in range(30):
+        rnd = random.Random(seed)
+        keys = set()
+        with ShardedTree(1, 4, [10, 20, 30], rebalanceRatio=None) as tree:
+            for _ in range(rnd.randint(1, 12)):
+                key = rnd.randint(0, 40)
+                if key in keys and rnd.random() < 0.5:
+                    tree.delete(key)
+                    keys.discard(key)
+                elif key not in keys:
+                    tree.insert(key)
+                    keys.add(key)
+
+            tree.rebalance()
+
+            # the shards hold consecutive ranges, so shard i holds the next shardSizes()[i] keys
+            stored = list(tree)
+            assert stored == sorted(keys)
+            start = 0
+            for shard, size in enumerate(tree.shardSizes()):
+                for key in stored[start:start + size]:
+                    assert tree.shardOf(key) == shard, (seed, key, tree.boundaries, tree.shardSizes())
+                    assert key in tree
+                start += size
+            assert start == len(keys)